@@ -0,0 +1,65 @@
+"""
+Benchmark da formatação de recibos (format_order_for_print).
+
+Usa um banco temporário com dados de empresa configurados e formata
+pedidos típicos em sequência, numa única thread. A meta é pelo menos
+10.000 recibos por segundo.
+
+Uso:
+    python benchmark_receipt.py [quantidade]
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from database import db
+
+TARGET_PER_SECOND = 10000
+
+
+def sample_order():
+    """Pedido de entrega com três itens, complementos e observação."""
+    customer = {'name': 'Maria da Silva', 'phone': '(11) 98765-4321'}
+    items = [
+        {'qty': 2, 'item_data': (1, 'X-Burger', 22.0),
+         'mandatory_additions': [{'name': 'Pão brioche', 'price': 0.0}],
+         'additions': [{'name': 'Bacon', 'qty': 1, 'price': 4.0},
+                       {'name': 'Queijo Extra', 'qty': 2, 'price': 3.0}],
+         'observations': 'sem cebola'},
+        {'qty': 1, 'item_data': (2, 'Pizza Calabresa Grande', 55.0),
+         'additions': [{'name': 'Borda Catupiry', 'qty': 1, 'price': 8.0}]},
+        {'qty': 3, 'item_data': (3, 'Refrigerante Lata', 6.0)},
+    ]
+    address = ['Rua das Flores', '123', 'Centro', 'Próximo à praça']
+    return customer, items, 144.0, address, 7.0, 'Dinheiro', 200.0
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    count = int(argv[0]) if argv else 50000
+
+    db.DB_PATH = Path(tempfile.mkdtemp()) / 'benchmark.db'
+    db.init_db()
+    db.set_system_setting('company_name', 'Lanchonete AnotaJá')
+    db.set_system_setting('company_address', 'Av. Brasil, 1000 - Centro')
+    db.set_system_setting('company_phone', '(11) 4002-8922')
+
+    from utils.print_settings import format_order_for_print
+    args = sample_order()
+    format_order_for_print(*args)  # Compila o modelo fora da medição
+
+    start = time.perf_counter()
+    for _ in range(count):
+        format_order_for_print(*args)
+    elapsed = time.perf_counter() - start
+
+    per_second = count / elapsed
+    print(f'{count} recibos em {elapsed:.3f}s: {per_second:,.0f} recibos/s')
+    print(f'meta: {TARGET_PER_SECOND:,} recibos/s')
+    db.close_all_connections()
+    return 0 if per_second >= TARGET_PER_SECOND else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,6 +1,10 @@
 
+import functools
+import re
 import sqlite3
 import sys
+import threading
+import unicodedata
 from pathlib import Path
 
 # Importa apenas quando necessário para evitar dependência circular
@@ -24,183 +28,321 @@ DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 print(f"Caminho do banco: {DB_PATH}")
 
 
+# Perfil de armazenamento padrão (chave em system_settings -> valor).
+# WAL permite leituras concorrentes enquanto um pedido está sendo gravado.
+STORAGE_PROFILE_DEFAULTS = {
+    'db_journal_mode': 'WAL',
+    'db_synchronous': 'NORMAL',
+    'db_mmap_size': '67108864',  # 64 MB
+    'db_cache_size': '-16000',  # negativo = KiB (~16 MB)
+    'db_busy_timeout': '5000',  # ms
+}
+
+# Chave de configuração -> PRAGMA correspondente
+STORAGE_PROFILE_PRAGMAS = {
+    'db_journal_mode': 'journal_mode',
+    'db_synchronous': 'synchronous',
+    'db_mmap_size': 'mmap_size',
+    'db_cache_size': 'cache_size',
+    'db_busy_timeout': 'busy_timeout',
+}
+
+JOURNAL_MODES = ('DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF')
+SYNCHRONOUS_MODES = ('OFF', 'NORMAL', 'FULL', 'EXTRA')
+
+
+def _validate_storage_value(key, value):
+    """Valida um valor do perfil de armazenamento, retornando-o normalizado.
+
+    Os valores são interpolados no PRAGMA, então só aceitamos os modos
+    conhecidos ou inteiros.
+    """
+    value = str(value).strip().upper()
+    if key == 'db_journal_mode':
+        if value not in JOURNAL_MODES:
+            raise ValueError(f"journal_mode inválido: {value}")
+        return value
+    if key == 'db_synchronous':
+        if value not in SYNCHRONOUS_MODES:
+            raise ValueError(f"synchronous inválido: {value}")
+        return value
+    if key in STORAGE_PROFILE_DEFAULTS:
+        return str(int(value))
+    raise KeyError(f"Chave de perfil desconhecida: {key}")
+
+
+def _read_storage_profile(conn):
+    """Lê o perfil de armazenamento como {pragma: valor}.
+
+    Usa os valores padrão quando a tabela ainda não existe (antes do
+    init_db) ou quando algum valor salvo é inválido.
+    """
+    profile = dict(STORAGE_PROFILE_DEFAULTS)
+    try:
+        placeholders = ', '.join('?' * len(profile))
+        rows = conn.execute(
+            'SELECT setting_key, setting_value FROM system_settings '
+            f'WHERE setting_key IN ({placeholders})',
+            tuple(profile),
+        ).fetchall()
+    except sqlite3.OperationalError:
+        rows = []
+    for key, value in rows:
+        if key not in profile:
+            continue
+        try:
+            profile[key] = _validate_storage_value(key, value)
+        except (ValueError, KeyError) as e:
+            LOGGER.error(f"Perfil de armazenamento: {e}")
+    return {STORAGE_PROFILE_PRAGMAS[key]: value
+            for key, value in profile.items()}
+
+
+class ConnectionManager:
+    """Mantém uma conexão SQLite por thread, reaproveitada entre as chamadas.
+
+    As funções de CRUD continuam usando ``with get_connection() as conn``:
+    o context manager do sqlite3 apenas faz commit/rollback, sem fechar a
+    conexão, então a mesma conexão é reutilizada pela thread inteira.
+
+    Cada conexão é guardada junto com a thread dona. Threads de trabalho
+    devem chamar close() ao terminar; as conexões de threads que terminaram
+    sem fechar são recolhidas na próxima abertura de conexão.
+    """
+
+    # Pragmas fixos aplicados uma única vez, quando a conexão é aberta
+    PRAGMAS = (
+        ('temp_store', 'MEMORY'),
+    )
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = {}  # conexão -> thread dona
+        self._generation = 0
+        self._profile_version = 0
+        self.opened = 0
+        self.reused = 0
+
+    def get(self):
+        """Retorna a conexão da thread atual, abrindo-a se necessário."""
+        conn = getattr(self._local, 'conn', None)
+        # Reabre se o caminho do banco mudou (ex.: DB_PATH alterado) ou se
+        # close_all() foi chamado enquanto a conexão estava em uso
+        if (conn is not None and self._local.path == DB_PATH
+                and self._local.generation == self._generation):
+            # Perfil de armazenamento alterado depois que a conexão abriu
+            if self._local.profile_version != self._profile_version:
+                self._apply_profile(conn)
+            with self._lock:
+                self.reused += 1
+            return conn
+        if conn is not None:
+            self.close()
+        self._close_dead()
+        conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+        self._local.profile_version = None
+        self._configure(conn)
+        self._local.conn = conn
+        self._local.path = DB_PATH
+        self._local.generation = self._generation
+        with self._lock:
+            self._connections[conn] = threading.current_thread()
+            self.opened += 1
+        return conn
+
+    def _close_dead(self):
+        """Fecha as conexões de threads que terminaram sem chamar close()."""
+        with self._lock:
+            dead = [conn for conn, thread in self._connections.items()
+                    if not thread.is_alive()]
+            for conn in dead:
+                del self._connections[conn]
+        for conn in dead:
+            self._close_quietly(conn)
+        if dead:
+            LOGGER.debug(f"{len(dead)} conexão(ões) de threads encerradas "
+                         "fechada(s)")
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except sqlite3.Error as e:
+            LOGGER.error(f"Erro ao fechar conexão: {e}")
+
+    def _configure(self, conn):
+        """Aplica os pragmas na conexão recém-aberta."""
+        for pragma, value in self.PRAGMAS:
+            conn.execute(f'PRAGMA {pragma} = {value}')
+        self._apply_profile(conn)
+
+    def _apply_profile(self, conn):
+        """Aplica o perfil de armazenamento salvo em system_settings.
+
+        A versão do perfil só é registrada se todos os PRAGMAs foram
+        aplicados; caso contrário, a próxima chamada a get() tenta de novo.
+        """
+        # journal_mode não pode mudar com uma transação aberta
+        if conn.in_transaction:
+            return
+        version = self._profile_version
+        applied = True
+        for pragma, value in _read_storage_profile(conn).items():
+            try:
+                conn.execute(f'PRAGMA {pragma} = {value}')
+            except sqlite3.Error as e:
+                applied = False
+                LOGGER.error(f"Erro ao aplicar PRAGMA {pragma}={value}: {e}")
+        if applied:
+            self._local.profile_version = version
+
+    def reload_profile(self):
+        """Faz as conexões abertas reaplicarem o perfil no próximo uso."""
+        with self._lock:
+            self._profile_version += 1
+
+    def close(self):
+        """Fecha a conexão da thread atual (ex.: ao encerrar uma QThread)."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            return
+        self._local.conn = None
+        with self._lock:
+            self._connections.pop(conn, None)
+        self._close_quietly(conn)
+
+    def close_all(self):
+        """Fecha as conexões do pool (usado ao finalizar a aplicação).
+
+        Fecha a conexão da thread atual e as de threads já encerradas. As
+        de threads ainda vivas não são fechadas por aqui, pois podem estar
+        em uso: elas são descartadas pela própria thread no próximo get().
+        """
+        self.close()
+        with self._lock:
+            self._generation += 1
+        self._close_dead()
+
+    def stats(self):
+        """Retorna quantas conexões foram abertas e quantas vezes reutilizadas."""
+        with self._lock:
+            return {
+                'opened': self.opened,
+                'reused': self.reused,
+                'active': len(self._connections),
+            }
+
+
+CONNECTIONS = ConnectionManager()
+
+
 def get_connection():
-    return sqlite3.connect(DB_PATH)
+    return CONNECTIONS.get()
 
 
-def init_db():
-    with get_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS order_item_specific_additions (
-                order_item_id INTEGER NOT NULL,
-                item_specific_addition_id INTEGER NOT NULL,
-                PRIMARY KEY (order_item_id, item_specific_addition_id),
-                FOREIGN KEY (order_item_id) REFERENCES order_items(id),
-                FOREIGN KEY (item_specific_addition_id) REFERENCES item_specific_additions(id)
-            )
-        ''')
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS categories (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT UNIQUE NOT NULL
-            )
-        ''')
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS additions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT UNIQUE NOT NULL,
-                price REAL NOT NULL DEFAULT 0.0
-            )
-        ''')
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS menu_items (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT UNIQUE NOT NULL,
-                price REAL NOT NULL,
-                category_id INTEGER NOT NULL,
-                description TEXT,
-                FOREIGN KEY (category_id) REFERENCES categories(id)
-            )
-        ''')
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS category_addition_link (
-                category_id INTEGER NOT NULL,
-                addition_id INTEGER NOT NULL,
-                PRIMARY KEY (category_id, addition_id),
-                FOREIGN KEY (category_id) REFERENCES categories(id),
-                FOREIGN KEY (addition_id) REFERENCES additions(id)
-            )
-        ''')
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS item_addition_link (
-                item_id INTEGER NOT NULL,
-                addition_id INTEGER NOT NULL,
-                is_mandatory BOOLEAN DEFAULT 0,
-                PRIMARY KEY (item_id, addition_id),
-                FOREIGN KEY (item_id) REFERENCES menu_items(id),
-                FOREIGN KEY (addition_id) REFERENCES additions(id)
-            )
-        ''')
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS neighborhoods (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT UNIQUE NOT NULL,
-                delivery_fee REAL NOT NULL DEFAULT 0.0
-            )
-        ''')
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS customers (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT,
-                phone TEXT UNIQUE,
-                street TEXT,
-                number TEXT,
-                neighborhood_id INTEGER,
-                reference TEXT,
-                FOREIGN KEY (neighborhood_id) REFERENCES neighborhoods(id)
-            )
-        ''')
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS orders (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                customer_id INTEGER,
-                order_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                total_amount REAL NOT NULL DEFAULT 0.0,
-                status TEXT DEFAULT 'Pendente',
-                notes TEXT,
-                FOREIGN KEY (customer_id) REFERENCES customers(id)
-            )
-        ''')
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS order_items (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                order_id INTEGER NOT NULL,
-                menu_item_id INTEGER NOT NULL,
-                quantity INTEGER NOT NULL DEFAULT 1,
-                unit_price REAL NOT NULL,
-                mandatory_selected TEXT,
-                FOREIGN KEY (order_id) REFERENCES orders(id),
-                FOREIGN KEY (menu_item_id) REFERENCES menu_items(id)
-            )
-        ''')
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS order_item_additions (
-                order_item_id INTEGER NOT NULL,
-                addition_id INTEGER NOT NULL,
-                qty INTEGER NOT NULL DEFAULT 1,
-                PRIMARY KEY (order_item_id, addition_id),
-                FOREIGN KEY (order_item_id) REFERENCES order_items(id),
-                FOREIGN KEY (addition_id) REFERENCES additions(id)
-            )
-        ''')
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS item_specific_additions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                item_id INTEGER NOT NULL,
-                name TEXT NOT NULL,
-                price REAL NOT NULL DEFAULT 0.0,
-                is_mandatory BOOLEAN DEFAULT 0,
-                FOREIGN KEY (item_id) REFERENCES menu_items(id)
-            )
-        ''')
+def close_connection():
+    """Fecha a conexão da thread atual."""
+    CONNECTIONS.close()
 
-        # Tabela de configurações do sistema
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS system_settings (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                setting_key TEXT UNIQUE NOT NULL,
-                setting_value TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+
+def close_all_connections():
+    """Fecha todas as conexões do pool."""
+    CONNECTIONS.close_all()
+
+
+def get_connection_stats():
+    """Retorna estatísticas de conexões abertas/reutilizadas."""
+    return CONNECTIONS.stats()
+
+
+# Versão do cardápio: incrementada a cada escrita em categorias, itens ou
+# complementos, para invalidar caches (ver database/menu_catalog.py)
+_menu_version = 0
+_menu_version_lock = threading.Lock()
+
+
+def get_menu_version():
+    """Retorna a versão atual do cardápio"""
+    return _menu_version
+
+
+# Versão das configurações: incrementada a cada set_system_setting, para
+# invalidar caches derivados delas (ex.: cabeçalho do recibo)
+_settings_version = 0
+_settings_version_lock = threading.Lock()
+
+
+def get_settings_version():
+    """Retorna a versão atual das configurações do sistema"""
+    return _settings_version
+
+
+def _bumps_settings_version(func):
+    """Decorador para funções que alteram as configurações."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        global _settings_version
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with _settings_version_lock:
+                _settings_version += 1
+    return wrapper
+
+
+def _bumps_menu_version(func):
+    """Decorador para funções que alteram o cardápio."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        global _menu_version
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with _menu_version_lock:
+                _menu_version += 1
+    return wrapper
+
+
+# None até a primeira busca; False quando o SQLite não tem FTS5 (ou a tabela
+# customers_fts não existe) e a busca volta a usar LIKE
+_customers_fts_enabled = None
+
+
+def _customers_fts_available():
+    """Indica (uma vez por banco) se a busca textual pode ser usada."""
+    global _customers_fts_enabled
+    if _customers_fts_enabled is None:
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' "
+                "AND name = 'customers_fts'"
             )
-        ''')
+            _customers_fts_enabled = cursor.fetchone() is not None
+    return _customers_fts_enabled
 
-        # Migração: adicionar coluna is_mandatory se não existir
-        cursor.execute("PRAGMA table_info(item_addition_link)")
-        columns = [column[1] for column in cursor.fetchall()]
-        if 'is_mandatory' not in columns:
-            cursor.execute('''
-                ALTER TABLE item_addition_link 
-                ADD COLUMN is_mandatory BOOLEAN DEFAULT 0
-            ''')
-
-        # Migração: adicionar coluna is_mandatory aos complementos específicos se não existir
-        cursor.execute("PRAGMA table_info(item_specific_additions)")
-        columns = [column[1] for column in cursor.fetchall()]
-        if 'is_mandatory' not in columns:
-            cursor.execute('''
-                ALTER TABLE item_specific_additions 
-                ADD COLUMN is_mandatory BOOLEAN DEFAULT 0
-            ''')
-
-        # Migração: adicionar coluna mandatory_selected se não existir
-        cursor.execute("PRAGMA table_info(order_items)")
-        columns = [column[1] for column in cursor.fetchall()]
-        if 'mandatory_selected' not in columns:
-            cursor.execute('''
-                ALTER TABLE order_items ADD COLUMN mandatory_selected TEXT
-            ''')
-        # Migração: adicionar coluna observations se não existir
-        cursor.execute("PRAGMA table_info(order_items)")
-        columns = [column[1] for column in cursor.fetchall()]
-        if 'observations' not in columns:
-            cursor.execute('''
-                ALTER TABLE order_items ADD COLUMN observations TEXT
-            ''')
 
-        # Migração: adicionar coluna neighborhood_id se não existir
-        cursor.execute("PRAGMA table_info(customers)")
-        columns = [column[1] for column in cursor.fetchall()]
-        if 'neighborhood_id' not in columns:
-            cursor.execute('''
-                ALTER TABLE customers ADD COLUMN neighborhood_id INTEGER 
-                REFERENCES neighborhoods(id)
-            ''')
-        conn.commit()
+def init_db():
+    """Cria ou atualiza o esquema do banco (ver database/migrations.py).
+
+    Com o banco em dia, custa um único SELECT.
+    """
+    global _customers_fts_enabled
+    from database.migrations import migrate
+    with get_connection() as conn:
+        applied = migrate(conn)
+    # Pode ser outro banco (DB_PATH alterado): reavalia a busca textual
+    _customers_fts_enabled = None
+    if applied:
+        # A conexão foi aberta antes da tabela de configurações existir
+        CONNECTIONS.reload_profile()
+        # Valores padrão podem ter sido inseridos: caches relêem a tabela
+        _notify_settings_change(None)
 
 
 # CRUD para categorias
+@_bumps_menu_version
 def add_category(name):
     with get_connection() as conn:
         cursor = conn.cursor()
@@ -218,6 +360,7 @@ def get_categories():
         return [row[0] for row in cursor.fetchall()]
 
 
+@_bumps_menu_version
 def delete_category(name):
     with get_connection() as conn:
         cursor = conn.cursor()
@@ -241,6 +384,7 @@ def delete_category(name):
         conn.commit()
 
 
+@_bumps_menu_version
 def update_category(category_id, name):
     """Atualiza o nome de uma categoria mantendo o id e todos os vínculos."""
     with get_connection() as conn:
@@ -256,6 +400,7 @@ def update_category(category_id, name):
 # CRUD para adicionais
 
 
+@_bumps_menu_version
 def add_addition(name, price=0.0):
     with get_connection() as conn:
         cursor = conn.cursor()
@@ -269,6 +414,7 @@ def add_addition(name, price=0.0):
             raise ValueError('Complemento já existe.') from e
 
 
+@_bumps_menu_version
 def delete_addition(addition_id):
     with get_connection() as conn:
         cursor = conn.cursor()
@@ -283,6 +429,7 @@ def delete_addition(addition_id):
         conn.commit()
 
 
+@_bumps_menu_version
 def update_addition(addition_id, name, price):
     """Atualiza o nome e o preço de um complemento mantendo o id."""
     with get_connection() as conn:
@@ -298,6 +445,7 @@ def update_addition(addition_id, name, price):
 # CRUD para itens do cardápio
 
 
+@_bumps_menu_version
 def add_menu_item(name, price, category_id, description='', addition_ids=None, mandatory_ids=None):
     """
     Adiciona um item ao menu com complementos obrigatórios
@@ -335,29 +483,76 @@ def add_menu_item(name, price, category_id, description='', addition_ids=None, m
 
 
 def get_menu_items():
+    """
+    Lista os itens do cardápio com os adicionais vinculados.
+
+    Uma única consulta (itens + vínculos) agrupada aqui, em vez de uma
+    consulta de adicionais por item.
+
+    Returns:
+        list: (id, name, price, category_name, description,
+               [(addition_id, addition_name, addition_price), ...])
+    """
     with get_connection() as conn:
         cursor = conn.cursor()
         cursor.execute('''
-            SELECT mi.id, mi.name, mi.price, c.name, mi.description
+            SELECT mi.id, mi.name, mi.price, c.name, mi.description,
+                   a.id, a.name, a.price
             FROM menu_items mi
             JOIN categories c ON mi.category_id = c.id
+            LEFT JOIN item_addition_link l ON l.item_id = mi.id
+            LEFT JOIN additions a ON l.addition_id = a.id
+            ORDER BY mi.id, l.addition_id
         ''')
         items = []
+        additions = None
+        last_id = None
         for row in cursor.fetchall():
-            item_id, name, price, category_name, description = row
-            # Busca os adicionais vinculados
-            cursor.execute('''
-                SELECT a.id, a.name, a.price FROM item_addition_link l
-                JOIN additions a ON l.addition_id = a.id
-                WHERE l.item_id = ?
-            ''', (item_id,))
-            additions = [(add_id, add_name, add_price)
-                         for add_id, add_name, add_price in cursor.fetchall()]
-            items.append(
-                (item_id, name, price, category_name, description, additions))
+            item_id, name, price, category_name, description = row[:5]
+            if item_id != last_id:
+                additions = []
+                items.append(
+                    (item_id, name, price, category_name, description, additions))
+                last_id = item_id
+            # Vínculo sem adicional (LEFT JOIN) não entra na lista
+            if row[5] is not None:
+                additions.append(row[5:])
         return items
 
 
+def menu_item_name_exists(name, exclude_id=None):
+    """
+    Verifica se já existe item do cardápio com esse nome.
+
+    Usa o índice UNIQUE de menu_items.name (sem carregar o cardápio).
+
+    Args:
+        name (str): Nome do item
+        exclude_id (int): Item ignorado na verificação (ex.: o próprio
+            item em edição)
+
+    Returns:
+        bool: True se o nome já está em uso
+    """
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            'SELECT id FROM menu_items WHERE name = ?', (name,))
+        row = cursor.fetchone()
+        return row is not None and row[0] != exclude_id
+
+
+def get_menu_item_category_id(item_id):
+    """Retorna o id da categoria do item do cardápio (ou None)."""
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            'SELECT category_id FROM menu_items WHERE id = ?', (item_id,))
+        row = cursor.fetchone()
+        return row[0] if row else None
+
+
+@_bumps_menu_version
 def delete_menu_item(item_id):
     with get_connection() as conn:
         cursor = conn.cursor()
@@ -367,6 +562,7 @@ def delete_menu_item(item_id):
         conn.commit()
 
 
+@_bumps_menu_version
 def update_menu_item_basic(item_id, name, price, category_id, description):
     """Atualiza apenas os campos básicos do item sem mexer nos vínculos"""
     import sqlite3
@@ -399,6 +595,7 @@ def update_menu_item_basic(item_id, name, price, category_id, description):
             f"🔧 DB_UPDATE_BASIC: Atualização básica concluída - NENHUM vínculo foi alterado")
 
 
+@_bumps_menu_version
 def update_menu_item(item_id, name, price, category_id, description, addition_ids=None, mandatory_ids=None):
     import sqlite3
     with get_connection() as conn:
@@ -425,6 +622,7 @@ def update_menu_item(item_id, name, price, category_id, description, addition_id
 # CRUD para vínculos categoria-adicionais
 
 
+@_bumps_menu_version
 def set_category_additions(category, additions):
     """Atualiza os vínculos de categoria-adicionais de forma otimizada"""
     with get_connection() as conn:
@@ -494,6 +692,7 @@ def get_category_addition_ids(category_id):
         return [row[0] for row in cursor.fetchall()]
 
 
+@_bumps_menu_version
 def set_category_addition_ids(category_id, addition_ids):
     """Atualiza os vínculos categoria-adicionais de forma otimizada"""
     with get_connection() as conn:
@@ -532,20 +731,121 @@ def set_category_addition_ids(category_id, addition_ids):
 
 # CRUD para clientes
 
-def add_customer(name, phone, street=None, number=None, neighborhood_id=None, reference=None):
+# Observadores de alterações em clientes: callback(action, customer_id),
+# com action 'insert', 'update', 'delete' ou 'reload' (customer_id None)
+_customer_listeners = []
+
+
+def add_customer_listener(callback):
+    """Registra um observador de alterações na tabela de clientes"""
+    if callback not in _customer_listeners:
+        _customer_listeners.append(callback)
+
+
+def remove_customer_listener(callback):
+    """Remove um observador registrado com add_customer_listener"""
+    if callback in _customer_listeners:
+        _customer_listeners.remove(callback)
+
+
+def _notify_customer_change(action, customer_id=None):
+    for callback in list(_customer_listeners):
+        try:
+            callback(action, customer_id)
+        except Exception as e:
+            LOGGER.error(f"Erro ao notificar alteração de cliente: {e}")
+
+
+def normalize_customer_name(name):
+    """Nome sem acentos, em minúsculas e com espaços simples, usado para
+    achar um cliente pelo nome digitado (coluna name_normalized)."""
+    if not name:
+        return None
+    decomposed = unicodedata.normalize('NFKD', name)
+    stripped = ''.join(ch for ch in decomposed
+                       if not unicodedata.combining(ch))
+    return ' '.join(stripped.casefold().split()) or None
+
+
+def _insert_customer(cursor, name, phone, street, number, neighborhood_id,
+                     reference):
     # Se phone for string vazia, converte para None para evitar violar UNIQUE
     phone_db = phone if phone else None
+    try:
+        cursor.execute(
+            'INSERT INTO customers (name, phone, street, number, neighborhood_id, reference, name_normalized) VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (name, phone_db, street, number, neighborhood_id, reference,
+             normalize_customer_name(name))
+        )
+    except sqlite3.IntegrityError as e:
+        raise ValueError(
+            'Telefone já cadastrado para outro cliente.') from e
+    return cursor.lastrowid
+
+
+def add_customer(name, phone, street=None, number=None, neighborhood_id=None, reference=None):
+    """Cadastra um cliente e retorna o id criado."""
     with get_connection() as conn:
         cursor = conn.cursor()
-        try:
+        customer_id = _insert_customer(cursor, name, phone, street, number,
+                                       neighborhood_id, reference)
+        conn.commit()
+    _notify_customer_change('insert', customer_id)
+    return customer_id
+
+
+def find_or_create_customer(name, phone, street=None, number=None,
+                            neighborhood_id=None, reference=None):
+    """Retorna o cliente com este telefone e o cadastra se ainda não
+    existir, numa única transação.
+
+    Sem telefone, só reaproveita um cliente também sem telefone, com o
+    mesmo nome (normalizado), rua e número; um homônimo com outro endereço
+    ou com telefone ganha um cadastro novo.
+
+    Returns:
+        tuple: (customer_id, created)
+    """
+    phone = phone if phone else None
+    with get_connection() as conn:
+        _begin_write(conn)
+        cursor = conn.cursor()
+        if phone:
+            cursor.execute('SELECT id FROM customers WHERE phone = ?',
+                           (phone,))
+        else:
             cursor.execute(
-                'INSERT INTO customers (name, phone, street, number, neighborhood_id, reference) VALUES (?, ?, ?, ?, ?, ?)',
-                (name, phone_db, street, number, neighborhood_id, reference)
+                'SELECT id FROM customers WHERE name_normalized = ? '
+                'AND phone IS NULL '
+                "AND COALESCE(street, '') = ? AND COALESCE(number, '') = ? "
+                'ORDER BY id LIMIT 1',
+                (normalize_customer_name(name), street or '', number or '')
             )
-            conn.commit()
-        except sqlite3.IntegrityError as e:
-            raise ValueError(
-                'Telefone já cadastrado para outro cliente.') from e
+        row = cursor.fetchone()
+        if row is not None:
+            return row[0], False
+        customer_id = _insert_customer(cursor, name, phone, street, number,
+                                       neighborhood_id, reference)
+    _notify_customer_change('insert', customer_id)
+    return customer_id, True
+
+
+# Clientes por página nas consultas paginadas
+CUSTOMER_PAGE_SIZE = 200
+
+
+def customer_page_key(customer):
+    """Cursor (nome, id) de uma linha no formato de get_customers.
+
+    Passado como after para get_customers_page/search_customers_page, a
+    próxima página começa logo depois desta linha.
+    """
+    return (customer[1] or '', customer[0])
+
+
+def _page_params(after):
+    name, customer_id = after if after is not None else ('', 0)
+    return (name, name, customer_id)
 
 
 def get_customers():
@@ -555,23 +855,79 @@ def get_customers():
             SELECT c.id, c.name, c.phone, c.street, c.number, c.neighborhood_id, c.reference, n.name as neighborhood_name
             FROM customers c
             LEFT JOIN neighborhoods n ON c.neighborhood_id = n.id
-            ORDER BY c.name
+            ORDER BY COALESCE(c.name, ''), c.id
         ''')
         return cursor.fetchall()
 
 
+def get_customers_page(after=None, limit=CUSTOMER_PAGE_SIZE):
+    """Uma página de clientes em ordem de nome, começando após o cursor.
+
+    Args:
+        after (tuple): Cursor de customer_page_key (None para a primeira)
+        limit (int): Quantidade máxima de clientes
+
+    Returns:
+        list: Linhas no formato de get_customers
+    """
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        # A condição repetida permite ao SQLite buscar direto no índice
+        # idx_customers_name_key em vez de percorrê-lo desde o início
+        cursor.execute('''
+            SELECT c.id, c.name, c.phone, c.street, c.number, c.neighborhood_id, c.reference, n.name as neighborhood_name
+            FROM customers c
+            LEFT JOIN neighborhoods n ON c.neighborhood_id = n.id
+            WHERE COALESCE(c.name, '') >= ?
+            AND (COALESCE(c.name, '') > ? OR c.id > ?)
+            ORDER BY COALESCE(c.name, ''), c.id
+            LIMIT ?
+        ''', _page_params(after) + (limit,))
+        return cursor.fetchall()
+
+
+def _iter_pages(fetch_page, page_size):
+    after = None
+    while True:
+        page = fetch_page(after, page_size)
+        yield from page
+        if len(page) < page_size:
+            return
+        after = customer_page_key(page[-1])
+
+
+def iter_customers(page_size=CUSTOMER_PAGE_SIZE):
+    """Percorre todos os clientes, lendo uma página por vez do banco."""
+    return _iter_pages(get_customers_page, page_size)
+
+
+def get_customer_row(customer_id):
+    """Retorna um cliente no mesmo formato de get_customers, ou None"""
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT c.id, c.name, c.phone, c.street, c.number, c.neighborhood_id, c.reference, n.name as neighborhood_name
+            FROM customers c
+            LEFT JOIN neighborhoods n ON c.neighborhood_id = n.id
+            WHERE c.id = ?
+        ''', (customer_id,))
+        return cursor.fetchone()
+
+
 def update_customer(customer_id, name, phone, street=None, number=None, neighborhood_id=None, reference=None):
     with get_connection() as conn:
         cursor = conn.cursor()
         try:
             cursor.execute(
-                'UPDATE customers SET name=?, phone=?, street=?, number=?, neighborhood_id=?, reference=? WHERE id=?',
-                (name, phone, street, number, neighborhood_id, reference, customer_id)
+                'UPDATE customers SET name=?, phone=?, street=?, number=?, neighborhood_id=?, reference=?, name_normalized=? WHERE id=?',
+                (name, phone, street, number, neighborhood_id, reference,
+                 normalize_customer_name(name), customer_id)
             )
             conn.commit()
         except sqlite3.IntegrityError as e:
             raise ValueError(
                 'Telefone já cadastrado para outro cliente.') from e
+    _notify_customer_change('update', customer_id)
 
 
 def delete_customer(customer_id):
@@ -579,6 +935,26 @@ def delete_customer(customer_id):
         cursor = conn.cursor()
         cursor.execute('DELETE FROM customers WHERE id = ?', (customer_id,))
         conn.commit()
+    _notify_customer_change('delete', customer_id)
+
+
+def get_customer_by_name(name):
+    """Retorna o cliente com este nome (ignorando acentos, maiúsculas e
+    espaços extras) no formato de get_customers, ou None."""
+    normalized = normalize_customer_name(name)
+    if normalized is None:
+        return None
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT c.id, c.name, c.phone, c.street, c.number, c.neighborhood_id, c.reference, n.name as neighborhood_name
+            FROM customers c
+            LEFT JOIN neighborhoods n ON c.neighborhood_id = n.id
+            WHERE c.name_normalized = ?
+            ORDER BY c.id
+            LIMIT 1
+        ''', (normalized,))
+        return cursor.fetchone()
 
 
 def get_customer_by_phone(phone):
@@ -595,159 +971,163 @@ def get_customer_by_phone(phone):
 
 # CRUD para pedidos
 
+def _day_range(day):
+    """Retorna o intervalo semiaberto [dia, dia seguinte) para order_date.
+
+    As datas são gravadas como 'YYYY-MM-DD HH:MM:SS', então a comparação de
+    texto equivale a DATE(order_date) = dia, mas pode usar o índice
+    idx_orders_order_date.
+    """
+    from datetime import timedelta
+    return (day.strftime('%Y-%m-%d'),
+            (day + timedelta(days=1)).strftime('%Y-%m-%d'))
+
+
 def get_orders_today():
-    """Retorna os pedidos feitos hoje, com customer_id, total e itens."""
-    import datetime
+    """Retorna os pedidos feitos hoje, com customer_id, total e itens.
+
+    Carrega o dia inteiro com um número fixo de consultas (pedidos, itens,
+    complementos e obrigatórios) e monta a estrutura em memória.
+    """
     from datetime import datetime as dt
 
     # Usa horário local para garantir pedidos do dia
-    today = dt.now().date()
-    today_str = today.strftime('%Y-%m-%d')
+    day_range = _day_range(dt.now().date())
+    # Itens dos pedidos do dia, reaproveitado pelas consultas filhas
+    today_items = '''
+        SELECT oi.id FROM order_items oi
+        JOIN orders o ON oi.order_id = o.id
+        WHERE o.order_date >= ? AND o.order_date < ?
+    '''
     with get_connection() as conn:
         cursor = conn.cursor()
         cursor.execute('''
             SELECT id, customer_id, total_amount
             FROM orders
-            WHERE DATE(order_date) = ?
-            ORDER BY datetime(order_date, 'localtime') DESC
-        ''', (today_str,))
-        orders = []
-        for order_id, customer_id, total in cursor.fetchall():
-            # Busca itens do pedido com todos os detalhes
-            cursor.execute('''
-                SELECT oi.id, oi.menu_item_id, oi.quantity, oi.unit_price, m.name, m.category_id, c.name as category_name, oi.mandatory_selected, oi.observations
-                FROM order_items oi
-                JOIN menu_items m ON oi.menu_item_id = m.id
-                JOIN categories c ON m.category_id = c.id
-                WHERE oi.order_id = ?
-            ''', (order_id,))
-            items = []
-            for row in cursor.fetchall():
-                order_item_id, menu_item_id, quantity, unit_price, item_name, category_id, category_name, mandatory_selected_str, observations = row
-                # Buscar descrição do item
-                cursor.execute(
-                    'SELECT description FROM menu_items WHERE id = ?', (menu_item_id,))
-                desc_row = cursor.fetchone()
-                item_description = desc_row[0] if desc_row and desc_row[0] else ''
-                # Observações do item (se existir coluna, buscar; senão, vazio)
-                cursor.execute('''
-                    PRAGMA table_info(order_items)
-                ''')
-                columns = [col[1] for col in cursor.fetchall()]
-                if 'observations' in columns:
-                    cursor.execute(
-                        'SELECT observations FROM order_items WHERE id = ?', (order_item_id,))
-                    obs_row = cursor.fetchone()
-                    observations = obs_row[0] if obs_row and obs_row[0] else ''
-                else:
-                    observations = ''
-
-                # DEBUG: Verificar o conteúdo da tabela order_item_additions
-                cursor.execute(
-                    'SELECT * FROM order_item_additions WHERE order_item_id = ?', (order_item_id,))
-                debug_additions = cursor.fetchall()
-                print(
-                    f"\033[96m[DB] DEBUG - order_item_additions para item {order_item_id}: {debug_additions}\033[0m")
-
-                # DEBUG: Verificar se a tabela tem dados em geral
-                cursor.execute('SELECT COUNT(*) FROM order_item_additions')
-                total_count = cursor.fetchone()[0]
-                print(
-                    f"\033[96m[DB] DEBUG - Total de registros em order_item_additions: {total_count}\033[0m")
-
-                # Adicionais com quantidade correta do banco
-                # Busca complementos da tabela additions (IDs numéricos)
-                cursor.execute('''
-                    SELECT a.id, a.name, a.price, oia.qty FROM order_item_additions oia
-                    JOIN additions a ON oia.addition_id = a.id
-                    WHERE oia.order_item_id = ? AND oia.addition_id NOT LIKE 'specific_%'
-                ''', (order_item_id,))
-                additions_result = cursor.fetchall()
-
-                # Busca complementos específicos do item (IDs com 'specific_')
-                cursor.execute('''
-                    SELECT isa.id, isa.name, isa.price, oia.qty FROM order_item_additions oia
-                    JOIN item_specific_additions isa ON CAST(REPLACE(oia.addition_id, 'specific_', '') AS INTEGER) = isa.id
-                    WHERE oia.order_item_id = ? AND oia.addition_id LIKE 'specific_%'
-                ''', (order_item_id,))
-                specific_additions_result = cursor.fetchall()
-
-                # Combina os dois resultados
-                all_additions_result = additions_result + specific_additions_result
-
-                print(
-                    f"\033[91m[DB] Consultando complementos para order_item_id {order_item_id}: {len(all_additions_result)} encontrados\033[0m")
-                print(
-                    f"\033[91m[DB] Complementos normais: {len(additions_result)}, Específicos: {len(specific_additions_result)}\033[0m")
-                print(
-                    f"\033[91m[DB] Complementos raw: {all_additions_result}\033[0m")
-
-                additions = []
-                for add_id, add_name, add_price, add_qty in all_additions_result:
-                    print(
-                        f"\033[91m[DB] Processando complemento: id={add_id}, name={add_name}, price={add_price}, qty={add_qty}\033[0m")
-                    additions.append(
-                        {'id': add_id, 'name': add_name, 'price': add_price, 'qty': add_qty, 'total': add_price * add_qty})
-
-                # Todos obrigatórios do cardápio
-                cursor.execute('''
-                    SELECT id, name, price FROM item_specific_additions WHERE item_id = ? AND is_mandatory = 1
-                ''', (menu_item_id,))
-                all_mandatory_additions = []
-                for mand_id, mand_name, mand_price in cursor.fetchall():
-                    all_mandatory_additions.append(
-                        {'id': mand_id, 'name': mand_name, 'price': mand_price})
-
-                # Apenas obrigatórios selecionados para o item do pedido
-                mandatory_additions = []
-                mandatory_selected = []
-                cursor.execute('''
-                    SELECT isa.id, isa.name, isa.price
-                    FROM order_item_specific_additions oisa
-                    JOIN item_specific_additions isa ON oisa.item_specific_addition_id = isa.id
-                    WHERE oisa.order_item_id = ?
-                ''', (order_item_id,))
-                for mand_id, mand_name, mand_price in cursor.fetchall():
-                    mandatory_additions.append(
-                        {'id': mand_id, 'name': mand_name, 'price': mand_price})
-                    mandatory_selected.append(mand_id)
-
-                # Monta item_data igual ao usado na tela
-                item_data = [menu_item_id, item_name, unit_price,
-                             category_id, category_name, item_description]
-                # Lista de IDs dos obrigatórios selecionados (preferencialmente da coluna mandatory_selected)
-                if mandatory_selected_str:
-                    mandatory_selected = []
-                    for mid in mandatory_selected_str.split(','):
-                        mid = mid.strip()
-                        if mid:
-                            # Tenta converter para int se for numérico, senão mantém como string
-                            try:
-                                mandatory_selected.append(int(mid))
-                            except ValueError:
-                                # Para IDs com prefixo como "specific_23"
-                                mandatory_selected.append(mid)
-                else:
-                    mandatory_selected = [m['id'] for m in mandatory_additions]
-                print(
-                    f"\033[92mItem: {item_name}, Mandatory: {mandatory_selected}\033[0m")
-                items.append({
-                    'menu_item_id': menu_item_id,
-                    'qty': quantity,
-                    'unit_price': unit_price,
-                    'item_data': item_data,
-                    'additions': additions,
-                    'mandatory_additions': mandatory_additions,
-                    'mandatory_selected': mandatory_selected,
-                    'all_mandatory_additions': all_mandatory_additions,
-                    'observations': observations
-                })
-            orders.append({
-                'customer_id': customer_id,
-                'total': total,
-                'items': items
-            })
-        return orders
+            WHERE order_date >= ? AND order_date < ?
+            ORDER BY order_date DESC, id DESC
+        ''', day_range)
+        order_rows = cursor.fetchall()
+        if not order_rows:
+            return []
+
+        # Itens de todos os pedidos do dia
+        cursor.execute('''
+            SELECT oi.id, oi.order_id, oi.menu_item_id, oi.quantity,
+                   oi.unit_price, m.name, m.category_id,
+                   c.name as category_name, m.description,
+                   oi.mandatory_selected, oi.observations
+            FROM order_items oi
+            JOIN orders o ON oi.order_id = o.id
+            JOIN menu_items m ON oi.menu_item_id = m.id
+            JOIN categories c ON m.category_id = c.id
+            WHERE o.order_date >= ? AND o.order_date < ?
+            ORDER BY oi.order_id, oi.id
+        ''', day_range)
+        item_rows = cursor.fetchall()
+
+        # Complementos da tabela additions
+        cursor.execute(f'''
+            SELECT oia.order_item_id, a.id, a.name, a.price, oia.qty
+            FROM order_item_additions oia
+            JOIN additions a ON oia.addition_id = a.id
+            WHERE oia.order_item_id IN ({today_items})
+              AND oia.addition_id IS NOT NULL
+            ORDER BY oia.order_item_id, oia.addition_id
+        ''', day_range)
+        additions_by_item = {}
+        for order_item_id, add_id, add_name, add_price, add_qty in cursor.fetchall():
+            additions_by_item.setdefault(order_item_id, []).append(
+                {'id': add_id, 'name': add_name, 'price': add_price,
+                 'qty': add_qty, 'total': add_price * add_qty})
+
+        # Complementos específicos do item, depois dos normais como antes
+        cursor.execute(f'''
+            SELECT oia.order_item_id, isa.id, isa.name, isa.price, oia.qty
+            FROM order_item_additions oia
+            JOIN item_specific_additions isa
+              ON oia.item_specific_addition_id = isa.id
+            WHERE oia.order_item_id IN ({today_items})
+              AND oia.item_specific_addition_id IS NOT NULL
+            ORDER BY oia.order_item_id, oia.item_specific_addition_id
+        ''', day_range)
+        for order_item_id, add_id, add_name, add_price, add_qty in cursor.fetchall():
+            additions_by_item.setdefault(order_item_id, []).append(
+                {'id': add_id, 'name': add_name, 'price': add_price,
+                 'qty': add_qty, 'total': add_price * add_qty})
+
+        # Todos obrigatórios do cardápio para os itens vendidos no dia
+        cursor.execute(f'''
+            SELECT isa.item_id, isa.id, isa.name, isa.price
+            FROM item_specific_additions isa
+            WHERE isa.is_mandatory = 1 AND isa.item_id IN (
+                SELECT oi.menu_item_id FROM order_items oi
+                WHERE oi.id IN ({today_items})
+            )
+            ORDER BY isa.item_id, isa.id
+        ''', day_range)
+        all_mandatory_by_menu_item = {}
+        for menu_item_id, mand_id, mand_name, mand_price in cursor.fetchall():
+            all_mandatory_by_menu_item.setdefault(menu_item_id, []).append(
+                {'id': mand_id, 'name': mand_name, 'price': mand_price})
+
+        # Obrigatórios selecionados em cada item do pedido
+        cursor.execute(f'''
+            SELECT oisa.order_item_id, isa.id, isa.name, isa.price
+            FROM order_item_specific_additions oisa
+            JOIN item_specific_additions isa
+              ON oisa.item_specific_addition_id = isa.id
+            WHERE oisa.order_item_id IN ({today_items})
+            ORDER BY oisa.order_item_id, isa.id
+        ''', day_range)
+        mandatory_by_item = {}
+        for order_item_id, mand_id, mand_name, mand_price in cursor.fetchall():
+            mandatory_by_item.setdefault(order_item_id, []).append(
+                {'id': mand_id, 'name': mand_name, 'price': mand_price})
+
+    items_by_order = {}
+    for row in item_rows:
+        (order_item_id, order_id, menu_item_id, quantity, unit_price,
+         item_name, category_id, category_name, item_description,
+         mandatory_selected_str, observations) = row
+        mandatory_additions = mandatory_by_item.get(order_item_id, [])
+
+        # Lista de IDs dos obrigatórios selecionados (preferencialmente da coluna mandatory_selected)
+        if mandatory_selected_str:
+            mandatory_selected = []
+            for mid in mandatory_selected_str.split(','):
+                mid = mid.strip()
+                if mid:
+                    # Tenta converter para int se for numérico, senão mantém como string
+                    try:
+                        mandatory_selected.append(int(mid))
+                    except ValueError:
+                        # Para IDs com prefixo como "specific_23"
+                        mandatory_selected.append(mid)
+        else:
+            mandatory_selected = [m['id'] for m in mandatory_additions]
+
+        # Monta item_data igual ao usado na tela
+        item_data = [menu_item_id, item_name, unit_price,
+                     category_id, category_name, item_description or '']
+        items_by_order.setdefault(order_id, []).append({
+            'menu_item_id': menu_item_id,
+            'qty': quantity,
+            'unit_price': unit_price,
+            'item_data': item_data,
+            'additions': additions_by_item.get(order_item_id, []),
+            'mandatory_additions': mandatory_additions,
+            'mandatory_selected': mandatory_selected,
+            'all_mandatory_additions': list(
+                all_mandatory_by_menu_item.get(menu_item_id, [])),
+            'observations': observations or ''
+        })
+
+    return [{
+        'customer_id': customer_id,
+        'total': total,
+        'items': items_by_order.get(order_id, [])
+    } for order_id, customer_id, total in order_rows]
 
 
 def get_customer_by_id(customer_id):
@@ -841,9 +1221,39 @@ def update_order_total(order_id):
         conn.commit()
 
 
+def _fts_match_query(search_term):
+    """Converte o texto digitado numa consulta FTS5: todas as palavras,
+    cada uma como prefixo ("jo sil" acha "José da Silva")."""
+    tokens = re.findall(r'\w+', search_term or '')
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
 def search_customers(search_term):
-    """Busca clientes por nome, telefone ou endereço (rua, número, referência)
+    """Busca clientes por nome, telefone, endereço (rua, número,
+    referência) ou bairro, os mais relevantes primeiro.
+
+    Usa o índice customers_fts (prefixo de palavras, ordenado por bm25);
+    sem FTS5 no SQLite, volta ao LIKE em ordem de nome.
     """
+    if not _customers_fts_available():
+        return _search_customers_like(search_term)
+    match = _fts_match_query(search_term)
+    if not match:
+        return []
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT c.id, c.name, c.phone, c.street, c.number, c.neighborhood_id, c.reference, n.name as neighborhood_name
+            FROM customers_fts
+            JOIN customers c ON c.id = customers_fts.rowid
+            LEFT JOIN neighborhoods n ON c.neighborhood_id = n.id
+            WHERE customers_fts MATCH ?
+            ORDER BY customers_fts.rank, c.id
+        ''', (match,))
+        return cursor.fetchall()
+
+
+def _search_customers_like(search_term):
     with get_connection() as conn:
         cursor = conn.cursor()
         search_pattern = f'%{search_term}%'
@@ -853,7 +1263,7 @@ def search_customers(search_term):
             LEFT JOIN neighborhoods n ON c.neighborhood_id = n.id
             WHERE c.name LIKE ? OR c.phone LIKE ? OR c.street LIKE ? 
             OR c.number LIKE ? OR c.reference LIKE ? 
-            ORDER BY c.name
+            ORDER BY COALESCE(c.name, ''), c.id
         ''', (
             search_pattern, search_pattern, search_pattern,
             search_pattern, search_pattern
@@ -861,6 +1271,89 @@ def search_customers(search_term):
         return cursor.fetchall()
 
 
+def search_customers_page(search_term, after=None, limit=CUSTOMER_PAGE_SIZE):
+    """Uma página de search_customers, começando após o cursor.
+
+    Com FTS5 a ordem é por relevância: do cursor só o id é usado, e a
+    relevância desse cliente é recalculada para continuar dali. Se o
+    cliente do cursor deixou de corresponder à busca, a lista termina.
+
+    Args:
+        search_term (str): Texto buscado em nome, telefone e endereço
+        after (tuple): Cursor de customer_page_key (None para a primeira)
+        limit (int): Quantidade máxima de clientes
+
+    Returns:
+        list: Linhas no formato de get_customers
+    """
+    if not _customers_fts_available():
+        return _search_customers_like_page(search_term, after, limit)
+    match = _fts_match_query(search_term)
+    if not match:
+        return []
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        if after is None:
+            cursor.execute('''
+                SELECT c.id, c.name, c.phone, c.street, c.number, c.neighborhood_id, c.reference, n.name as neighborhood_name
+                FROM customers_fts
+                JOIN customers c ON c.id = customers_fts.rowid
+                LEFT JOIN neighborhoods n ON c.neighborhood_id = n.id
+                WHERE customers_fts MATCH ?
+                ORDER BY customers_fts.rank, c.id
+                LIMIT ?
+            ''', (match, limit))
+            return cursor.fetchall()
+
+        after_id = after[1]
+        cursor.execute(
+            'SELECT rank FROM customers_fts '
+            'WHERE customers_fts MATCH ? AND rowid = ?',
+            (match, after_id)
+        )
+        row = cursor.fetchone()
+        if row is None:
+            return []
+        after_rank = row[0]
+        cursor.execute('''
+            SELECT c.id, c.name, c.phone, c.street, c.number, c.neighborhood_id, c.reference, n.name as neighborhood_name
+            FROM customers_fts
+            JOIN customers c ON c.id = customers_fts.rowid
+            LEFT JOIN neighborhoods n ON c.neighborhood_id = n.id
+            WHERE customers_fts MATCH ?
+            AND (customers_fts.rank > ?
+                 OR (customers_fts.rank = ? AND c.id > ?))
+            ORDER BY customers_fts.rank, c.id
+            LIMIT ?
+        ''', (match, after_rank, after_rank, after_id, limit))
+        return cursor.fetchall()
+
+
+def _search_customers_like_page(search_term, after, limit):
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        search_pattern = f'%{search_term}%'
+        cursor.execute('''
+            SELECT c.id, c.name, c.phone, c.street, c.number, c.neighborhood_id, c.reference, n.name as neighborhood_name
+            FROM customers c
+            LEFT JOIN neighborhoods n ON c.neighborhood_id = n.id
+            WHERE COALESCE(c.name, '') >= ?
+            AND (COALESCE(c.name, '') > ? OR c.id > ?)
+            AND (c.name LIKE ? OR c.phone LIKE ? OR c.street LIKE ?
+                 OR c.number LIKE ? OR c.reference LIKE ?)
+            ORDER BY COALESCE(c.name, ''), c.id
+            LIMIT ?
+        ''', _page_params(after) + (search_pattern,) * 5 + (limit,))
+        return cursor.fetchall()
+
+
+def iter_search_customers(search_term, page_size=CUSTOMER_PAGE_SIZE):
+    """Percorre o resultado de search_customers uma página por vez."""
+    def fetch_page(after, limit):
+        return search_customers_page(search_term, after, limit)
+    return _iter_pages(fetch_page, page_size)
+
+
 # Funções para gerenciar bairros
 
 
@@ -888,6 +1381,15 @@ def get_neighborhoods():
         return cursor.fetchall()
 
 
+def get_neighborhood_id(name):
+    """Retorna o id do bairro com este nome (ou None)."""
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT id FROM neighborhoods WHERE name = ?', (name,))
+        row = cursor.fetchone()
+        return row[0] if row else None
+
+
 def update_neighborhood(neighborhood_id, name, delivery_fee):
     """Atualiza um bairro"""
     with get_connection() as conn:
@@ -900,6 +1402,8 @@ def update_neighborhood(neighborhood_id, name, delivery_fee):
             conn.commit()
         except sqlite3.IntegrityError as e:
             raise ValueError('Erro: Nome do bairro já existe.') from e
+    # O nome do bairro faz parte das linhas de get_customers
+    _notify_customer_change('reload')
 
 
 def delete_neighborhood(neighborhood_id):
@@ -1081,6 +1585,7 @@ def get_item_specific_additions(item_id):
         return cursor.fetchall()
 
 
+@_bumps_menu_version
 def update_item_specific_addition(addition_id, name, price, is_mandatory=None):
     """Atualiza um complemento específico mantendo o ID"""
     with get_connection() as conn:
@@ -1098,6 +1603,7 @@ def update_item_specific_addition(addition_id, name, price, is_mandatory=None):
         conn.commit()
 
 
+@_bumps_menu_version
 def delete_item_specific_addition(addition_id):
     """Remove um complemento específico por ID"""
     with get_connection() as conn:
@@ -1108,6 +1614,7 @@ def delete_item_specific_addition(addition_id):
         conn.commit()
 
 
+@_bumps_menu_version
 def add_item_specific_addition_single(item_id, name, price, is_mandatory=False):
     """Adiciona um único complemento específico para um item"""
     with get_connection() as conn:
@@ -1121,6 +1628,7 @@ def add_item_specific_addition_single(item_id, name, price, is_mandatory=False):
         return addition_id
 
 
+@_bumps_menu_version
 def set_item_specific_additions(item_id, additions_data):
     """Define os complementos específicos de um item
     additions_data: lista de dicionários com 'name', 'price', 'is_mandatory' e opcionalmente 'id'
@@ -1166,52 +1674,119 @@ def set_item_specific_additions(item_id, additions_data):
         conn.commit()
 
 
+def _insert_order(cursor, customer_id, items_data, total_amount, notes,
+                  order_date):
+    """Grava um pedido com seus itens e adicionais usando executemany.
+
+    Deve ser chamada dentro de uma transação já aberta.
+    """
+    cursor.execute('''
+        INSERT INTO orders (customer_id, order_date, total_amount, notes)
+        VALUES (?, ?, ?, ?)
+    ''', (customer_id, order_date, total_amount, notes))
+    order_id = cursor.lastrowid
+    if not items_data:
+        return order_id
+
+    item_rows = []
+    for item_data in items_data:
+        mandatory_selected_str = None
+        if 'mandatory_selected' in item_data and item_data['mandatory_selected']:
+            mandatory_selected_str = ','.join(
+                str(mid) for mid in item_data['mandatory_selected'])
+        item_rows.append((order_id, item_data['menu_item_id'],
+                          item_data['quantity'], item_data['unit_price'],
+                          mandatory_selected_str,
+                          item_data.get('observations', '')))
+    cursor.executemany('''
+        INSERT INTO order_items
+        (order_id, menu_item_id, quantity, unit_price, mandatory_selected, observations)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', item_rows)
+
+    # Os ids são crescentes dentro da transação, então seguem a ordem dos itens
+    cursor.execute(
+        'SELECT id FROM order_items WHERE order_id = ? ORDER BY id',
+        (order_id,))
+    order_item_ids = [row[0] for row in cursor.fetchall()]
+
+    # Adicionais dos itens, agora com quantidade; o id único ("specific_N"
+    # ou int) vai para a coluna do tipo de complemento. Um id que não se
+    # encaixa em nenhum dos dois é guardado à parte, sem impedir o pedido
+    addition_rows = []
+    unparsed_rows = []
+    for order_item_id, item_data in zip(order_item_ids, items_data):
+        for add in item_data.get('additions', []):
+            addition_id = add.get('id') if isinstance(add, dict) else add
+            qty = add.get('qty', 1) if isinstance(add, dict) else 1
+            if isinstance(addition_id, str) and addition_id.isdigit():
+                addition_id = int(addition_id)
+            try:
+                real_id, source_type = parse_addition_id(addition_id)
+            except ValueError as e:
+                LOGGER.warning(f"Pedido {order_id}: {e}")
+                unparsed_rows.append(
+                    (order_item_id, None if addition_id is None
+                     else str(addition_id), qty))
+                continue
+            if source_type == 'specific':
+                addition_rows.append((order_item_id, None, real_id, qty))
+            else:
+                addition_rows.append((order_item_id, real_id, None, qty))
+    if addition_rows:
+        cursor.executemany('''
+            INSERT INTO order_item_additions
+            (order_item_id, addition_id, item_specific_addition_id, qty)
+            VALUES (?, ?, ?, ?)
+        ''', addition_rows)
+    if unparsed_rows:
+        cursor.executemany('''
+            INSERT INTO order_item_additions_unparsed
+            (order_item_id, addition_id, qty)
+            VALUES (?, ?, ?)
+        ''', unparsed_rows)
+    return order_id
+
+
+def _begin_write(conn):
+    """Abre uma transação de escrita explícita, se ainda não houver uma."""
+    if not conn.in_transaction:
+        conn.execute('BEGIN IMMEDIATE')
+
+
 def save_order(customer_id, items_data, total_amount, notes=""):
     """Salva um pedido no banco de dados"""
+    import datetime
+    order_date = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     with get_connection() as conn:
-        cursor = conn.cursor()
+        _begin_write(conn)
+        return _insert_order(conn.cursor(), customer_id, items_data,
+                             total_amount, notes, order_date)
 
-        # Cria o pedido
-        import datetime
-        order_date = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        cursor.execute('''
-            INSERT INTO orders (customer_id, order_date, total_amount, notes)
-            VALUES (?, ?, ?, ?)
-        ''', (customer_id, order_date, total_amount, notes))
 
-        order_id = cursor.lastrowid
-
-        # Adiciona os itens do pedido
-        for item_data in items_data:
-            mandatory_selected_str = None
-            if 'mandatory_selected' in item_data and item_data['mandatory_selected']:
-                mandatory_selected_str = ','.join(
-                    str(mid) for mid in item_data['mandatory_selected'])
-            observations = item_data.get('observations', '')
-            cursor.execute('''
-                INSERT INTO order_items
-                (order_id, menu_item_id, quantity, unit_price, mandatory_selected, observations)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (order_id, item_data['menu_item_id'],
-                  item_data['quantity'], item_data['unit_price'], mandatory_selected_str, observations))
-
-            order_item_id = cursor.lastrowid
-
-            # Adiciona os adicionais do item, agora com quantidade
-            additions = item_data.get('additions', [])
-            for add in additions:
-                addition_id = add.get('id') if isinstance(add, dict) else add
-                qty = add.get('qty', 1) if isinstance(add, dict) else 1
-                cursor.execute('''
-                        INSERT INTO order_item_additions
-                        (order_item_id, addition_id, qty)
-                        VALUES (?, ?, ?)
-                    ''', (order_item_id, addition_id, qty))
+def save_orders_bulk(orders):
+    """Salva vários pedidos em uma única transação (ex.: importação).
 
-        conn.commit()
-        return order_id
+    Cada pedido é um dict com 'customer_id', 'items', 'total_amount' e,
+    opcionalmente, 'notes' e 'order_date' ('YYYY-MM-DD HH:MM:SS'). Os itens
+    seguem o mesmo formato de save_order. Retorna a lista de ids criados;
+    se algum pedido falhar, nenhum é gravado.
+    """
+    import datetime
+    now = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    order_ids = []
+    with get_connection() as conn:
+        _begin_write(conn)
+        cursor = conn.cursor()
+        for order in orders:
+            order_ids.append(_insert_order(
+                cursor, order.get('customer_id'), order.get('items', []),
+                order.get('total_amount', 0.0), order.get('notes', ''),
+                order.get('order_date') or now))
+    return order_ids
 
 
+@_bumps_menu_version
 def set_item_mandatory_additions(item_id, addition_ids):
     """Define quais complementos são obrigatórios para um item específico"""
     from utils.log_utils import get_logger
@@ -1280,6 +1855,7 @@ def set_item_mandatory_additions(item_id, addition_ids):
             f"🔧 DB_SET_MANDATORY: Commit executado para item {item_id}")
 
 
+@_bumps_menu_version
 def set_item_specific_mandatory_additions(item_id, specific_addition_ids):
     """Define quais complementos específicos são obrigatórios para um item"""
     from utils.log_utils import get_logger
@@ -1385,6 +1961,7 @@ def get_all_available_additions_for_item(item_id, category_id):
         return all_additions
 
 
+@_bumps_menu_version
 def add_item_specific_addition(item_id, name, price, is_mandatory=False):
     """Adiciona um complemento específico para um item"""
     with get_connection() as conn:
@@ -1436,6 +2013,32 @@ def get_all_additions_for_item_with_mandatory_and_specific_info(item_id, categor
 
 
 # Funções para configurações do sistema
+
+# Observadores de alterações nas configurações: callback(key, value), com
+# key None quando todas devem ser relidas (ver database/settings_store.py)
+_settings_listeners = []
+
+
+def add_settings_listener(callback):
+    """Registra um observador de alterações em system_settings"""
+    if callback not in _settings_listeners:
+        _settings_listeners.append(callback)
+
+
+def remove_settings_listener(callback):
+    """Remove um observador registrado com add_settings_listener"""
+    if callback in _settings_listeners:
+        _settings_listeners.remove(callback)
+
+
+def _notify_settings_change(key, value=None):
+    for callback in list(_settings_listeners):
+        try:
+            callback(key, value)
+        except Exception as e:
+            LOGGER.error(f"Erro ao notificar alteração de configuração: {e}")
+
+
 def get_system_setting(key, default_value=None):
     """Obtém uma configuração do sistema pelo nome da chave"""
     with get_connection() as conn:
@@ -1448,6 +2051,7 @@ def get_system_setting(key, default_value=None):
         return result[0] if result else default_value
 
 
+@_bumps_settings_version
 def set_system_setting(key, value):
     """Define ou atualiza uma configuração do sistema"""
     with get_connection() as conn:
@@ -1458,6 +2062,7 @@ def set_system_setting(key, value):
             VALUES (?, ?, CURRENT_TIMESTAMP)
         ''', (key, str(value)))
         conn.commit()
+    _notify_settings_change(key, str(value))
 
 
 def get_all_system_settings():
@@ -1468,3 +2073,167 @@ def get_all_system_settings():
             'SELECT setting_key, setting_value FROM system_settings'
         )
         return dict(cursor.fetchall())
+
+
+def get_storage_profile():
+    """Retorna o perfil de armazenamento salvo (chave -> valor)"""
+    profile = dict(STORAGE_PROFILE_DEFAULTS)
+    for key in profile:
+        profile[key] = get_system_setting(key, profile[key])
+    return profile
+
+
+def set_storage_profile(**settings):
+    """Atualiza o perfil de armazenamento (ex.: db_journal_mode='WAL').
+
+    Os valores são validados antes de salvar e as conexões abertas
+    reaplicam os pragmas no próximo uso.
+    """
+    values = {key: _validate_storage_value(key, value)
+              for key, value in settings.items()}
+    for key, value in values.items():
+        set_system_setting(key, value)
+    CONNECTIONS.reload_profile()
+
+
+# Fila de impressão (print_jobs)
+# Situações: pending -> printing -> done, ou failed após esgotar as tentativas
+PRINT_JOB_PENDING = 'pending'
+PRINT_JOB_PRINTING = 'printing'
+PRINT_JOB_DONE = 'done'
+PRINT_JOB_FAILED = 'failed'
+
+# Dias que os trabalhos concluídos ficam guardados
+PRINT_JOB_RETENTION_DAYS = 7
+
+
+def _now_timestamp(delay_seconds=0):
+    """Data/hora local no formato das colunas TIMESTAMP do banco."""
+    import datetime
+    moment = datetime.datetime.now() + datetime.timedelta(
+        seconds=delay_seconds)
+    return moment.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def enqueue_print_job(lines, printer_name=None, order_id=None):
+    """Grava um trabalho de impressão na fila e retorna o id.
+
+    lines são as linhas do recibo; printer_name None usa a impressora
+    padrão no momento da impressão.
+    """
+    import json
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT INTO print_jobs
+            (order_id, printer_name, lines, status, created_at, next_attempt_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (order_id, printer_name, json.dumps(list(lines)),
+              PRINT_JOB_PENDING, _now_timestamp(), _now_timestamp()))
+        return cursor.lastrowid
+
+
+def claim_print_job():
+    """Marca o próximo trabalho pendente como em impressão e o retorna.
+
+    Retorna (id, lines, printer_name, attempts) com attempts já contando a
+    tentativa atual, ou None se nenhum trabalho estiver pronto.
+    """
+    import json
+    with get_connection() as conn:
+        _begin_write(conn)
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT id, lines, printer_name, attempts FROM print_jobs
+            WHERE status = ? AND next_attempt_at <= ?
+            ORDER BY next_attempt_at, id
+            LIMIT 1
+        ''', (PRINT_JOB_PENDING, _now_timestamp()))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        job_id, lines, printer_name, attempts = row
+        cursor.execute('''
+            UPDATE print_jobs SET status = ?, attempts = attempts + 1
+            WHERE id = ?
+        ''', (PRINT_JOB_PRINTING, job_id))
+        return job_id, json.loads(lines), printer_name, attempts + 1
+
+
+def get_next_print_job_time():
+    """Retorna quando o próximo trabalho pendente pode ser impresso."""
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            'SELECT MIN(next_attempt_at) FROM print_jobs WHERE status = ?',
+            (PRINT_JOB_PENDING,))
+        return cursor.fetchone()[0]
+
+
+def finish_print_job(job_id):
+    """Marca o trabalho como impresso."""
+    with get_connection() as conn:
+        conn.execute(
+            'UPDATE print_jobs SET status = ?, last_error = NULL WHERE id = ?',
+            (PRINT_JOB_DONE, job_id))
+
+
+def retry_print_job(job_id, error, delay_seconds):
+    """Devolve o trabalho à fila para nova tentativa após delay_seconds."""
+    with get_connection() as conn:
+        conn.execute('''
+            UPDATE print_jobs SET status = ?, last_error = ?,
+                   next_attempt_at = ?
+            WHERE id = ?
+        ''', (PRINT_JOB_PENDING, str(error), _now_timestamp(delay_seconds),
+              job_id))
+
+
+def fail_print_job(job_id, error):
+    """Marca o trabalho como falho (tentativas esgotadas)."""
+    with get_connection() as conn:
+        conn.execute(
+            'UPDATE print_jobs SET status = ?, last_error = ? WHERE id = ?',
+            (PRINT_JOB_FAILED, str(error), job_id))
+
+
+def requeue_print_job(job_id):
+    """Recoloca um trabalho falho na fila, zerando as tentativas."""
+    with get_connection() as conn:
+        conn.execute('''
+            UPDATE print_jobs SET status = ?, attempts = 0,
+                   next_attempt_at = ?
+            WHERE id = ? AND status = ?
+        ''', (PRINT_JOB_PENDING, _now_timestamp(), job_id, PRINT_JOB_FAILED))
+
+
+def recover_print_jobs():
+    """Prepara a fila ao iniciar o spooler.
+
+    Trabalhos que estavam em impressão quando o programa caiu voltam a ficar
+    pendentes e os concluídos antigos são apagados.
+    """
+    with get_connection() as conn:
+        _begin_write(conn)
+        cursor = conn.cursor()
+        cursor.execute(
+            'UPDATE print_jobs SET status = ? WHERE status = ?',
+            (PRINT_JOB_PENDING, PRINT_JOB_PRINTING))
+        recovered = cursor.rowcount
+        cursor.execute(
+            'DELETE FROM print_jobs WHERE status = ? AND created_at < ?',
+            (PRINT_JOB_DONE,
+             _now_timestamp(-PRINT_JOB_RETENTION_DAYS * 24 * 3600)))
+        return recovered
+
+
+def get_print_queue_counts():
+    """Retorna a quantidade de trabalhos por situação."""
+    counts = {PRINT_JOB_PENDING: 0, PRINT_JOB_PRINTING: 0,
+              PRINT_JOB_DONE: 0, PRINT_JOB_FAILED: 0}
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            'SELECT status, COUNT(*) FROM print_jobs GROUP BY status')
+        counts.update(cursor.fetchall())
+    return counts
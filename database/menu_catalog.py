@@ -0,0 +1,153 @@
+"""
+Cache em memória do cardápio (categorias, itens e complementos).
+
+O catálogo é carregado uma única vez por processo e recarregado apenas
+quando a versão do cardápio muda (ver db.get_menu_version), ou seja, depois
+de alguma escrita em categorias, itens ou complementos.
+"""
+
+import threading
+
+from database import db
+
+
+class MenuCatalog:
+    """Cardápio completo em memória com buscas O(1) por id/nome."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._key = None
+        self._items = []
+        self._items_by_id = {}
+        self._category_ids = {}
+        self._additions = {}
+        self._category_additions = {}
+        self._item_links = {}
+        self._specific_additions = {}
+        self._item_additions_cache = {}
+
+    @property
+    def version(self):
+        """Versão do cardápio atualmente carregada."""
+        self._ensure_loaded()
+        return self._key[1]
+
+    def _ensure_loaded(self):
+        key = (str(db.DB_PATH), db.get_menu_version())
+        if self._key == key:
+            return
+        with self._lock:
+            if self._key != key:
+                self._load()
+                self._key = key
+
+    def _load(self):
+        """Carrega todas as tabelas do cardápio de uma vez."""
+        with db.get_connection() as conn:
+            cursor = conn.cursor()
+            # Mesmo formato e ordem de search_menu_items("")
+            cursor.execute('''
+                SELECT m.id, m.name, m.price, m.category_id,
+                       c.name as category_name, m.description
+                FROM menu_items m
+                JOIN categories c ON m.category_id = c.id
+                ORDER BY m.name
+            ''')
+            items = cursor.fetchall()
+            cursor.execute('SELECT id, name FROM categories')
+            categories = cursor.fetchall()
+            cursor.execute('SELECT id, name, price FROM additions')
+            additions = cursor.fetchall()
+            cursor.execute(
+                'SELECT category_id, addition_id FROM category_addition_link')
+            category_links = cursor.fetchall()
+            cursor.execute('''
+                SELECT item_id, addition_id, COALESCE(is_mandatory, 0)
+                FROM item_addition_link
+            ''')
+            item_links = cursor.fetchall()
+            cursor.execute('''
+                SELECT id, item_id, name, price, is_mandatory
+                FROM item_specific_additions
+            ''')
+            specific_additions = cursor.fetchall()
+
+        self._items = items
+        self._items_by_id = {item[0]: item for item in items}
+        self._category_ids = {name: cat_id for cat_id, name in categories}
+        self._additions = {add_id: (name, price)
+                           for add_id, name, price in additions}
+
+        self._category_additions = {}
+        for category_id, addition_id in category_links:
+            self._category_additions.setdefault(
+                category_id, set()).add(addition_id)
+
+        self._item_links = {}
+        for item_id, addition_id, is_mandatory in item_links:
+            self._item_links.setdefault(item_id, {})[addition_id] = \
+                is_mandatory
+
+        self._specific_additions = {}
+        for spec_id, item_id, name, price, is_mandatory in specific_additions:
+            self._specific_additions.setdefault(item_id, []).append(
+                (spec_id, name, price, is_mandatory))
+
+        self._item_additions_cache = {}
+
+    def get_items(self):
+        """Retorna todos os itens: (id, name, price, category_id,
+        category_name, description), ordenados por nome."""
+        self._ensure_loaded()
+        return self._items
+
+    def get_item(self, item_id):
+        """Retorna um item pelo id ou None."""
+        self._ensure_loaded()
+        return self._items_by_id.get(item_id)
+
+    def get_category_id(self, name):
+        """Retorna o id da categoria pelo nome ou None."""
+        self._ensure_loaded()
+        return self._category_ids.get(name)
+
+    def get_additions_for_item(self, item_id, category_id):
+        """Mesmo resultado de get_all_additions_for_item_with_mandatory_info.
+
+        Tuplas (id_unico, name, price, is_mandatory, source_type), com os
+        complementos de categoria/vinculados primeiro e os específicos
+        (id 'specific_N') depois, cada grupo com obrigatórios na frente.
+        """
+        self._ensure_loaded()
+        key = (item_id, category_id)
+        cached = self._item_additions_cache.get(key)
+        if cached is not None:
+            return cached
+
+        links = self._item_links.get(item_id, {})
+        addition_ids = set(self._category_additions.get(category_id, ()))
+        addition_ids.update(links)
+        category_additions = []
+        for add_id in addition_ids:
+            if add_id not in self._additions:
+                continue
+            name, price = self._additions[add_id]
+            category_additions.append(
+                (add_id, name, price, links.get(add_id, 0), 'category'))
+        category_additions.sort(key=lambda add: (-add[3], add[1]))
+
+        specific_additions = [
+            (f"specific_{spec_id}", name, price, is_mandatory, 'specific')
+            for spec_id, name, price, is_mandatory
+            in self._specific_additions.get(item_id, [])
+        ]
+        # NULL fica por último no ORDER BY is_mandatory DESC do SQLite
+        specific_additions.sort(key=lambda add: (
+            -(add[3] if add[3] is not None else -1), add[1]))
+
+        result = category_additions + specific_additions
+        self._item_additions_cache[key] = result
+        return result
+
+
+MENU_CATALOG = MenuCatalog()
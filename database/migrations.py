@@ -0,0 +1,480 @@
+"""
+Migrações do esquema do banco, em ordem e com versão.
+
+O banco guarda em schema_version as migrações já aplicadas. Na abertura,
+migrate() faz um único SELECT da maior versão e, se o banco estiver em dia,
+termina ali; caso contrário aplica só as pendentes, cada uma na sua
+transação.
+
+Bancos anteriores a este controle começam na versão 0 e passam por todas
+as migrações, então cada uma precisa ser idempotente (CREATE ... IF NOT
+EXISTS, coluna só adicionada se faltar). Para mudar o esquema, acrescente
+uma nova entrada ao final de MIGRATIONS; nunca altere uma já publicada.
+"""
+
+import sqlite3
+
+from database.db import (STORAGE_PROFILE_DEFAULTS, _begin_write,
+                         normalize_customer_name)
+from utils.log_utils import get_logger
+
+LOGGER = get_logger(__name__)
+
+# Índices secundários: (nome, tabela, colunas)
+INDEXES = (
+    # Histórico do dia (get_orders_today)
+    ('idx_orders_order_date', 'orders', 'order_date'),
+    # Histórico do cliente (get_customer_orders)
+    ('idx_orders_customer_date', 'orders', 'customer_id, order_date'),
+    ('idx_order_items_order_id', 'order_items', 'order_id'),
+    ('idx_order_items_menu_item_id', 'order_items', 'menu_item_id'),
+    ('idx_item_specific_additions_item_id',
+     'item_specific_additions', 'item_id'),
+    ('idx_category_addition_link_addition_id',
+     'category_addition_link', 'addition_id'),
+    ('idx_item_addition_link_addition_id', 'item_addition_link', 'addition_id'),
+    ('idx_customers_neighborhood_id', 'customers', 'neighborhood_id'),
+    # Paginação de clientes por (nome, id) (get_customers_page)
+    ('idx_customers_name_key', 'customers', "COALESCE(name, ''), id"),
+    # Cliente pelo nome exato (get_customer_by_name)
+    ('idx_customers_name_normalized', 'customers', 'name_normalized'),
+    ('idx_menu_items_category_id', 'menu_items', 'category_id'),
+    # Próximo trabalho da fila de impressão (claim_print_job)
+    ('idx_print_jobs_status_next', 'print_jobs', 'status, next_attempt_at'),
+)
+
+# Busca textual de clientes (FTS5). O rowid da tabela é o id do cliente;
+# phone_digits guarda só os dígitos do telefone, para achar "1198765" em
+# "(11) 98765-4321". Sem acentos e sem diferença de maiúsculas.
+CUSTOMERS_FTS_SCHEMA = '''
+    CREATE VIRTUAL TABLE customers_fts USING fts5(
+        name, phone, phone_digits, street, number, reference, neighborhood,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )
+'''
+
+# Telefone sem a pontuação usual
+_PHONE_DIGITS_SQL = (
+    "replace(replace(replace(replace(replace(replace(COALESCE({0}, ''), "
+    "' ', ''), '-', ''), '(', ''), ')', ''), '.', ''), '+', '')"
+)
+
+_CUSTOMERS_FTS_ROW = f'''
+    INSERT INTO customers_fts (rowid, name, phone, phone_digits, street,
+                               number, reference, neighborhood)
+    VALUES (new.id, new.name, new.phone, {_PHONE_DIGITS_SQL.format('new.phone')},
+            new.street, new.number, new.reference,
+            (SELECT name FROM neighborhoods WHERE id = new.neighborhood_id));
+'''
+
+# Gatilhos que mantêm customers_fts igual à tabela customers
+CUSTOMERS_FTS_TRIGGERS = (
+    f'''
+    CREATE TRIGGER IF NOT EXISTS customers_fts_insert
+    AFTER INSERT ON customers BEGIN
+        {_CUSTOMERS_FTS_ROW}
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS customers_fts_update
+    AFTER UPDATE ON customers BEGIN
+        DELETE FROM customers_fts WHERE rowid = old.id;
+        {_CUSTOMERS_FTS_ROW}
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS customers_fts_delete
+    AFTER DELETE ON customers BEGIN
+        DELETE FROM customers_fts WHERE rowid = old.id;
+    END
+    ''',
+    # Bairros com clientes não podem ser excluídos, só renomeados
+    '''
+    CREATE TRIGGER IF NOT EXISTS customers_fts_neighborhood
+    AFTER UPDATE OF name ON neighborhoods BEGIN
+        UPDATE customers_fts SET neighborhood = new.name
+        WHERE rowid IN (SELECT id FROM customers
+                        WHERE neighborhood_id = new.id);
+    END
+    ''',
+)
+
+# Preenche customers_fts a partir dos clientes já cadastrados
+CUSTOMERS_FTS_POPULATE = f'''
+    INSERT INTO customers_fts (rowid, name, phone, phone_digits, street,
+                               number, reference, neighborhood)
+    SELECT c.id, c.name, c.phone, {_PHONE_DIGITS_SQL.format('c.phone')},
+           c.street, c.number, c.reference, n.name
+    FROM customers c
+    LEFT JOIN neighborhoods n ON c.neighborhood_id = n.id
+'''
+
+
+def current_version(conn):
+    """Maior versão aplicada (0 para bancos sem schema_version)."""
+    try:
+        row = conn.execute('SELECT MAX(version) FROM schema_version').fetchone()
+    except sqlite3.OperationalError:
+        return 0
+    return row[0] or 0
+
+
+def _add_column(cursor, table, column, definition):
+    """Adiciona a coluna se a tabela ainda não a tiver."""
+    cursor.execute(f"PRAGMA table_info({table})")
+    if column not in [info[1] for info in cursor.fetchall()]:
+        cursor.execute(f'ALTER TABLE {table} ADD COLUMN {column} {definition}')
+        return True
+    return False
+
+
+def _create_tables(cursor):
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS order_item_specific_additions (
+            order_item_id INTEGER NOT NULL,
+            item_specific_addition_id INTEGER NOT NULL,
+            PRIMARY KEY (order_item_id, item_specific_addition_id),
+            FOREIGN KEY (order_item_id) REFERENCES order_items(id),
+            FOREIGN KEY (item_specific_addition_id) REFERENCES item_specific_additions(id)
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS categories (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT UNIQUE NOT NULL
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS additions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT UNIQUE NOT NULL,
+            price REAL NOT NULL DEFAULT 0.0
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS menu_items (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT UNIQUE NOT NULL,
+            price REAL NOT NULL,
+            category_id INTEGER NOT NULL,
+            description TEXT,
+            FOREIGN KEY (category_id) REFERENCES categories(id)
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS category_addition_link (
+            category_id INTEGER NOT NULL,
+            addition_id INTEGER NOT NULL,
+            PRIMARY KEY (category_id, addition_id),
+            FOREIGN KEY (category_id) REFERENCES categories(id),
+            FOREIGN KEY (addition_id) REFERENCES additions(id)
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS item_addition_link (
+            item_id INTEGER NOT NULL,
+            addition_id INTEGER NOT NULL,
+            is_mandatory BOOLEAN DEFAULT 0,
+            PRIMARY KEY (item_id, addition_id),
+            FOREIGN KEY (item_id) REFERENCES menu_items(id),
+            FOREIGN KEY (addition_id) REFERENCES additions(id)
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS neighborhoods (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT UNIQUE NOT NULL,
+            delivery_fee REAL NOT NULL DEFAULT 0.0
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS customers (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT,
+            phone TEXT UNIQUE,
+            street TEXT,
+            number TEXT,
+            neighborhood_id INTEGER,
+            reference TEXT,
+            name_normalized TEXT,
+            FOREIGN KEY (neighborhood_id) REFERENCES neighborhoods(id)
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS orders (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            customer_id INTEGER,
+            order_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            total_amount REAL NOT NULL DEFAULT 0.0,
+            status TEXT DEFAULT 'Pendente',
+            notes TEXT,
+            FOREIGN KEY (customer_id) REFERENCES customers(id)
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS order_items (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            order_id INTEGER NOT NULL,
+            menu_item_id INTEGER NOT NULL,
+            quantity INTEGER NOT NULL DEFAULT 1,
+            unit_price REAL NOT NULL,
+            mandatory_selected TEXT,
+            FOREIGN KEY (order_id) REFERENCES orders(id),
+            FOREIGN KEY (menu_item_id) REFERENCES menu_items(id)
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS order_item_additions (
+            order_item_id INTEGER NOT NULL,
+            addition_id INTEGER NOT NULL,
+            qty INTEGER NOT NULL DEFAULT 1,
+            PRIMARY KEY (order_item_id, addition_id),
+            FOREIGN KEY (order_item_id) REFERENCES order_items(id),
+            FOREIGN KEY (addition_id) REFERENCES additions(id)
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS item_specific_additions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            item_id INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            price REAL NOT NULL DEFAULT 0.0,
+            is_mandatory BOOLEAN DEFAULT 0,
+            FOREIGN KEY (item_id) REFERENCES menu_items(id)
+        )
+    ''')
+
+    # Tabela de configurações do sistema
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS system_settings (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            setting_key TEXT UNIQUE NOT NULL,
+            setting_value TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # Fila persistente de impressão (sobrevive a quedas do programa)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS print_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            order_id INTEGER,
+            printer_name TEXT,
+            lines TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            last_error TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            next_attempt_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (order_id) REFERENCES orders(id)
+        )
+    ''')
+
+    # Perfil de armazenamento padrão (não sobrescreve valores já salvos)
+    cursor.executemany('''
+        INSERT OR IGNORE INTO system_settings (setting_key, setting_value)
+        VALUES (?, ?)
+    ''', list(STORAGE_PROFILE_DEFAULTS.items()))
+
+
+def _add_mandatory_flags(cursor):
+    _add_column(cursor, 'item_addition_link', 'is_mandatory',
+                'BOOLEAN DEFAULT 0')
+    _add_column(cursor, 'item_specific_additions', 'is_mandatory',
+                'BOOLEAN DEFAULT 0')
+
+
+def _add_order_item_details(cursor):
+    _add_column(cursor, 'order_items', 'mandatory_selected', 'TEXT')
+    _add_column(cursor, 'order_items', 'observations', 'TEXT')
+
+
+def _add_customer_neighborhood(cursor):
+    _add_column(cursor, 'customers', 'neighborhood_id',
+                'INTEGER REFERENCES neighborhoods(id)')
+
+
+def _add_customer_name_normalized(cursor):
+    _add_column(cursor, 'customers', 'name_normalized', 'TEXT')
+    cursor.execute(
+        'SELECT id, name FROM customers '
+        'WHERE name IS NOT NULL AND name_normalized IS NULL')
+    cursor.executemany(
+        'UPDATE customers SET name_normalized = ? WHERE id = ?',
+        [(normalize_customer_name(name), customer_id)
+         for customer_id, name in cursor.fetchall()]
+    )
+
+
+def _create_indexes(cursor):
+    for index_name, table, columns in INDEXES:
+        cursor.execute(
+            f'CREATE INDEX IF NOT EXISTS {index_name} '
+            f'ON {table}({columns})'
+        )
+
+
+def _create_customers_fts(cursor):
+    """Cria e preenche a busca textual de clientes.
+
+    Sem FTS5 no SQLite a migração é dada como aplicada mesmo assim, e a
+    busca usa LIKE (ver db.search_customers).
+    """
+    cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' "
+        "AND name = 'customers_fts'"
+    )
+    created = cursor.fetchone() is None
+    try:
+        if created:
+            cursor.execute(CUSTOMERS_FTS_SCHEMA)
+            cursor.execute(CUSTOMERS_FTS_POPULATE)
+        for trigger in CUSTOMERS_FTS_TRIGGERS:
+            cursor.execute(trigger)
+    except sqlite3.OperationalError as e:
+        LOGGER.error(f"Busca textual (FTS5) indisponível, usando LIKE: {e}")
+
+
+def _create_unparsed_order_item_additions(cursor):
+    """Tabela dos complementos de pedido com id que não é um inteiro nem
+    'specific_N', guardados com o valor original."""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS order_item_additions_unparsed (
+            order_item_id INTEGER NOT NULL,
+            addition_id,
+            qty INTEGER NOT NULL DEFAULT 1,
+            FOREIGN KEY (order_item_id) REFERENCES order_items(id)
+        )
+    ''')
+
+
+def _split_order_item_additions(cursor):
+    """Separa complementos de categoria e específicos em colunas inteiras.
+
+    Antes, addition_id guardava o id do complemento de categoria ou o texto
+    'specific_N' (complemento específico do item), o que obrigava as
+    leituras a usar LIKE/CAST sem índice. A tabela é recriada com
+    addition_id (additions) e item_specific_addition_id
+    (item_specific_additions), um dos dois preenchido, e as linhas
+    existentes são convertidas.
+
+    Linhas cujo id não é um inteiro nem 'specific_N' não cabem nas colunas
+    novas: elas vão, com o valor original, para
+    order_item_additions_unparsed, em vez de serem descartadas.
+    """
+    _create_unparsed_order_item_additions(cursor)
+    cursor.execute("PRAGMA table_info(order_item_additions)")
+    if 'item_specific_addition_id' in [info[1] for info in cursor.fetchall()]:
+        return
+    cursor.execute('''
+        CREATE TABLE order_item_additions_typed (
+            order_item_id INTEGER NOT NULL,
+            addition_id INTEGER,
+            item_specific_addition_id INTEGER,
+            qty INTEGER NOT NULL DEFAULT 1,
+            CHECK ((addition_id IS NULL) <> (item_specific_addition_id IS NULL)),
+            FOREIGN KEY (order_item_id) REFERENCES order_items(id),
+            FOREIGN KEY (addition_id) REFERENCES additions(id),
+            FOREIGN KEY (item_specific_addition_id)
+                REFERENCES item_specific_additions(id)
+        )
+    ''')
+    # Ids numéricos viraram INTEGER pela afinidade da coluna antiga
+    cursor.execute('''
+        INSERT INTO order_item_additions_typed
+            (order_item_id, addition_id, qty)
+        SELECT order_item_id, addition_id, qty
+        FROM order_item_additions
+        WHERE typeof(addition_id) = 'integer'
+    ''')
+    cursor.execute('''
+        INSERT INTO order_item_additions_typed
+            (order_item_id, item_specific_addition_id, qty)
+        SELECT order_item_id,
+               CAST(substr(addition_id, length('specific_') + 1) AS INTEGER),
+               qty
+        FROM order_item_additions
+        WHERE typeof(addition_id) = 'text'
+          AND addition_id LIKE 'specific_%'
+          AND substr(addition_id, length('specific_') + 1) GLOB '[0-9]*'
+    ''')
+    cursor.execute('''
+        INSERT INTO order_item_additions_unparsed
+            (order_item_id, addition_id, qty)
+        SELECT order_item_id, addition_id, qty
+        FROM order_item_additions
+        WHERE typeof(addition_id) <> 'integer'
+          AND NOT (typeof(addition_id) = 'text'
+                   AND addition_id LIKE 'specific_%'
+                   AND substr(addition_id, length('specific_') + 1)
+                       GLOB '[0-9]*')
+    ''')
+    if cursor.rowcount:
+        LOGGER.warning(
+            f"{cursor.rowcount} complemento(s) de pedido com id inválido "
+            "guardado(s) em order_item_additions_unparsed")
+    cursor.execute('DROP TABLE order_item_additions')
+    cursor.execute('ALTER TABLE order_item_additions_typed '
+                   'RENAME TO order_item_additions')
+    # Um complemento por item do pedido, como a chave primária antiga;
+    # também servem às leituras por order_item_id
+    cursor.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_order_item_additions_addition
+        ON order_item_additions(order_item_id, addition_id)
+        WHERE addition_id IS NOT NULL
+    ''')
+    cursor.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_order_item_additions_specific
+        ON order_item_additions(order_item_id, item_specific_addition_id)
+        WHERE item_specific_addition_id IS NOT NULL
+    ''')
+
+
+# (versão, descrição, função que recebe o cursor), em ordem de versão
+MIGRATIONS = (
+    (1, 'tabelas base', _create_tables),
+    (2, 'complementos obrigatórios', _add_mandatory_flags),
+    (3, 'obrigatórios e observações dos itens do pedido',
+     _add_order_item_details),
+    (4, 'bairro do cliente', _add_customer_neighborhood),
+    (5, 'nome normalizado do cliente', _add_customer_name_normalized),
+    (6, 'índices secundários', _create_indexes),
+    (7, 'busca textual de clientes', _create_customers_fts),
+    (8, 'complementos do pedido com ids tipados',
+     _split_order_item_additions),
+    (9, 'complementos do pedido com id inválido',
+     _create_unparsed_order_item_additions),
+)
+
+
+def migrate(conn):
+    """Aplica as migrações pendentes e retorna quantas foram aplicadas."""
+    version = current_version(conn)
+    pending = [migration for migration in MIGRATIONS
+               if migration[0] > version]
+    for number, description, apply in pending:
+        _begin_write(conn)
+        try:
+            cursor = conn.cursor()
+            apply(cursor)
+            cursor.execute(
+                'INSERT INTO schema_version (version, description) '
+                'VALUES (?, ?)',
+                (number, description)
+            )
+        except Exception:
+            conn.rollback()
+            LOGGER.error(f"Falha na migração {number} ({description})")
+            raise
+        conn.commit()
+        LOGGER.info(f"Migração {number} aplicada: {description}")
+    return len(pending)
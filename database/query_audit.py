@@ -0,0 +1,152 @@
+"""
+Auditoria dos planos de consulta do db.py.
+
+Extrai as consultas SQL literais do db.py, roda EXPLAIN QUERY PLAN em cada
+uma e aponta as que ainda fazem varredura completa de tabela (SCAN sem
+índice).
+
+Uso:
+    python -m database.query_audit [caminho/do/banco.db]
+"""
+
+import ast
+import sys
+from pathlib import Path
+
+from database import db
+
+DB_SOURCE = Path(db.__file__)
+
+# Comandos que não têm plano de consulta relevante
+SKIPPED_PREFIXES = ('CREATE', 'ALTER', 'PRAGMA', 'DROP')
+
+# Funções que listam a tabela inteira de propósito (varredura esperada)
+EXPECTED_SCANS = {
+    'get_categories',
+    'get_category_additions',
+    'get_all_additions_with_id',
+    'get_menu_items',
+    'get_customers',
+    'get_orders',
+    'get_neighborhoods',
+    'get_all_system_settings',
+    '_search_customers_like',
+    '_customers_fts_available',  # sqlite_master
+    'search_menu_items',
+}
+
+
+def _local_constants(func):
+    """Mapeia variáveis locais atribuídas a uma string literal."""
+    constants = {}
+    for node in ast.walk(func):
+        if (isinstance(node, ast.Assign) and len(node.targets) == 1
+                and isinstance(node.targets[0], ast.Name)
+                and isinstance(node.value, ast.Constant)
+                and isinstance(node.value.value, str)):
+            constants[node.targets[0].id] = node.value.value
+    return constants
+
+
+def _resolve_sql(node, constants):
+    """Retorna o SQL de um literal ou de uma f-string que só interpola
+    constantes locais; None para consultas montadas em tempo de execução."""
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    if not isinstance(node, ast.JoinedStr):
+        return None
+    parts = []
+    for value in node.values:
+        if isinstance(value, ast.Constant):
+            parts.append(value.value)
+        elif (isinstance(value, ast.FormattedValue)
+              and isinstance(value.value, ast.Name)
+              and value.value.id in constants):
+            parts.append(constants[value.value.id])
+        else:
+            return None
+    return ''.join(parts)
+
+
+def collect_queries(source_path=DB_SOURCE):
+    """Retorna [(função, linha, sql)] das chamadas execute() do db.py.
+
+    Consultas montadas dinamicamente (concatenação, placeholders gerados)
+    são ignoradas.
+    """
+    tree = ast.parse(Path(source_path).read_text(encoding='utf-8'))
+    queries = []
+    for func in ast.walk(tree):
+        if not isinstance(func, ast.FunctionDef):
+            continue
+        constants = _local_constants(func)
+        for node in ast.walk(func):
+            if not (isinstance(node, ast.Call)
+                    and isinstance(node.func, ast.Attribute)
+                    and node.func.attr in ('execute', 'executemany')
+                    and node.args):
+                continue
+            sql = _resolve_sql(node.args[0], constants)
+            if sql is not None:
+                queries.append((func.name, node.lineno, sql.strip()))
+    return queries
+
+
+def explain(conn, sql):
+    """Retorna as linhas de detalhe do EXPLAIN QUERY PLAN da consulta."""
+    params = (None,) * sql.count('?')
+    rows = conn.execute(f'EXPLAIN QUERY PLAN {sql}', params).fetchall()
+    return [row[-1] for row in rows]
+
+
+def find_full_scans(plan):
+    """Filtra as linhas do plano que varrem a tabela sem usar índice.
+
+    Tabelas virtuais (FTS5) usam o próprio índice e não entram na lista.
+    """
+    return [detail for detail in plan
+            if detail.startswith('SCAN ') and ' USING ' not in detail
+            and ' VIRTUAL TABLE ' not in detail]
+
+
+def audit(conn, queries=None):
+    """Audita as consultas e retorna [(função, linha, sql, varreduras)].
+
+    Só são retornadas as consultas com varredura completa que não estão em
+    EXPECTED_SCANS.
+    """
+    if queries is None:
+        queries = collect_queries()
+    flagged = []
+    for func_name, lineno, sql in queries:
+        if sql.upper().startswith(SKIPPED_PREFIXES):
+            continue
+        if func_name in EXPECTED_SCANS:
+            continue
+        try:
+            scans = find_full_scans(explain(conn, sql))
+        except Exception as e:
+            scans = [f'erro ao explicar consulta: {e}']
+        if scans:
+            flagged.append((func_name, lineno, sql, scans))
+    return flagged
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        db.DB_PATH = Path(argv[0])
+    # Garante que o esquema e os índices existam no banco auditado
+    db.init_db()
+    flagged = audit(db.get_connection())
+    for func_name, lineno, sql, scans in flagged:
+        print(f'{DB_SOURCE.name}:{lineno} {func_name}')
+        for scan in scans:
+            print(f'    {scan}')
+        print('    ' + ' '.join(sql.split()))
+    print(f'{len(flagged)} consulta(s) com varredura completa')
+    return 1 if flagged else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
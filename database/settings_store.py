@@ -0,0 +1,113 @@
+"""
+Cache em memória das configurações do sistema (tabela system_settings).
+
+A tabela é lida uma única vez com get_all_system_settings(); depois disso
+as leituras são consultas a um dicionário. Toda gravação passa por
+db.set_system_setting, que avisa o SETTINGS (write-through), e os
+interessados numa chave podem se inscrever com subscribe().
+"""
+
+import threading
+
+from database import db
+from utils.log_utils import get_logger
+
+LOGGER = get_logger(__name__)
+
+TRUE_VALUES = ('true', '1', 'yes', 'sim')
+
+
+class SettingsStore:
+    """Configurações do sistema com acesso tipado e avisos de alteração."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._db_path = None
+        self._values = {}
+        self._subscribers = []
+        db.add_settings_listener(self._on_db_change)
+
+    def _ensure_loaded(self):
+        db_path = str(db.DB_PATH)
+        if self._db_path == db_path:
+            return
+        with self._lock:
+            if self._db_path != db_path:
+                self._values = db.get_all_system_settings()
+                self._db_path = db_path
+
+    def reload(self):
+        """Relê todas as configurações do banco."""
+        with self._lock:
+            self._db_path = None
+        self._ensure_loaded()
+
+    def get(self, key, default=None):
+        """Valor da configuração como texto (como salvo no banco)."""
+        self._ensure_loaded()
+        value = self._values.get(key)
+        return default if value is None else value
+
+    def get_bool(self, key, default=False):
+        """Valor da configuração como bool ('true'/'false')."""
+        value = self.get(key)
+        if value is None:
+            return default
+        return value.strip().lower() in TRUE_VALUES
+
+    def get_int(self, key, default=0):
+        """Valor da configuração como int (default se inválido)."""
+        value = self.get(key)
+        try:
+            return int(value) if value is not None else default
+        except ValueError:
+            LOGGER.warning(f"Configuração {key} inválida: {value!r}")
+            return default
+
+    def get_float(self, key, default=0.0):
+        """Valor da configuração como float (default se inválido)."""
+        value = self.get(key)
+        try:
+            return float(value) if value is not None else default
+        except ValueError:
+            LOGGER.warning(f"Configuração {key} inválida: {value!r}")
+            return default
+
+    def set(self, key, value):
+        """Grava a configuração no banco e no cache."""
+        if isinstance(value, bool):
+            value = 'true' if value else 'false'
+        db.set_system_setting(key, value)
+
+    def subscribe(self, callback, keys=None):
+        """Inscreve callback(key, value) para alterações.
+
+        keys limita os avisos a algumas chaves; key None indica que todas as
+        configurações foram recarregadas.
+        """
+        keys = frozenset(keys) if keys is not None else None
+        self._subscribers.append((callback, keys))
+
+    def unsubscribe(self, callback):
+        """Remove uma inscrição feita com subscribe()."""
+        self._subscribers = [(subscriber, keys)
+                             for subscriber, keys in self._subscribers
+                             if subscriber != callback]
+
+    def _on_db_change(self, key, value):
+        """Recebe as gravações do db.py (na thread de quem gravou)."""
+        if key is None:
+            self.reload()
+        else:
+            self._ensure_loaded()
+            self._values[key] = value
+        for callback, keys in list(self._subscribers):
+            if key is not None and keys is not None and key not in keys:
+                continue
+            try:
+                callback(key, value)
+            except Exception as e:
+                LOGGER.error(f"Erro ao avisar alteração de {key}: {e}")
+
+
+SETTINGS = SettingsStore()
@@ -1,22 +1,28 @@
+import time
+
+# Marca o início para medir a importação e as fases da abertura
+_STARTUP_STARTED = time.perf_counter()
+
 import os
 import sys
 
 from genericpath import exists
-from PySide6.QtCore import Qt, QThread, Signal
+from PySide6.QtCore import Qt, QThread, QTimer, Signal
 from PySide6.QtGui import QAction
-from PySide6.QtWidgets import (QApplication, QFrame, QGridLayout, QMainWindow,
-                               QMenu, QMenuBar, QPushButton, QWidget)
-
-from database.db import (get_customers, get_system_setting, init_db,
-                         set_system_setting)
-from ui.customer_management import CustomerManagementWindow
-from ui.menu_edit import MenuEditWindow
-from ui.menu_registration import MenuRegistrationWindow
-from ui.neighborhood_management import NeighborhoodManagementWindow
+from PySide6.QtWidgets import (QApplication, QFrame, QGridLayout, QLabel,
+                               QMainWindow, QMenu, QMenuBar, QMessageBox,
+                               QPushButton, QWidget)
+
+from database.db import (close_all_connections, close_connection,
+                         get_connection_stats, init_db)
+from database.settings_store import SETTINGS
+from ui.customer_directory import get_customer_directory
 from ui.order_screen import OrderScreen
-from ui.settings_dialog import SettingsDialog
-from utils.log_utils import get_logger
+from utils.log_utils import LOG_LEVELS_SETTING, apply_log_levels, get_logger
+from utils.print_spooler import get_print_spooler
+from utils.printer_registry import PRINTER_REGISTRY
 from utils.printer import Printer
+from utils.receipt_pdf import preload_pdf_renderer
 from utils.utils import STYLE
 
 # Adiciona o diretório do projeto ao PYTHONPATH
@@ -24,13 +30,23 @@ sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
 LOGGER = get_logger(__name__)
 
-# Inicializa o banco de dados e cria as tabelas se necessário
-init_db()
-# Lista global de todos os clientes (nome, telefone)
-ALL_CUSTOMERS = []
-# Busca todos os clientes e salva apenas nome e telefone
-ALL_CUSTOMERS = [(c[1], c[2]) for c in get_customers()]
-LOGGER.info(f'{len(ALL_CUSTOMERS)} clientes carregados em ALL_CUSTOMERS')
+# (linha, coluna) de cada tela de pedido na grade, por quantidade de telas;
+# as colunas/linhas ímpares ficam com as linhas divisórias
+SCREEN_POSITIONS = {
+    1: [(0, 0)],
+    2: [(0, 0), (0, 1)],
+    3: [(0, 0), (0, 2), (0, 4)],  # Uma linha com 3 colunas
+    4: [(0, 0), (0, 2), (2, 0), (2, 2)],  # Grade 2x2
+}
+
+
+def log_startup_phase(phase):
+    """Registra no log o tempo desde o início da importação do main."""
+    elapsed = (time.perf_counter() - _STARTUP_STARTED) * 1000
+    LOGGER.info(f'[STARTUP] {phase}: {elapsed:.0f} ms')
+
+
+log_startup_phase('módulos importados')
 
 
 class PrintThread(QThread):
@@ -41,40 +57,23 @@ class PrintThread(QThread):
         self.text = text
 
     def run(self):
-        printer = Printer.get_default_printer()
-        if printer:
-            LOGGER.info(f'Iniciando impressão em {printer.name}')
-            # Executa a impressão (pode ser bloqueante)
-            printer.print(self.text)
-            LOGGER.info(f'Impressão finalizada em {printer.name}')
-            self.finished_signal.emit(printer.name)
-        else:
-            LOGGER.warning('Nenhuma impressora configurada')
-            self.finished_signal.emit('Impressora não configurada')
+        try:
+            printer = Printer.get_default_printer()
+            if printer:
+                LOGGER.info(f'Iniciando impressão em {printer.name}')
+                # Executa a impressão (pode ser bloqueante)
+                printer.print(self.text)
+                LOGGER.info(f'Impressão finalizada em {printer.name}')
+                self.finished_signal.emit(printer.name)
+            else:
+                LOGGER.warning('Nenhuma impressora configurada')
+                self.finished_signal.emit('Impressora não configurada')
+        finally:
+            # Conexão desta thread com o banco (se a impressão abriu uma)
+            close_connection()
 
 
 class MainWindow(QMainWindow):
-    def update_all_customer_suggestions(self):
-        """Atualiza sugestões de clientes em todas as telas OrderScreen."""
-        # Primeiro atualiza a lista global
-        global ALL_CUSTOMERS
-        old_count = len(ALL_CUSTOMERS)
-        ALL_CUSTOMERS = [(c[1], c[2]) for c in get_customers()]
-        new_count = len(ALL_CUSTOMERS)
-        LOGGER.info(
-            f'Lista global atualizada: {old_count} -> {new_count} clientes')
-
-        # Mostra alguns clientes para debug
-        for i, customer in enumerate(ALL_CUSTOMERS[-3:]):
-            LOGGER.info(f'Cliente {i}: {customer}')
-
-        # Depois atualiza todas as telas
-        for screen in self.screens:
-            if hasattr(screen, 'customer_search') and \
-               hasattr(screen.customer_search, 'load_customers'):
-                LOGGER.info(f'Atualizando {screen.screen_title}')
-                screen.customer_search.load_customers()
-
     def __init__(self):
         super().__init__()
         LOGGER.info('MainWindow inicializada')
@@ -98,7 +97,7 @@ class MainWindow(QMainWindow):
         self.setWindowIcon(QIcon(icon_path))
 
         # Lê o número de telas configurado (padrão 4)
-        self.num_screens = int(get_system_setting('num_order_screens', '4'))
+        self.num_screens = SETTINGS.get_int('num_order_screens', 4)
         LOGGER.info(f'Configurado para {self.num_screens} telas de pedido')
 
         # Menu bar com botão Ajustes
@@ -133,6 +132,7 @@ class MainWindow(QMainWindow):
         menubar.addAction(ajustes_action)
 
         self.setup_ui()
+        self.setup_print_spooler()
 
     def setup_ui(self):
         """Configura a interface baseada no número de telas"""
@@ -144,21 +144,55 @@ class MainWindow(QMainWindow):
         layout.setSpacing(0)
         central_widget.setLayout(layout)
 
-        # Cria as telas de pedido baseado na configuração
+        # Diretório de clientes compartilhado por todas as telas: cadastros e
+        # edições chegam como alterações individuais, sem reler a tabela.
+        # A carga começa só depois que a janela aparece (ver main)
+        self.customer_directory = get_customer_directory()
+
+        # Posições das telas e linhas divisórias conforme a quantidade
+        self.screen_positions = SCREEN_POSITIONS.get(self.num_screens, [])
+        for row, column in self.screen_positions:
+            # Mantém o espaço das telas que ainda serão criadas
+            layout.setRowStretch(row, 1)
+            layout.setColumnStretch(column, 1)
+        self.add_separators(layout)
+
+        # Só a primeira tela é criada agora; as demais depois que a janela
+        # aparece (build_remaining_screens), uma por vez
         self.screens = []
-        for i in range(self.num_screens):
-            # Se são 3 telas, usar layout de uma coluna para OrderScreen
-            use_single_column = (self.num_screens == 3)
-            screen = OrderScreen(f"Pedido {i+1}", customers=ALL_CUSTOMERS,
-                                 single_column_layout=use_single_column)
-            self.screens.append(screen)
-
-        # Configura o layout baseado no número de telas
-        if self.num_screens == 1:
-            layout.addWidget(self.screens[0], 0, 0)
-        elif self.num_screens == 2:
-            layout.addWidget(self.screens[0], 0, 0)
-            layout.addWidget(self.screens[1], 0, 1)
+        self.build_next_screen()
+        log_startup_phase('primeira tela de pedido criada')
+
+    def build_next_screen(self):
+        """Cria a próxima tela de pedido e a coloca na grade.
+
+        Returns:
+            bool: True se ainda faltam telas
+        """
+        index = len(self.screens)
+        if index >= self.num_screens:
+            return False
+        # Se são 3 telas, usar layout de uma coluna para OrderScreen
+        use_single_column = (self.num_screens == 3)
+        screen = OrderScreen(f"Pedido {index+1}",
+                             single_column_layout=use_single_column)
+        self.screens.append(screen)
+        if index < len(self.screen_positions):
+            row, column = self.screen_positions[index]
+            self.centralWidget().layout().addWidget(screen, row, column)
+        return len(self.screens) < self.num_screens
+
+    def build_remaining_screens(self):
+        """Cria as demais telas, uma por volta do laço de eventos, para a
+        janela continuar respondendo."""
+        if self.build_next_screen():
+            QTimer.singleShot(0, self.build_remaining_screens)
+        else:
+            log_startup_phase(f'{len(self.screens)} telas de pedido prontas')
+
+    def add_separators(self, layout):
+        """Adiciona as linhas entre as telas de pedido."""
+        if self.num_screens == 2:
             # Linha vertical entre as telas
             vline = QFrame()
             vline.setFrameShape(QFrame.VLine)
@@ -168,10 +202,6 @@ class MainWindow(QMainWindow):
                 "QFrame { border-left: 1px solid #282e39; margin: 0; }")
             layout.addWidget(vline, 0, 1)
         elif self.num_screens == 3:
-            # Layout horizontal (uma linha com 3 colunas)
-            layout.addWidget(self.screens[0], 0, 0)
-            layout.addWidget(self.screens[1], 0, 2)
-            layout.addWidget(self.screens[2], 0, 4)
             # Linhas verticais entre as telas
             vline1 = QFrame()
             vline1.setFrameShape(QFrame.VLine)
@@ -189,12 +219,6 @@ class MainWindow(QMainWindow):
                 "QFrame { border-left: 1px solid #282e39; margin: 0; }")
             layout.addWidget(vline2, 0, 3)
         elif self.num_screens == 4:
-            # Layout em grade 2x2
-            layout.addWidget(self.screens[0], 0, 0)
-            layout.addWidget(self.screens[1], 0, 2)
-            layout.addWidget(self.screens[2], 2, 0)
-            layout.addWidget(self.screens[3], 2, 2)
-
             # Linha vertical
             vline = QFrame()
             vline.setFrameShape(QFrame.VLine)
@@ -213,31 +237,51 @@ class MainWindow(QMainWindow):
                 "QFrame { border-top: 1px solid #282e39; margin: 0; }")
             layout.addWidget(hline, 1, 0, 1, 3)
 
-        # Conecta sinais de todas as telas ativas
-        for screen in self.screens:
-            if hasattr(screen, 'customer_registered'):
-                screen.customer_registered.connect(
-                    self.update_all_customer_suggestions)
-
-            if hasattr(screen, 'customer_search') and hasattr(screen.customer_search, 'load_customers'):
-                def make_connect(s=screen):
-                    if hasattr(s, 'finalize_order'):
-                        orig_finalize = s.finalize_order
-
-                        def wrapped_finalize_order(*args, **kwargs):
-                            result = orig_finalize(*args, **kwargs)
-                            self.update_all_customer_suggestions()
-                            return result
-                        s.finalize_order = wrapped_finalize_order
-                make_connect(screen)
+    def setup_print_spooler(self):
+        """Inicia a fila de impressão e mostra sua situação na barra de
+        status."""
+        # Descobre as impressoras e carrega o gerador de PDF em segundo
+        # plano antes do primeiro pedido
+        PRINTER_REGISTRY.refresh_async()
+        if SETTINGS.get('print_backend', 'pdf') != 'escpos':
+            preload_pdf_renderer()
+        self.print_queue_label = QLabel()
+        self.statusBar().addPermanentWidget(self.print_queue_label)
+        self.print_spooler = get_print_spooler()
+        self.print_spooler.queue_changed.connect(self.on_print_queue_changed)
+        self.print_spooler.job_failed.connect(self.on_print_job_failed)
+
+    def on_print_queue_changed(self, queued, failed):
+        """Atualiza a quantidade de impressões na fila."""
+        text = f"Impressões na fila: {queued}"
+        if failed:
+            text += f" | Falhas: {failed}"
+        self.print_queue_label.setText(text)
+
+    def on_print_job_failed(self, job_id, error, final):
+        """Avisa quando um recibo não pôde ser impresso."""
+        if not final:
+            self.statusBar().showMessage(
+                f"Falha ao imprimir, tentando novamente: {error}", 5000)
+            return
+        reply = QMessageBox.question(
+            self, "Erro de Impressão",
+            f"Não foi possível imprimir o pedido:\n{error}\n\n"
+            "Verifique a impressora. Deseja tentar novamente?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if reply == QMessageBox.StandardButton.Yes:
+            self.print_spooler.retry(job_id)
 
     def open_settings(self):
         """Abre a janela de configurações do sistema."""
+        from ui.settings_dialog import SettingsDialog
         LOGGER.info('Abrindo configurações do sistema')
         dialog = SettingsDialog(self)
         dialog.exec()
 
     def open_menu_registration(self):
+        from ui.menu_registration import MenuRegistrationWindow
         LOGGER.info('Abrindo cadastro de cardápio')
         self.menu_registration_window = MenuRegistrationWindow()
         self.menu_registration_window.setWindowFlags(Qt.WindowType.Window)
@@ -255,31 +299,20 @@ class MainWindow(QMainWindow):
                 screen.item_search.load_items()
 
     def open_menu_edit(self):
+        from ui.menu_edit import MenuEditWindow
         LOGGER.info('Abrindo edição de cardápio')
         self.menu_edit_window = MenuEditWindow()
         self.menu_edit_window.setWindowFlags(Qt.WindowType.Window)
         self.menu_edit_window.show()
 
     def open_customer_management(self):
+        from ui.customer_management import CustomerManagementWindow
         LOGGER.info('Abrindo gerenciamento de clientes')
         self.customer_management_window = CustomerManagementWindow(self)
-        self.customer_management_window.finished.connect(
-            self.refresh_customers)
         self.customer_management_window.show()
 
-    def refresh_customers(self):
-        """Atualiza a lista global de clientes e widgets de busca
-        após cadastro/edição."""
-        global ALL_CUSTOMERS
-        ALL_CUSTOMERS = [(c[1], c[2]) for c in get_customers()]
-        LOGGER.info(
-            f'{len(ALL_CUSTOMERS)} clientes recarregados em ALL_CUSTOMERS')
-        # Atualiza todos os widgets de busca de clientes
-        for screen in self.screens:
-            if hasattr(screen, 'customer_search'):
-                screen.customer_search.set_customers(ALL_CUSTOMERS)
-
     def open_neighborhood_management(self):
+        from ui.neighborhood_management import NeighborhoodManagementWindow
         LOGGER.info('Abrindo gerenciamento de bairros')
         self.neighborhood_management_window = NeighborhoodManagementWindow(
             self)
@@ -294,13 +327,29 @@ class MainWindow(QMainWindow):
             if hasattr(screen, 'closeEvent'):
                 screen.closeEvent(event)
 
+        # Termina o trabalho de impressão atual; os pendentes ficam no banco
+        self.print_spooler.stop()
+
         LOGGER.info('Todas as threads finalizadas')
+
+        # Fecha as conexões do pool com o banco
+        LOGGER.info(f'Conexões com o banco: {get_connection_stats()}')
+        close_all_connections()
         super().closeEvent(event)
 
 
-if __name__ == "__main__":
+def main():
     LOGGER.info('Aplicação iniciada')
 
+    # Inicializa o banco de dados e cria as tabelas se necessário
+    init_db()
+    log_startup_phase('banco de dados inicializado')
+
+    # Níveis de log por subsistema, reaplicados quando a configuração muda
+    apply_log_levels(SETTINGS.get(LOG_LEVELS_SETTING, ''))
+    SETTINGS.subscribe(lambda key, value: apply_log_levels(
+        SETTINGS.get(LOG_LEVELS_SETTING, '')), keys=(LOG_LEVELS_SETTING,))
+
     app = QApplication(sys.argv)
     app.setStyleSheet(STYLE)
 
@@ -315,5 +364,13 @@ if __name__ == "__main__":
     window.activateWindow()
     app.processEvents()  # Processa eventos pendentes
 
-    LOGGER.info('Janela principal exibida')
-    sys.exit(app.exec())
+    log_startup_phase('janela principal exibida')
+    # Com a janela já na tela: clientes lidos numa thread de trabalho e as
+    # demais telas de pedido criadas
+    window.customer_directory.ensure_loaded()
+    QTimer.singleShot(0, window.build_remaining_screens)
+    return app.exec()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,7 +10,7 @@ from PySide6.QtWidgets import (QApplication, QCheckBox, QDialog, QGroupBox,
                                QPushButton, QScrollArea, QSpinBox, QTextEdit,
                                QVBoxLayout, QWidget)
 
-from database.db import get_all_additions_for_item_with_mandatory_info
+from database.menu_catalog import MENU_CATALOG
 from utils.log_utils import get_logger
 
 LOGGER = get_logger(__name__)
@@ -46,7 +46,7 @@ class AddItemDialog(QDialog):
 
         def marcar_obrigatorios():
             mandatory_selected = item_dict.get('mandatory_selected')
-            LOGGER.info(
+            LOGGER.debug(
                 f"[marcar_obrigatorios] mandatory_selected recebido: {mandatory_selected}")
             for i in range(self.mandatory_additions_layout.count()):
                 item = self.mandatory_additions_layout.itemAt(i)
@@ -57,16 +57,16 @@ class AddItemDialog(QDialog):
                         add_data = checkbox.property('addition_data')
                         id_add = add_data.get('id') if add_data else None
                         checked = False
-                        LOGGER.info(
+                        LOGGER.debug(
                             f"[marcar_obrigatorios] checkbox {i} id_add: {id_add}")
                         # Só marca se mandatory_selected vier e o id estiver na lista
                         if mandatory_selected is not None:
                             if id_add in mandatory_selected:
                                 checked = True
-                                LOGGER.info(
+                                LOGGER.debug(
                                     f"[marcar_obrigatorios] Marcando checkbox {i} (id={id_add}) como True")
                             else:
-                                LOGGER.info(
+                                LOGGER.debug(
                                     f"[marcar_obrigatorios] Checkbox {i} (id={id_add}) não está em mandatory_selected")
                         # Se mandatory_selected não vier, não marca nenhum obrigatório
                         checkbox.setChecked(checked)
@@ -348,17 +348,15 @@ class AddItemDialog(QDialog):
                     f"ID ou categoria inválidos: {item_id}, {category_name}")
                 raise ValueError("ID do item ou categoria inválidos")
 
-            from database.db import get_category_id
-            category_id = get_category_id(category_name)
+            category_id = MENU_CATALOG.get_category_id(category_name)
 
             if not category_id:
                 LOGGER.warning(f"Categoria não encontrada: {category_name}")
                 category_id = 0  # Valor padrão
 
             # Busca todos os complementos com status de obrigatoriedade
-            all_additions_info = \
-                get_all_additions_for_item_with_mandatory_info(
-                    item_id, category_id)
+            all_additions_info = MENU_CATALOG.get_additions_for_item(
+                item_id, category_id)
             LOGGER.debug(f"all_additions_info: {all_additions_info}")
 
             # Monta lista de complementos para o menu e obrigatórios
@@ -826,13 +824,13 @@ class AddItemDialog(QDialog):
 
     def clear_item_search_and_focus(self):
         """Limpa o campo de busca e define o foco."""
-        LOGGER.info("[AddItemDialog] clear_item_search_and_focus chamado")
+        LOGGER.debug("[AddItemDialog] clear_item_search_and_focus chamado")
         target_screen = (self.order_screen if self.order_screen
                          else self.parent())
 
         if (target_screen and hasattr(target_screen, 'item_search')
                 and hasattr(target_screen.item_search, 'item_lineedit')):
-            LOGGER.info("[AddItemDialog] Limpando search e definindo foco")
+            LOGGER.debug("[AddItemDialog] Limpando search e definindo foco")
             target_screen.item_search.clear_selection()
             target_screen.item_search.item_lineedit.setFocus()
         else:
@@ -0,0 +1,139 @@
+"""
+Diretório compartilhado de clientes.
+
+Mantém em memória as linhas de get_customers() usadas por todas as telas e
+aplica as alterações de um cliente por vez (inclusão, edição, exclusão),
+avisadas pelo db.py, em vez de reler a tabela inteira a cada pedido.
+
+A tabela é lida numa thread de trabalho (reload), iniciada depois que a
+janela aparece. Até a leitura terminar, loaded é False e as telas buscam
+direto no banco; alterações avisadas nesse meio-tempo são relidas ao fim.
+"""
+
+import threading
+
+from PySide6.QtCore import QObject, Signal
+
+from database import db
+from utils.log_utils import get_logger
+
+LOGGER = get_logger(__name__)
+
+
+class CustomerDirectory(QObject):
+    """Lista observável de clientes (formato de get_customers)."""
+    customer_upserted = Signal(tuple)  # Linha incluída ou alterada
+    customer_removed = Signal(int)  # Id do cliente excluído
+    reloaded = Signal()  # Lista inteira recarregada
+    # Leva o aviso do banco para a thread do diretório
+    _db_changed = Signal(str, object)
+    # Leva as linhas lidas pela thread de carga (geração, linhas)
+    _rows_loaded = Signal(int, list)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = {}
+        self.loaded = False
+        self._loading = False
+        self._load_generation = 0
+        self._pending = set()  # Ids alterados durante a carga
+        self._db_changed.connect(self._apply_change)
+        self._rows_loaded.connect(self._finish_reload)
+        self._listener = self._db_changed.emit
+        db.add_customer_listener(self._listener)
+
+    def reload(self):
+        """Relê todos os clientes do banco numa thread de trabalho.
+
+        Retorna logo; reloaded é emitido quando as linhas chegam.
+        """
+        self._load_generation += 1
+        self._loading = True
+        self._pending.clear()
+        threading.Thread(target=self._read_rows,
+                         args=(self._load_generation,),
+                         name='CustomerDirectoryLoad', daemon=True).start()
+
+    def ensure_loaded(self):
+        """Inicia a primeira carga, se ainda não foi iniciada."""
+        if not self.loaded and not self._loading:
+            self.reload()
+
+    def _read_rows(self, generation):
+        """Lê os clientes (na thread de carga)."""
+        try:
+            rows = list(db.iter_customers())
+        except Exception as e:
+            LOGGER.error(f"Erro ao carregar clientes no diretório: {e}")
+            return
+        finally:
+            db.close_connection()
+        self._rows_loaded.emit(generation, rows)
+
+    def _finish_reload(self, generation, rows):
+        """Recebe as linhas lidas (na thread do diretório)."""
+        if generation != self._load_generation:
+            return  # Uma carga mais nova já foi iniciada
+        loaded = {row[0]: row for row in rows}
+        # Alterações avisadas durante a leitura podem não estar nas linhas
+        for customer_id in self._pending:
+            row = db.get_customer_row(customer_id)
+            if row is None:
+                loaded.pop(customer_id, None)
+            else:
+                loaded[customer_id] = row
+        self._pending.clear()
+        self._rows = loaded
+        self._loading = False
+        self.loaded = True
+        LOGGER.info(f"{len(self._rows)} clientes carregados no diretório")
+        self.reloaded.emit()
+
+    def rows(self):
+        """Retorna todas as linhas de clientes (vazia até a primeira carga)."""
+        return list(self._rows.values())
+
+    def get(self, customer_id):
+        """Retorna a linha do cliente pelo id ou None."""
+        if not self.loaded:
+            return db.get_customer_row(customer_id)
+        return self._rows.get(customer_id)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def _apply_change(self, action, customer_id):
+        """Aplica a alteração avisada pelo db.py."""
+        if action == 'reload':
+            self.reload()
+            return
+        if self._loading:
+            self._pending.add(customer_id)
+        if not self.loaded:
+            return
+        row = None if action == 'delete' else db.get_customer_row(customer_id)
+        if row is None:
+            if self._rows.pop(customer_id, None) is not None:
+                self.customer_removed.emit(customer_id)
+            return
+        self._rows[customer_id] = row
+        self.customer_upserted.emit(row)
+
+    def close(self):
+        """Para de observar o banco."""
+        db.remove_customer_listener(self._listener)
+
+
+_DIRECTORY = None
+
+
+def get_customer_directory():
+    """Retorna o diretório de clientes do processo (criado no primeiro uso).
+
+    A carga não começa aqui: chame ensure_loaded() quando a leitura da
+    tabela não atrapalhar mais (ex.: com a janela principal já na tela).
+    """
+    global _DIRECTORY
+    if _DIRECTORY is None:
+        _DIRECTORY = CustomerDirectory()
+    return _DIRECTORY
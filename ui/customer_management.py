@@ -1,12 +1,16 @@
 from PySide6.QtCore import Qt
-from PySide6.QtWidgets import (QDialog, QHBoxLayout, QHeaderView, QLabel,
-                               QLineEdit, QMenu, QMessageBox, QPushButton,
-                               QSizePolicy, QTableWidget, QTableWidgetItem,
-                               QVBoxLayout, QWidget)
+from PySide6.QtWidgets import (QAbstractItemView, QDialog, QHBoxLayout,
+                               QHeaderView, QLabel, QLineEdit, QMenu,
+                               QMessageBox, QPushButton, QSizePolicy,
+                               QTableView, QTableWidget, QTableWidgetItem,
+                               QVBoxLayout)
 
 from database.db import (add_customer, delete_customer, get_customer_orders,
-                         get_customers, get_neighborhoods, init_db,
-                         search_customers, update_customer)
+                         get_customers_page, get_neighborhoods, init_db,
+                         search_customers_page, update_customer)
+from ui.widgets.customer_table import (ACTION_DELETE, ACTION_EDIT,
+                                      ACTION_HISTORY, CustomerActionsDelegate,
+                                      CustomerTableModel)
 from utils.log_utils import get_logger
 
 logger = get_logger(__name__)
@@ -341,186 +345,126 @@ class CustomerManagementWindow(QDialog):
         add_btn = QPushButton("Novo Cliente")
         add_btn.clicked.connect(self.add_customer)
         layout.addWidget(add_btn)
-        # Tabela de clientes
-        self.table = QTableWidget()
-        self.table.setColumnCount(8)
-        self.table.setHorizontalHeaderLabels([
-            "Nome", "Telefone", "Rua", "Número", "Bairro", "Referência",
-            "Histórico", "Editar", "Excluir"
-        ])
+
+        # Tabela de clientes: modelo carregado sob demanda, sem widgets
+        # por linha (os botões são desenhados pelo delegate)
+        self.model = CustomerTableModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.table.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        # Altura fixa evita medir cada linha ao rolar
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(40)
+
+        self.actions_delegate = CustomerActionsDelegate(self.table)
+        self.actions_delegate.action_triggered.connect(self.on_row_action)
+        for column in (ACTION_HISTORY, ACTION_EDIT, ACTION_DELETE):
+            self.table.setItemDelegateForColumn(column, self.actions_delegate)
 
-        # Configurar redimensionamento das colunas
+        # Configurar redimensionamento das colunas (ResizeToContents mediria
+        # todas as linhas, então as colunas estreitas têm largura fixa)
         header = self.table.horizontalHeader()
         header.setSectionResizeMode(0, QHeaderView.Stretch)  # Nome
-        header.setSectionResizeMode(
-            1, QHeaderView.ResizeToContents)  # Telefone
+        header.setSectionResizeMode(1, QHeaderView.Interactive)  # Telefone
         header.setSectionResizeMode(2, QHeaderView.Stretch)  # Rua
-        header.setSectionResizeMode(3, QHeaderView.ResizeToContents)  # Número
+        header.setSectionResizeMode(3, QHeaderView.Interactive)  # Número
         header.setSectionResizeMode(4, QHeaderView.Stretch)  # Bairro
         header.setSectionResizeMode(5, QHeaderView.Stretch)  # Referência
-        header.setSectionResizeMode(6, QHeaderView.Fixed)  # Histórico
-        header.setSectionResizeMode(7, QHeaderView.Fixed)  # Editar
-        header.setSectionResizeMode(8, QHeaderView.Fixed)  # Excluir
+        header.setSectionResizeMode(ACTION_HISTORY, QHeaderView.Fixed)
+        header.setSectionResizeMode(ACTION_EDIT, QHeaderView.Fixed)
+        header.setSectionResizeMode(ACTION_DELETE, QHeaderView.Fixed)
 
-        # Definir larguras fixas para os botões
-        self.table.setColumnWidth(6, 100)  # Histórico
-        self.table.setColumnWidth(7, 80)   # Editar
-        self.table.setColumnWidth(8, 80)   # Excluir
+        self.table.setColumnWidth(1, 130)  # Telefone
+        self.table.setColumnWidth(3, 70)   # Número
+        self.table.setColumnWidth(ACTION_HISTORY, 100)
+        self.table.setColumnWidth(ACTION_EDIT, 80)
+        self.table.setColumnWidth(ACTION_DELETE, 80)
 
         layout.addWidget(self.table)
+
+        # Mensagem exibida no lugar da tabela quando não há clientes
+        self.empty_label = QLabel("Nenhum cliente encontrado")
+        self.empty_label.setAlignment(Qt.AlignCenter)
+        self.empty_label.hide()
+        layout.addWidget(self.empty_label)
+
         self.setLayout(layout)
 
-        # Armazena todos os clientes para filtro
-        self.all_customers = []
         self.refresh_table()
 
-        self.table.cellDoubleClicked.connect(self.on_table_double_click)
+        self.table.doubleClicked.connect(self.on_table_double_click)
+
+    def on_table_double_click(self, index):
+        """Abre o histórico do cliente (colunas de dados)."""
+        if index.isValid() and index.column() < ACTION_HISTORY:
+            self.show_customer_history(index.row())
 
-    def on_table_double_click(self, row, column):
-        """Evita crash ao clicar duas vezes em linhas inválidas ou vazias."""
-        current_customers = self.get_current_displayed_customers()
-        if not current_customers or row >= len(current_customers):
-            return  # Ignora duplo clique em linha vazia ou mensagem
-        # Por padrão, abre o histórico do cliente
-        self.show_customer_history(row)
+    def on_row_action(self, row, column):
+        """Executa a ação do botão clicado na linha."""
+        if column == ACTION_HISTORY:
+            self.show_customer_history(row)
+        elif column == ACTION_EDIT:
+            self.edit_customer(row)
+        elif column == ACTION_DELETE:
+            self.delete_customer(row)
 
     def filter_customers(self):
         """Filtra clientes baseado no texto de busca"""
         search_text = self.search_input.text().strip()
         if not search_text:
             # Se não há texto de busca, mostra todos
-            self.display_customers(self.all_customers)
+            self.display_customers(get_customers_page)
         else:
             # Busca no banco de dados
-            filtered_customers = search_customers(search_text)
-            self.display_customers(filtered_customers)
+            self.display_customers(
+                lambda after, limit: search_customers_page(
+                    search_text, after, limit))
 
     def refresh_table(self):
         """Recarrega todos os clientes do banco"""
-        self.all_customers = get_customers()
-        self.display_customers(self.all_customers)
-        # Limpa o campo de busca ao atualizar a tabela (dica 2)
+        # Limpa o campo de busca ao atualizar a tabela (dica 2); sem sinal
+        # para não carregar a lista duas vezes
+        self.search_input.blockSignals(True)
         self.search_input.clear()
+        self.search_input.blockSignals(False)
+        self.display_customers(get_customers_page)
 
-    def display_customers(self, customers):
-        """Exibe uma lista de clientes na tabela"""
-        self.table.clearContents()
-        if not customers:
-            self.table.setRowCount(1)
-            no_customers_item = QTableWidgetItem("Nenhum cliente encontrado")
-            no_customers_item.setTextAlignment(
-                Qt.AlignVCenter | Qt.AlignCenter)
-            self.table.setItem(0, 0, no_customers_item)
-            self.table.setSpan(0, 0, 1, self.table.columnCount())
-            # Limpa widgets dos botões
-            for col in range(1, self.table.columnCount()):
-                self.table.setItem(0, col, QTableWidgetItem(""))
-                self.table.setCellWidget(0, col, None)
-            return
-        self.table.setRowCount(len(customers))
-        for row, customer in enumerate(customers):
-            # customer: (id, name, phone, street, number, neighborhood_id, reference, neighborhood_name)
-
-            # Nome
-            name_item = QTableWidgetItem(customer[1])
-            name_item.setTextAlignment(Qt.AlignVCenter | Qt.AlignLeft)
-            self.table.setItem(row, 0, name_item)
-
-            # Telefone
-            phone_item = QTableWidgetItem(customer[2])
-            phone_item.setTextAlignment(Qt.AlignVCenter | Qt.AlignLeft)
-            self.table.setItem(row, 1, phone_item)
-
-            # Rua
-            street_item = QTableWidgetItem(customer[3] or "")
-            street_item.setTextAlignment(Qt.AlignVCenter | Qt.AlignLeft)
-            self.table.setItem(row, 2, street_item)
-
-            # Número
-            number_item = QTableWidgetItem(customer[4] or "")
-            number_item.setTextAlignment(Qt.AlignVCenter | Qt.AlignLeft)
-            self.table.setItem(row, 3, number_item)
-
-            # Bairro
-            neighborhood_item = QTableWidgetItem(customer[7] or "")
-            neighborhood_item.setTextAlignment(Qt.AlignVCenter | Qt.AlignLeft)
-            self.table.setItem(row, 4, neighborhood_item)
-
-            # Referência
-            reference_item = QTableWidgetItem(customer[6] or "")
-            reference_item.setTextAlignment(Qt.AlignVCenter | Qt.AlignLeft)
-            self.table.setItem(row, 5, reference_item)
-
-            # Botão Histórico
-            history_btn = QPushButton("Histórico")
-            history_btn.clicked.connect(
-                lambda checked, r=row: self.show_customer_history(r))
-            history_cell = QWidget()
-            history_layout = QHBoxLayout(history_cell)
-            history_layout.addWidget(history_btn)
-            history_layout.setAlignment(Qt.AlignCenter)
-            history_layout.setContentsMargins(0, 0, 0, 0)
-            self.table.setCellWidget(row, 6, history_cell)
-
-            # Botão Editar
-            edit_btn = QPushButton("Editar")
-            edit_btn.clicked.connect(
-                lambda checked, r=row: self.edit_customer(r))
-            edit_cell = QWidget()
-            edit_layout = QHBoxLayout(edit_cell)
-            edit_layout.addWidget(edit_btn)
-            edit_layout.setAlignment(Qt.AlignCenter)
-            edit_layout.setContentsMargins(0, 0, 0, 0)
-            self.table.setCellWidget(row, 7, edit_cell)
-
-            # Botão Excluir
-            delete_btn = QPushButton("Excluir")
-            delete_btn.clicked.connect(
-                lambda checked, r=row: self.delete_customer(r))
-            delete_cell = QWidget()
-            delete_layout = QHBoxLayout(delete_cell)
-            delete_layout.addWidget(delete_btn)
-            delete_layout.setAlignment(Qt.AlignCenter)
-            delete_layout.setContentsMargins(0, 0, 0, 0)
-            self.table.setCellWidget(row, 8, delete_cell)
-
-            self.table.setRowHeight(row, 40)
+    def display_customers(self, fetch_page):
+        """Exibe os clientes de fetch_page(after, limit) na tabela.
+
+        Só a primeira página é lida agora; as demais vêm conforme a rolagem.
+        """
+        self.model.set_page_source(fetch_page)
+        self.table.scrollToTop()
+        has_customers = self.model.total_count() > 0
+        self.table.setVisible(has_customers)
+        self.empty_label.setVisible(not has_customers)
 
     def show_customer_history(self, row):
         """Mostra o histórico de pedidos do cliente"""
-        # Precisa buscar o cliente correto baseado na linha atual
-        current_customers = self.get_current_displayed_customers()
-        if row < len(current_customers):
-            customer = current_customers[row]
+        customer = self.model.customer(row)
+        if customer is not None:
             dialog = CustomerHistoryDialog(customer, self)
             dialog.exec()
 
-    def get_current_displayed_customers(self):
-        """Retorna os clientes atualmente exibidos na tabela"""
-        search_text = self.search_input.text().strip()
-        if not search_text:
-            return self.all_customers
-        else:
-            return search_customers(search_text)
-
     def add_customer(self):
         dialog = CustomerRegistrationDialog(self)
         if dialog.exec():
             self.refresh_table()  # Isso já limpa o campo de busca
 
     def edit_customer(self, row):
-        current_customers = self.get_current_displayed_customers()
-        if row < len(current_customers):
-            customer = current_customers[row]
+        customer = self.model.customer(row)
+        if customer is not None:
             dialog = CustomerEditDialog(customer, self)
             if dialog.exec():
                 self.refresh_table()  # Isso já limpa o campo de busca
 
     def delete_customer(self, row):
-        current_customers = self.get_current_displayed_customers()
-        if row < len(current_customers):
-            customer = current_customers[row]
+        customer = self.model.customer(row)
+        if customer is not None:
             reply = QMessageBox.question(
                 self, "Confirmar Exclusão",
                 f"Deseja realmente excluir o cliente {customer[1]}?",
@@ -327,7 +327,7 @@ class ItemAdditionsDialog(QDialog):
         """Carrega todos os complementos obrigatórios (categoria + específicos)"""
         from database.db import (
             get_all_additions_for_item_with_mandatory_and_specific_info,
-            get_category_id, get_menu_items)
+            get_menu_item_category_id)
 
         # Limpa o layout atual
         while self.additions_layout.count():
@@ -335,16 +335,8 @@ class ItemAdditionsDialog(QDialog):
             if child.widget():
                 child.widget().deleteLater()
 
-        # Busca informações do item
-        items = get_menu_items()
-        item_category = None
-        cat_id = None
-        for item in items:
-            # item: (id, name, price, category_name, description, additions)
-            if item[1] == self.item_name:
-                item_category = item[3]
-                cat_id = get_category_id(item_category)
-                break
+        # Categoria do item (consulta pela chave, sem carregar o cardápio)
+        cat_id = get_menu_item_category_id(self.item_id)
 
         if not cat_id:
             return
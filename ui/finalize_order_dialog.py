@@ -8,11 +8,13 @@ from PySide6.QtWidgets import (QCheckBox, QDialog, QHBoxLayout, QLabel,
                                QLineEdit, QMenu, QMessageBox, QPushButton,
                                QVBoxLayout, QWidget)
 
-from database.db import (get_customer_by_phone, get_neighborhoods,
+from database.db import (close_connection, get_customer_by_name,
+                         get_customer_by_phone, get_neighborhoods,
                          get_system_setting, save_order, update_customer)
 from utils.log_utils import get_logger
-from utils.print_settings import (format_order_for_print, get_default_printer,
+from utils.print_settings import (format_order_for_print,
                                   should_play_notification_sound)
+from utils.print_spooler import get_print_spooler
 from utils.printer import Printer
 
 LOGGER = get_logger(__name__)
@@ -50,6 +52,9 @@ class PrintThread(QThread):
         except Exception as e:
             LOGGER.error(f'[PRINT_THREAD] Exceção durante impressão: {e}')
             self.error_signal.emit(f'Erro durante impressão: {str(e)}')
+        finally:
+            # Conexão desta thread com o banco (se a impressão abriu uma)
+            close_connection()
 
 
 class FinalizeOrderDialog(QDialog):
@@ -110,34 +115,23 @@ class FinalizeOrderDialog(QDialog):
                     'neighborhood_name': full_data[7] if len(full_data) > 7 else ''
                 }
 
-        # Busca por nome (debug detalhado)
-        from database.db import get_customers
+        # Busca por nome (índice do nome normalizado)
         name = customer_data.get('name', '').strip()
         if name:
-            customers = get_customers()
-            LOGGER.info(
-                f"Buscando cliente por nome: '{name}' (total: {len(customers)})")
-            for c in customers:
-                nome_c = c.get('name', '') if isinstance(
-                    c, dict) else str(c[1])
+            c = get_customer_by_name(name)
+            if c:
                 LOGGER.info(
-                    f"Comparando com: '{nome_c}' (id: {c.get('id') if isinstance(c, dict) else c[0]})")
-                if nome_c.strip().lower() == name.lower():
-                    LOGGER.info(
-                        f"Cliente encontrado por nome: '{nome_c}' (id: {c.get('id') if isinstance(c, dict) else c[0]})")
-                    if isinstance(c, dict):
-                        return c
-                    else:
-                        return {
-                            'id': c[0],
-                            'name': c[1],
-                            'phone': c[2],
-                            'street': c[3] or '',
-                            'number': c[4] or '',
-                            'neighborhood_id': c[5],
-                            'reference': c[6] or '',
-                            'neighborhood_name': c[7] if len(c) > 7 else ''
-                        }
+                    f"Cliente encontrado por nome: '{c[1]}' (id: {c[0]})")
+                return {
+                    'id': c[0],
+                    'name': c[1],
+                    'phone': c[2],
+                    'street': c[3] or '',
+                    'number': c[4] or '',
+                    'neighborhood_id': c[5],
+                    'reference': c[6] or '',
+                    'neighborhood_name': c[7] if len(c) > 7 else ''
+                }
             LOGGER.warning(f"Nenhum cliente encontrado por nome: '{name}'")
 
         return customer_data
@@ -477,7 +471,7 @@ class FinalizeOrderDialog(QDialog):
     def save_order_to_database(self):
         """Salva o pedido no banco de dados. Se cliente não existir, cria antes."""
         try:
-            from database.db import add_customer
+            from database.db import find_or_create_customer
             customer_id = self.customer_data.get('id')
             # Se não existe, cria o cliente
             if not customer_id:
@@ -492,29 +486,18 @@ class FinalizeOrderDialog(QDialog):
                     number = self.number_input.text().strip()
                     neighborhood_id = self.selected_neighborhood_id
                     reference = self.reference_input.text().strip()
-                # Cria o cliente e busca o novo id
+                # Cria o cliente (ou reaproveita o já cadastrado) e guarda o id
                 try:
-                    add_customer(name, phone, street, number,
-                                 neighborhood_id, reference)
+                    customer_id, _ = find_or_create_customer(
+                        name, phone, street, number, neighborhood_id,
+                        reference)
                 except Exception as e:
                     LOGGER.error(f"Erro ao criar cliente: {e}")
                     QMessageBox.warning(
                         self, "Erro", f"Erro ao criar cliente: {str(e)}")
                     return False
-                # Busca o cliente recém-criado
-                from database.db import get_customers
-                all_customers = get_customers()
-                for c in all_customers:
-                    if c[1] == name and c[2] == phone:
-                        customer_id = c[0]
-                        self.customer_data['id'] = customer_id
-                        # Não emite sinal para atualizar sugestões
-                        break
-                if not customer_id:
-                    LOGGER.error("Não foi possível obter o ID do novo cliente")
-                    QMessageBox.warning(
-                        self, "Erro", "Não foi possível obter o ID do novo cliente.")
-                    return False
+                # Não emite sinal para atualizar sugestões
+                self.customer_data['id'] = customer_id
 
             # Prepara dados dos itens para o banco
             items_data = []
@@ -550,10 +533,12 @@ class FinalizeOrderDialog(QDialog):
                 order_notes = "Retirada"
 
             # Salva o pedido
-            print(
-                f'''\033[92mSaving order for customer ID: {customer_id}, items: {items_data}, total: {total_to_save}, notes: {order_notes}\033[0m''')
+            LOGGER.debug(
+                f"Salvando pedido do cliente {customer_id}, itens: {items_data}, "
+                f"total: {total_to_save}, observações: {order_notes}")
             order_id = save_order(customer_id, items_data,
                                   total_to_save, order_notes)
+            self.saved_order_id = order_id
             LOGGER.info(f"Pedido {order_id} salvo com sucesso")
             return True
 
@@ -588,7 +573,7 @@ class FinalizeOrderDialog(QDialog):
         if not self.save_order_to_database():
             return
 
-        # Imprime o pedido
+        # Envia o pedido para a fila de impressão (não bloqueia)
         self.print_order()
 
         # Toca som de notificação se configurado
@@ -608,7 +593,7 @@ class FinalizeOrderDialog(QDialog):
         super().accept()
 
     def print_order(self):
-        """Gera o PDF do pedido e envia para impressão."""
+        """Monta o recibo do pedido e o coloca na fila de impressão."""
         try:
             # Preparar dados do pedido
             if self.delivery_checkbox.isChecked():
@@ -662,21 +647,9 @@ class FinalizeOrderDialog(QDialog):
                 change_value
             )
 
-            # Gerar PDF temporário
-            import os
-            import tempfile
-            pdf_fd, pdf_path = tempfile.mkstemp(suffix="_pedido.pdf")
-            os.close(pdf_fd)
-            default_printer = get_default_printer()
-            printer_name = default_printer.name if default_printer else "Sistema de Impressão"
-            printer = Printer(printer_name)
-            printer.generate_order_pdf(pdf_path, linhas)
-
-            # Imprimir PDF
-            printer.print_pdf(pdf_path)
-
-            # Opcional: remover o PDF após imprimir
-            # os.remove(pdf_path)
+            # PDF, impressora e novas tentativas ficam com o spooler
+            get_print_spooler().submit(
+                linhas, order_id=getattr(self, 'saved_order_id', None))
 
         except Exception as e:
             LOGGER.error(f"Erro durante preparação da impressão: {e}")
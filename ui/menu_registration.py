@@ -489,8 +489,8 @@ class MenuRegistrationWindow(QDialog):
             return
 
         # Verifica se já existe item com esse nome
-        from database.db import get_menu_items
-        if any(item[1] == name for item in get_menu_items()):
+        from database.db import menu_item_name_exists
+        if menu_item_name_exists(name):
             QMessageBox.warning(
                 self, "Erro", "Já existe um item com esse nome.")
             return
@@ -10,9 +10,10 @@ from PySide6.QtWidgets import (QDialog, QFrame, QHBoxLayout, QHeaderView,
                                QVBoxLayout, QWidget)
 
 # Importa as configurações de impressão
-from database.db import (get_all_additions_for_item_with_mandatory_info,
-                         get_system_setting)
+from database.db import get_system_setting
+from database.menu_catalog import MENU_CATALOG
 from ui.add_item_dialog import AddItemDialog
+from ui.customer_directory import get_customer_directory
 from ui.widgets.search_widgets import CustomerSearchWidget, ItemSearchWidget
 from utils.log_utils import get_logger
 from utils.printer import Printer
@@ -25,7 +26,7 @@ class OrderScreen(QWidget):
     customer_registered = Signal(dict)
 
     def show_history_dialog(self):
-        print("Exibindo histórico de pedidos do dia")
+        LOGGER.debug("Exibindo histórico de pedidos do dia")
         from PySide6.QtWidgets import (QDialog, QHBoxLayout, QPushButton,
                                        QTableWidget, QTableWidgetItem,
                                        QVBoxLayout)
@@ -56,27 +57,23 @@ class OrderScreen(QWidget):
                 "QPushButton { padding: 0px; }")
 
             def fill_order(o=order, c=customer):
-                # Busca registro completo do cliente em self.customers
+                # Busca registro completo do cliente no diretório
                 customer_id = c.get('id') if isinstance(c, dict) else (
                     c[0] if isinstance(c, (list, tuple)) and len(c) > 0 else None)
                 found = None
-                if customer_id:
-                    for cust in self.customers:
-                        if isinstance(cust, dict) and cust.get('id') == customer_id:
-                            found = cust
-                            break
-                        elif isinstance(cust, (list, tuple)) and len(cust) > 0 and cust[0] == customer_id:
-                            found = {
-                                'id': cust[0],
-                                'name': cust[1],
-                                'phone': cust[2],
-                                'street': cust[3] if len(cust) > 3 else '',
-                                'number': cust[4] if len(cust) > 4 else '',
-                                'neighborhood_id': cust[5] if len(cust) > 5 else '',
-                                'reference': cust[6] if len(cust) > 6 else '',
-                                'neighborhood': cust[7] if len(cust) > 7 else ''
-                            }
-                            break
+                cust = get_customer_directory().get(
+                    customer_id) if customer_id else None
+                if cust:
+                    found = {
+                        'id': cust[0],
+                        'name': cust[1],
+                        'phone': cust[2],
+                        'street': cust[3] if len(cust) > 3 else '',
+                        'number': cust[4] if len(cust) > 4 else '',
+                        'neighborhood_id': cust[5] if len(cust) > 5 else '',
+                        'reference': cust[6] if len(cust) > 6 else '',
+                        'neighborhood': cust[7] if len(cust) > 7 else ''
+                    }
                 if found:
                     c = found
                 # Preenche o campo de busca com nome ou telefone
@@ -94,13 +91,13 @@ class OrderScreen(QWidget):
                                 break
                 # Preenche os itens do pedido, garantindo que obrigatórios estejam corretos
                 itens_corrigidos = []
-                print(
-                    f"\033[94m[HISTORICO] Recuperando {len(o['items'])} itens do pedido\033[0m")
+                LOGGER.debug(
+                    f"[HISTORICO] Recuperando {len(o['items'])} itens do pedido")
                 for idx, item in enumerate(o['items']):
-                    print(
-                        f"\033[94m[HISTORICO] Item {idx}: {item.get('item_data', [None, 'Item desconhecido'])[1]}\033[0m")
-                    print(
-                        f"\033[94m[HISTORICO] Complementos originais no banco: {item.get('additions', [])}\033[0m")
+                    LOGGER.debug(
+                        f"[HISTORICO] Item {idx}: {item.get('item_data', [None, 'Item desconhecido'])[1]}")
+                    LOGGER.debug(
+                        f"[HISTORICO] Complementos originais no banco: {item.get('additions', [])}")
 
                     # Usa mandatory_selected para marcar os obrigatórios
                     mandatory_selected_ids = item.get('mandatory_selected', [])
@@ -118,11 +115,11 @@ class OrderScreen(QWidget):
 
                     # Corrige opcionais também - AQUI É ONDE PODE ESTAR O PROBLEMA
                     opcionais = []
-                    print(
-                        f"\033[93m[HISTORICO] Processando {len(item.get('additions', []))} complementos opcionais\033[0m")
+                    LOGGER.debug(
+                        f"[HISTORICO] Processando {len(item.get('additions', []))} complementos opcionais")
                     for add_idx, add in enumerate(item.get('additions', [])):
-                        print(
-                            f"\033[93m[HISTORICO] Complemento {add_idx}: {add}\033[0m")
+                        LOGGER.debug(
+                            f"[HISTORICO] Complemento {add_idx}: {add}")
                         complemento_processado = {
                             'id': add.get('id'),
                             'name': add.get('name'),
@@ -130,14 +127,14 @@ class OrderScreen(QWidget):
                             'qty': add.get('qty', 1),
                             'total': add.get('total', add.get('price', 0.0) * add.get('qty', 1))
                         }
-                        print(
-                            f"\033[93m[HISTORICO] Complemento processado {add_idx}: {complemento_processado}\033[0m")
+                        LOGGER.debug(
+                            f"[HISTORICO] Complemento processado {add_idx}: {complemento_processado}")
                         opcionais.append(complemento_processado)
 
-                    print(
-                        f"\033[93m[HISTORICO] Total de complementos processados: {len(opcionais)}\033[0m")
-                    print(
-                        f"\033[93m[HISTORICO] Lista final de opcionais: {opcionais}\033[0m")
+                    LOGGER.debug(
+                        f"[HISTORICO] Total de complementos processados: {len(opcionais)}")
+                    LOGGER.debug(
+                        f"[HISTORICO] Lista final de opcionais: {opcionais}")
                     item_corrigido = {
                         'item_data': item.get('item_data'),
                         'qty': item.get('qty', 1),
@@ -162,9 +159,9 @@ class OrderScreen(QWidget):
                                                    0.0) * mand.get('qty', 1)
                     item_corrigido['total'] = total_item
                     itens_corrigidos.append(item_corrigido)
-                print(f'\033[92m{itens_corrigidos}\033[0m')
+                LOGGER.debug(f'{itens_corrigidos}')
                 for item in itens_corrigidos:
-                    mandatorys = get_all_additions_for_item_with_mandatory_info(
+                    mandatorys = MENU_CATALOG.get_additions_for_item(
                         item['item_data'][0], item['item_data'][3])
                     mandatorys = [
                         list(mand) for mand in mandatorys if mand[0] in item['mandatory_selected'] if mand[3] == 1
@@ -177,21 +174,21 @@ class OrderScreen(QWidget):
                             'source': mand[3]
                         }
                         item['mandatory_additions'].append(mand_dict)
-                    print(f'\033[92m {item}\033[0m')
+                    LOGGER.debug(f'{item}')
 
-                print(
-                    f"\033[95m[HISTORICO] FINAL - Total de itens corrigidos: {len(itens_corrigidos)}\033[0m")
+                LOGGER.debug(
+                    f"[HISTORICO] FINAL - Total de itens corrigidos: {len(itens_corrigidos)}")
                 for final_idx, final_item in enumerate(itens_corrigidos):
-                    print(
-                        f"\033[95m[HISTORICO] Item final {final_idx}: {final_item.get('item_data', [None, 'Item'])[1]}\033[0m")
-                    print(
-                        f"\033[95m[HISTORICO] Complementos finais do item {final_idx}: {len(final_item.get('additions', []))}\033[0m")
+                    LOGGER.debug(
+                        f"[HISTORICO] Item final {final_idx}: {final_item.get('item_data', [None, 'Item'])[1]}")
+                    LOGGER.debug(
+                        f"[HISTORICO] Complementos finais do item {final_idx}: {len(final_item.get('additions', []))}")
                     for comp_idx, comp in enumerate(final_item.get('additions', [])):
-                        print(
-                            f"\033[95m[HISTORICO] Complemento final {comp_idx}: {comp}\033[0m")
+                        LOGGER.debug(
+                            f"[HISTORICO] Complemento final {comp_idx}: {comp}")
 
                 self.order_items = itens_corrigidos
-                LOGGER.info(
+                LOGGER.debug(
                     f"[HISTORICO] Itens restaurados: {self.order_items}")
                 self.refresh_order_table()
                 self.update_total_label()
@@ -239,14 +236,12 @@ class OrderScreen(QWidget):
         self.screen_title = screen_title
         self.selected_customer = None
         self.order_items = []
-        self.customers = customers if customers is not None else []
+        # None usa o diretório de clientes compartilhado
+        self.customers = customers
         self.single_column_layout = single_column_layout
         self._editing_dialog = None  # Controla múltiplas aberturas de diálogos
         self._last_edit_time = {}  # Controla tempo de último clique por botão
 
-        LOGGER.info(
-            f"Carregando {len(self.customers)} clientes na tela de pedidos"
-        )
         self.setup_ui()
 
     def setup_ui(self):
@@ -624,32 +619,32 @@ class OrderScreen(QWidget):
         dialog.exec()
 
     def on_add_item_dialog_closed(self):
-        LOGGER.info("[DIALOG_CLOSED] Iniciando callback de fechamento")
+        LOGGER.debug("[DIALOG_CLOSED] Iniciando callback de fechamento")
 
         try:
             if hasattr(self, 'item_search') and self.item_search:
-                LOGGER.info("[DIALOG_CLOSED] item_search existe")
+                LOGGER.debug("[DIALOG_CLOSED] item_search existe")
 
                 # Testa chamar clear_selection de forma mais segura
                 try:
-                    LOGGER.info("[DIALOG_CLOSED] Chamando clear_selection()")
+                    LOGGER.debug("[DIALOG_CLOSED] Chamando clear_selection()")
                     self.item_search.clear_selection()
-                    LOGGER.info("[DIALOG_CLOSED] clear_selection() completado")
+                    LOGGER.debug("[DIALOG_CLOSED] clear_selection() completado")
                 except Exception as clear_error:
                     LOGGER.error(
                         f"[DIALOG_CLOSED] ERRO em clear_selection: {clear_error}")
                     # Continua sem quebrar se clear_selection falhar
 
                 if hasattr(self.item_search, 'item_lineedit'):
-                    LOGGER.info("[DIALOG_CLOSED] Definindo foco no lineedit")
+                    LOGGER.debug("[DIALOG_CLOSED] Definindo foco no lineedit")
                     self.item_search.item_lineedit.setFocus()
-                    LOGGER.info("[DIALOG_CLOSED] Foco definido")
+                    LOGGER.debug("[DIALOG_CLOSED] Foco definido")
                 else:
                     LOGGER.warning("[DIALOG_CLOSED] item_lineedit não existe")
             else:
                 LOGGER.warning("[DIALOG_CLOSED] item_search não existe")
 
-            LOGGER.info("[DIALOG_CLOSED] Callback concluído com sucesso")
+            LOGGER.debug("[DIALOG_CLOSED] Callback concluído com sucesso")
 
         except Exception as e:
             LOGGER.error(f"[DIALOG_CLOSED] ERRO: {str(e)}")
@@ -659,13 +654,13 @@ class OrderScreen(QWidget):
 
     def add_item_to_order(self, item_complete):
         """Adiciona item completo ao pedido."""
-        LOGGER.info("[ADD_ITEM] Adicionando novo item à ordem")
-        LOGGER.info(f"[ADD_ITEM] Dados completos do item: {item_complete}")
+        LOGGER.debug("[ADD_ITEM] Adicionando novo item à ordem")
+        LOGGER.debug(f"[ADD_ITEM] Dados completos do item: {item_complete}")
 
         try:
             row = self.order_table.rowCount()
             self.order_table.insertRow(row)
-            LOGGER.info(f"[ADD_ITEM] Nova row criada: {row}")
+            LOGGER.debug(f"[ADD_ITEM] Nova row criada: {row}")
 
             # Dados na tabela
             qtd = item_complete.get('qty', 1)
@@ -688,7 +683,7 @@ class OrderScreen(QWidget):
                 'qty': item_complete.get('qty', 1)
             }
             self.order_items.append(item_to_save)
-            LOGGER.info(
+            LOGGER.debug(
                 f"[ADD_ITEM] Item data armazenado para row {row} (formato padrao)")
 
             # Insere os itens na tabela (SEM botões widgets)
@@ -696,17 +691,17 @@ class OrderScreen(QWidget):
             self.order_table.setItem(row, 1, nome_item)
             self.order_table.setItem(row, 2, categoria_item)
             self.order_table.setItem(row, 3, action_item)
-            LOGGER.info(f"[ADD_ITEM] Items inseridos na tabela row {row}")
+            LOGGER.debug(f"[ADD_ITEM] Items inseridos na tabela row {row}")
 
             # Atualiza lista de sugestões de itens com proteção
-            LOGGER.info("[ADD_ITEM] Iniciando atualização de sugestões")
+            LOGGER.debug("[ADD_ITEM] Iniciando atualização de sugestões")
             if hasattr(self, 'item_search') and self.item_search:
                 try:
                     # Temporariamente desconecta sinais para evitar problemas
                     self.item_search.blockSignals(True)
                     self.item_search.load_items()
                     self.item_search.blockSignals(False)
-                    LOGGER.info("[ADD_ITEM] Lista de sugestões atualizada")
+                    LOGGER.debug("[ADD_ITEM] Lista de sugestões atualizada")
                 except Exception as e:
                     LOGGER.error(
                         f"[ADD_ITEM] Erro ao atualizar sugestões: {e}")
@@ -715,7 +710,7 @@ class OrderScreen(QWidget):
 
             # Atualiza o valor total
             self.update_total_label()
-            LOGGER.info(f"[ADD_ITEM] Item adicionado com sucesso na row {row}")
+            LOGGER.debug(f"[ADD_ITEM] Item adicionado com sucesso na row {row}")
 
         except Exception as e:
             LOGGER.error(f"[ADD_ITEM] ERRO ao adicionar item: {str(e)}")
@@ -764,7 +759,7 @@ class OrderScreen(QWidget):
 
     def finalize_order(self):
         """Finaliza o pedido."""
-        print(f'\033[93m{self.order_items}\033[0m')
+        LOGGER.debug(f'{self.order_items}')
         if not self.selected_customer:
             QMessageBox.warning(
                 self, "Aviso", "Selecione um cliente primeiro!"
@@ -779,8 +774,8 @@ class OrderScreen(QWidget):
 
         # Se for registro manual, registra o cliente no banco antes de finalizar
         if self.selected_customer.get('state') == 'register':
-            print("Registrando cliente no banco...")
-            from database.db import add_customer, get_customers
+            LOGGER.debug("Registrando cliente no banco...")
+            from database.db import find_or_create_customer, get_neighborhood_id
             name = self.selected_customer.get('name', '').strip()
             phone = self.selected_customer.get('phone', '').strip()
             address = self.selected_customer.get('address', '').strip(
@@ -789,33 +784,29 @@ class OrderScreen(QWidget):
             ) if 'neighborhood' in self.selected_customer else ''
             reference = self.selected_customer.get('reference', '').strip(
             ) if 'reference' in self.selected_customer else ''
+            # Bairro digitado -> id do bairro cadastrado (None se não existir)
+            neighborhood_id = (get_neighborhood_id(neighborhood)
+                               if neighborhood else None)
             # Adiciona o cliente
-            add_customer(name, phone, address, neighborhood, reference)
-            # Busca o cliente recém-criado (por nome e telefone)
-            all_customers = get_customers()
-            found = None
-            for c in all_customers:
-                # c: (id, name, phone, address, neighborhood, reference)
-                c_name = c[1].strip() if c[1] else ""
-                c_phone = c[2].strip() if c[2] else ""
-                if c_name == name and c_phone == phone:
-                    found = c
-                    break
-            if found:
-                self.selected_customer['id'] = found[0]
-                self.selected_customer['name'] = found[1]
-                self.selected_customer['phone'] = found[2]
-                self.selected_customer['address'] = found[3]
-                self.selected_customer['neighborhood'] = found[4]
-                self.selected_customer['reference'] = found[5]
+            try:
+                customer_id, _ = find_or_create_customer(
+                    name, phone, street=address,
+                    neighborhood_id=neighborhood_id, reference=reference)
+            except ValueError as e:
+                LOGGER.error(f"Erro ao registrar cliente: {e}")
+                customer_id = None
+            if customer_id:
+                # Só o id vem do banco: o pedido e o recibo usam os dados
+                # digitados para este pedido
+                self.selected_customer['id'] = customer_id
+                if neighborhood_id is not None:
+                    self.selected_customer['neighborhood_id'] = neighborhood_id
                 # Remove o estado register para não tentar registrar de novo
                 self.selected_customer.pop('state', None)
                 # Emite sinal para notificar que cliente foi registrado
+                # (as sugestões são atualizadas pelo diretório de clientes)
                 LOGGER.info("[FINALIZE] Cliente registrado, emitindo sinal")
                 self.customer_registered.emit(self.selected_customer)
-                # Atualiza a lista de sugestões do CustomerSearchWidget
-                if hasattr(self, 'customer_search') and hasattr(self.customer_search, 'load_customers'):
-                    self.customer_search.load_customers()
             else:
                 QMessageBox.critical(
                     self, "Erro", "Não foi possível registrar o cliente no banco.")
@@ -842,11 +833,6 @@ class OrderScreen(QWidget):
         dialog = FinalizeOrderDialog(
             self.selected_customer, self.order_items, total, None)
 
-        # Conecta o sinal para atualizar sugestões de clientes
-        if hasattr(self.customer_search, 'load_customers'):
-            dialog.customer_registered.connect(
-                lambda _: self.customer_search.load_customers())
-
         if dialog.exec():
             # Limpa o pedido após finalizar
             self.clear_order()
@@ -967,7 +953,7 @@ class OrderScreen(QWidget):
 
     def edit_item(self, row, dialog=None):
         """Edita um item do pedido."""
-        LOGGER.info(f"[EDIT_ITEM] Iniciando edit_item para row={row}")
+        LOGGER.debug(f"[EDIT_ITEM] Iniciando edit_item para row={row}")
 
         if row >= len(self.order_items):
             LOGGER.warning(f"[EDIT_ITEM] Row {row} inválido. "
@@ -990,17 +976,17 @@ class OrderScreen(QWidget):
                                f"Diferença: {time_diff:.3f}s")
                 return
         self._last_edit_time[row] = current_time
-        LOGGER.info("[EDIT_ITEM] Debounce ok. Continuando com edição.")
-        LOGGER.info("[EDIT_ITEM] Debounce ok. Continuando com edição.")
+        LOGGER.debug("[EDIT_ITEM] Debounce ok. Continuando com edição.")
+        LOGGER.debug("[EDIT_ITEM] Debounce ok. Continuando com edição.")
 
         try:
-            LOGGER.info("[EDIT_ITEM] Iniciando bloco try")
+            LOGGER.debug("[EDIT_ITEM] Iniciando bloco try")
             # Obtém dados do item atual (dicionário completo)
             item_dict = self.order_items[row]
             item_data = item_dict['item_data']
             item_name = item_data[1] if len(item_data) > 1 else 'N/A'
-            LOGGER.info(f"[EDIT_ITEM] item_data obtido: {item_name}")
-            LOGGER.info(f"[EDIT_ITEM] item_dict completo: {item_dict}")
+            LOGGER.debug(f"[EDIT_ITEM] item_data obtido: {item_name}")
+            LOGGER.debug(f"[EDIT_ITEM] item_dict completo: {item_dict}")
 
             # Reconstrói o dicionário do item para edição, mantendo o campo mandatory_selected
             new_item_dict = {
@@ -1012,25 +998,25 @@ class OrderScreen(QWidget):
                 'mandatory_selected': item_dict.get('mandatory_selected', []).copy(),
                 'total': item_dict.get('total', 0.0)
             }
-            LOGGER.info(
+            LOGGER.debug(
                 f"[EDIT_ITEM] mandatory_selected passado: {new_item_dict['mandatory_selected']}")
-            LOGGER.info(
+            LOGGER.debug(
                 f"[EDIT_ITEM] new_item_dict reconstruído: {new_item_dict}")
 
             # Cria o AddItemDialog pré-preenchido
             from ui.add_item_dialog import AddItemDialog
-            LOGGER.info("[EDIT_ITEM] Importando AddItemDialog")
+            LOGGER.debug("[EDIT_ITEM] Importando AddItemDialog")
 
             edit_dialog = AddItemDialog(item_data, None, self)
-            LOGGER.info(f"[EDIT_ITEM] AddItemDialog criado: {edit_dialog}")
+            LOGGER.debug(f"[EDIT_ITEM] AddItemDialog criado: {edit_dialog}")
 
             self._editing_dialog = edit_dialog
-            LOGGER.info("[EDIT_ITEM] _editing_dialog definido")
+            LOGGER.debug("[EDIT_ITEM] _editing_dialog definido")
 
             # Preenche os campos do dialog com os dados atuais, incluindo complementos obrigatórios e opcionais
             if hasattr(edit_dialog, 'set_initial_state'):
                 edit_dialog.set_initial_state(new_item_dict)
-                LOGGER.info(
+                LOGGER.debug(
                     "[EDIT_ITEM] Estado inicial preenchido via set_initial_state (com complementos robustos)")
             else:
                 qty = new_item_dict.get('qty', 1)
@@ -1043,12 +1029,12 @@ class OrderScreen(QWidget):
                         new_item_dict['mandatory_additions'])
                 if hasattr(edit_dialog, 'set_additions') and 'additions' in new_item_dict:
                     edit_dialog.set_additions(new_item_dict['additions'])
-                LOGGER.info(
+                LOGGER.debug(
                     "[EDIT_ITEM] Estado inicial preenchido (fallback, com complementos robustos)")
 
             def update_item_on_save(edited_item):
                 try:
-                    LOGGER.info(f"[UPDATE_ITEM] Iniciando para row {row}")
+                    LOGGER.debug(f"[UPDATE_ITEM] Iniciando para row {row}")
 
                     # Verifica se o OrderScreen ainda existe
                     if not hasattr(self, 'order_table'):
@@ -1058,7 +1044,7 @@ class OrderScreen(QWidget):
                     # Verifica se a linha ainda existe antes de atualizar
                     if (row < self.order_table.rowCount() and
                             row < len(self.order_items)):
-                        LOGGER.info("[UPDATE_ITEM] Atualizando tabela")
+                        LOGGER.debug("[UPDATE_ITEM] Atualizando tabela")
 
                         # Atualiza dados primeiro
                         self.order_items[row] = edited_item
@@ -1077,11 +1063,11 @@ class OrderScreen(QWidget):
                             row, 2, QTableWidgetItem(item_category))
 
                         # Força atualização total da tabela
-                        LOGGER.info(
+                        LOGGER.debug(
                             f"[UPDATE_ITEM] order_items atual: {self.order_items}")
                         self.refresh_order_table()
                         self.update_total_label()
-                        LOGGER.info(
+                        LOGGER.debug(
                             "[UPDATE_ITEM] Atualização concluída (refresh total)")
                     else:
                         LOGGER.warning(f"[UPDATE_ITEM] Row {row} inválido")
@@ -1092,27 +1078,27 @@ class OrderScreen(QWidget):
                     LOGGER.error(traceback.format_exc())
 
             def on_dialog_finished():
-                LOGGER.info("[DIALOG_FINISHED] Callback chamado")
+                LOGGER.debug("[DIALOG_FINISHED] Callback chamado")
                 if hasattr(self, '_editing_dialog'):
                     self._editing_dialog = None
-                    LOGGER.info("[DIALOG_FINISHED] _editing_dialog limpo")
+                    LOGGER.debug("[DIALOG_FINISHED] _editing_dialog limpo")
 
             # Conecta sinais normalmente (sem UniqueConnection)
-            LOGGER.info("[EDIT_ITEM] Conectando sinais")
+            LOGGER.debug("[EDIT_ITEM] Conectando sinais")
             edit_dialog.item_added.connect(update_item_on_save)
             edit_dialog.finished.connect(on_dialog_finished)
-            LOGGER.info("[EDIT_ITEM] Sinais conectados")
+            LOGGER.debug("[EDIT_ITEM] Sinais conectados")
 
-            LOGGER.info("[EDIT_ITEM] Executando diálogo")
+            LOGGER.debug("[EDIT_ITEM] Executando diálogo")
             edit_dialog.exec()
-            LOGGER.info("[EDIT_ITEM] Diálogo executado")
+            LOGGER.debug("[EDIT_ITEM] Diálogo executado")
 
             # Limpa referência após execução
             self._editing_dialog = None
-            LOGGER.info("[EDIT_ITEM] _editing_dialog limpo após exec")
+            LOGGER.debug("[EDIT_ITEM] _editing_dialog limpo após exec")
 
             if dialog:
-                LOGGER.info("[EDIT_ITEM] Aceitando dialog parent")
+                LOGGER.debug("[EDIT_ITEM] Aceitando dialog parent")
                 dialog.accept()
 
         except Exception as e:
@@ -1120,7 +1106,7 @@ class OrderScreen(QWidget):
             LOGGER.error(f"[EDIT_ITEM] ERRO: {str(e)}")
             if hasattr(self, '_editing_dialog'):
                 self._editing_dialog = None
-                LOGGER.info("[EDIT_ITEM] _editing_dialog limpo após erro")
+                LOGGER.debug("[EDIT_ITEM] _editing_dialog limpo após erro")
             LOGGER.error("[EDIT_ITEM] Stack trace completo:")
             import traceback
             LOGGER.error(traceback.format_exc())
@@ -1128,38 +1114,38 @@ class OrderScreen(QWidget):
 
     def show_context_menu(self, position):
         """Mostra menu de contexto ao clicar com botão direito."""
-        LOGGER.info("[CONTEXT_MENU] Menu de contexto solicitado")
+        LOGGER.debug("[CONTEXT_MENU] Menu de contexto solicitado")
 
         item = self.order_table.itemAt(position)
         if item is None:
-            LOGGER.info("[CONTEXT_MENU] Nenhum item na posição, cancelando")
+            LOGGER.debug("[CONTEXT_MENU] Nenhum item na posição, cancelando")
             return
 
         row = item.row()
-        LOGGER.info(f"[CONTEXT_MENU] Menu para row: {row}")
+        LOGGER.debug(f"[CONTEXT_MENU] Menu para row: {row}")
 
         menu = QMenu(self)
 
         # Ação editar
         edit_action = menu.addAction("Editar")
         edit_action.setIcon(QIcon.fromTheme("document-edit"))
-        LOGGER.info(f"[CONTEXT_MENU] Conectando ação editar para row {row}")
+        LOGGER.debug(f"[CONTEXT_MENU] Conectando ação editar para row {row}")
         edit_action.triggered.connect(lambda: self.edit_item_from_context(row))
 
         # Ação excluir
         delete_action = menu.addAction("Excluir")
         delete_action.setIcon(QIcon.fromTheme("edit-delete"))
-        LOGGER.info(f"[CONTEXT_MENU] Conectando ação excluir para row {row}")
+        LOGGER.debug(f"[CONTEXT_MENU] Conectando ação excluir para row {row}")
         delete_action.triggered.connect(lambda: self.delete_item(row))
 
         # Mostra o menu na posição do cursor
-        LOGGER.info("[CONTEXT_MENU] Exibindo menu")
+        LOGGER.debug("[CONTEXT_MENU] Exibindo menu")
         menu.exec(self.order_table.mapToGlobal(position))
-        LOGGER.info("[CONTEXT_MENU] Menu executado")
+        LOGGER.debug("[CONTEXT_MENU] Menu executado")
 
     def edit_item_from_context(self, row):
         """Método wrapper para chamar edit_item a partir do menu contexto."""
-        LOGGER.info(f"[CONTEXT_EDIT] Editando item via menu, row: {row}")
+        LOGGER.debug(f"[CONTEXT_EDIT] Editando item via menu, row: {row}")
         self.edit_item(row)
 
     def closeEvent(self, event):
@@ -1189,4 +1175,4 @@ class OrderScreen(QWidget):
 
     def __del__(self):
         """Remove event filter ao destruir o widget."""
-        LOGGER.info("[DEL] Destruindo OrderScreen")
+        LOGGER.debug("[DEL] Destruindo OrderScreen")
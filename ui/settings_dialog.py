@@ -10,8 +10,9 @@ from PySide6.QtWidgets import (QCheckBox, QComboBox, QDialog, QDialogButtonBox,
                                QTabWidget, QVBoxLayout, QWidget)
 
 from database.db import get_system_setting, set_system_setting
+from utils.escpos_output import PRINT_SIZE_COMMANDS
 from utils.log_utils import get_logger
-from utils.printer import Printer
+from utils.printer_registry import PRINTER_REGISTRY
 
 LOGGER = get_logger(__name__)
 
@@ -128,7 +129,7 @@ class SettingsDialog(QDialog):
 
         # Botão para atualizar lista de impressoras
         refresh_btn = QPushButton("Atualizar Lista")
-        refresh_btn.clicked.connect(self.load_printers)
+        refresh_btn.clicked.connect(self.refresh_printers)
         printer_layout.addWidget(refresh_btn)
 
         # Botão para detectar impressoras térmicas
@@ -137,6 +138,19 @@ class SettingsDialog(QDialog):
         detect_btn.setToolTip("Procura por impressoras térmicas conectadas")
         printer_layout.addWidget(detect_btn)
 
+        # Modo de envio: PDF pelo SumatraPDF ou ESC/POS direto
+        printer_layout.addWidget(QLabel("Modo de Impressão:"))
+        self.print_backend_combo = QComboBox()
+        self.print_backend_combo.addItem("PDF (SumatraPDF)", 'pdf')
+        self.print_backend_combo.addItem("ESC/POS direto (térmica)", 'escpos')
+        printer_layout.addWidget(self.print_backend_combo)
+
+        printer_layout.addWidget(QLabel("Destino ESC/POS (opcional):"))
+        self.escpos_target_edit = QLineEdit()
+        self.escpos_target_edit.setPlaceholderText(
+            "Vazio usa a impressora padrão. Ex.: tcp://192.168.0.50:9100")
+        printer_layout.addWidget(self.escpos_target_edit)
+
         layout.addWidget(printer_group)
 
         # Grupo: Configurações de Impressão
@@ -256,7 +270,7 @@ class SettingsDialog(QDialog):
         """Carrega a lista de impressoras disponíveis."""
         try:
             self.printer_combo.clear()
-            printers = Printer.list_printers()
+            printers = PRINTER_REGISTRY.printers()
             current_printer = get_system_setting('default_printer', '')
 
             for printer in printers:
@@ -273,6 +287,11 @@ class SettingsDialog(QDialog):
             QMessageBox.warning(
                 self, "Erro", f"Erro ao carregar impressoras: {str(e)}")
 
+    def refresh_printers(self):
+        """Descobre as impressoras novamente e recarrega a lista."""
+        PRINTER_REGISTRY.refresh()
+        self.load_printers()
+
     def detect_thermal_printers(self):
         """Detecta impressoras térmicas conectadas via USB."""
         try:
@@ -281,7 +300,7 @@ class SettingsDialog(QDialog):
                 "Procurando por impressoras térmicas conectadas...")
 
             # Recarrega a lista de impressoras
-            self.load_printers()
+            self.refresh_printers()
 
             # Verifica se há impressoras térmicas na lista
             thermal_found = False
@@ -390,6 +409,13 @@ class SettingsDialog(QDialog):
                 'rotate_receipt', 'true') == 'true'
             self.rotate_receipt_checkbox.setChecked(rotate_receipt)
 
+            index = self.print_backend_combo.findData(
+                get_system_setting('print_backend', 'pdf'))
+            if index >= 0:
+                self.print_backend_combo.setCurrentIndex(index)
+            self.escpos_target_edit.setText(
+                get_system_setting('escpos_target', ''))
+
             # Configurações do sistema
             num_screens = int(get_system_setting('num_order_screens', '4'))
             self.num_screens_spinbox.setValue(num_screens)
@@ -414,16 +440,7 @@ class SettingsDialog(QDialog):
             self.history_spinbox.setValue(history_months)
 
             # Tamanho de impressão
-            self.print_size_commands = {
-                "Normal": b'\x1d!\x00',
-                "Duplo Altura": b'\x1d!\x01',
-                "Duplo Largura": b'\x1d!\x10',
-                "Duplo": b'\x1d!\x11',
-                "Intermediário Altura": b'\x1d!\x02',
-                "Intermediário Largura": b'\x1d!\x20',
-                "Intermediário": b'\x1d!\x21',
-                "Triplo": b'\x1d!\x12'
-            }
+            self.print_size_commands = PRINT_SIZE_COMMANDS
 
             selected_size = get_system_setting('print_size', 'Normal')
             index = self.print_size_combo.findText(selected_size)
@@ -467,10 +484,14 @@ class SettingsDialog(QDialog):
             set_system_setting('print_header', print_header_value)
 
             # Salva configuração de girar nota
-            print('salvando')
             rotate_receipt_value = 'true' if self.rotate_receipt_checkbox.isChecked() else 'false'
             set_system_setting('rotate_receipt', rotate_receipt_value)
 
+            set_system_setting('print_backend',
+                               self.print_backend_combo.currentData())
+            set_system_setting('escpos_target',
+                               self.escpos_target_edit.text().strip())
+
             # Configurações do sistema
             set_system_setting('num_order_screens',
                                str(self.num_screens_spinbox.value()))
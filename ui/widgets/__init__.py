@@ -1,5 +1,6 @@
 # Widgets module for AnotaJá application
 
+from .customer_table import CustomerActionsDelegate, CustomerTableModel
 from .search_widgets import CustomerSearchWidget, ItemSearchWidget
 from .workers import CustomerFilterWorker, ItemFilterWorker
 
@@ -7,5 +8,7 @@ __all__ = [
     'ItemFilterWorker',
     'CustomerFilterWorker',
     'CustomerSearchWidget',
-    'ItemSearchWidget'
+    'ItemSearchWidget',
+    'CustomerTableModel',
+    'CustomerActionsDelegate'
 ]
@@ -0,0 +1,171 @@
+"""
+Modelo e delegate da tabela de clientes (CustomerManagementWindow).
+
+O modelo guarda as linhas num CustomerColumns e as entrega à view em lotes
+de FETCH_BATCH_SIZE (canFetchMore/fetchMore), conforme o usuário rola. Com
+set_page_source, cada lote é uma página lida do banco (paginação por cursor
+de database.db), então só a primeira página é consultada ao abrir. Os
+botões Histórico/Editar/Excluir são apenas desenhados pelo delegate, sem
+criar widgets por linha.
+"""
+
+from PySide6.QtCore import (QAbstractTableModel, QEvent, QModelIndex, Qt,
+                            Signal)
+from PySide6.QtWidgets import (QApplication, QStyle, QStyledItemDelegate,
+                               QStyleOptionButton)
+
+from database.db import customer_page_key
+from utils.customer_store import CustomerColumns
+
+# Linhas entregues à view por vez
+FETCH_BATCH_SIZE = 200
+
+# Coluna da tabela -> índice em utils.customer_store.COLUMNS
+DATA_COLUMNS = (1, 2, 3, 4, 7, 6)
+HEADERS = ("Nome", "Telefone", "Rua", "Número", "Bairro", "Referência")
+
+# Colunas de ação (depois das colunas de dados)
+ACTION_HISTORY = len(HEADERS)
+ACTION_EDIT = ACTION_HISTORY + 1
+ACTION_DELETE = ACTION_HISTORY + 2
+ACTION_LABELS = {
+    ACTION_HISTORY: "Histórico",
+    ACTION_EDIT: "Editar",
+    ACTION_DELETE: "Excluir",
+}
+
+
+class CustomerTableModel(QAbstractTableModel):
+    """Clientes exibidos sob demanda a partir do armazenamento colunar."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._store = CustomerColumns()
+        self._visible = 0
+        self._fetch_page = None  # fetch_page(after, limit) ou None
+
+    def set_customers(self, customers):
+        """Substitui os clientes (linhas no formato de get_customers)."""
+        self.beginResetModel()
+        self._store = CustomerColumns(customers)
+        self._visible = 0
+        self._fetch_page = None
+        self.endResetModel()
+
+    def set_page_source(self, fetch_page):
+        """Passa a ler os clientes do banco, uma página por vez.
+
+        fetch_page(after, limit) segue get_customers_page: retorna até limit
+        linhas após o cursor after. A primeira página é lida na hora.
+        """
+        self.beginResetModel()
+        self._store = CustomerColumns()
+        self._visible = 0
+        self._fetch_page = fetch_page
+        self.endResetModel()
+        self.fetchMore()
+
+    def _load_page(self):
+        """Lê a próxima página do banco para o armazenamento."""
+        last = self._store.last_row()
+        after = customer_page_key(last) if last is not None else None
+        page = self._fetch_page(after, FETCH_BATCH_SIZE)
+        if len(page) < FETCH_BATCH_SIZE:
+            self._fetch_page = None  # Última página
+        self._store.extend(page)
+
+    def customer(self, row):
+        """Tupla do cliente da linha (formato de get_customers) ou None."""
+        if 0 <= row < self._visible:
+            return self._store.row(row)
+        return None
+
+    def total_count(self):
+        """Total de clientes já lidos (exibidos ou não)."""
+        return len(self._store)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._visible
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(HEADERS) + len(ACTION_LABELS)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return (self._visible < len(self._store)
+                or self._fetch_page is not None)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        if self._visible >= len(self._store) and self._fetch_page is not None:
+            self._load_page()
+        count = min(FETCH_BATCH_SIZE, len(self._store) - self._visible)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._visible,
+                             self._visible + count - 1)
+        self._visible += count
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        column = index.column()
+        if role == Qt.DisplayRole:
+            if column < len(DATA_COLUMNS):
+                value = self._store.value(index.row(), DATA_COLUMNS[column])
+                return value or ""
+            return ACTION_LABELS.get(column)
+        if role == Qt.TextAlignmentRole:
+            return int(Qt.AlignVCenter | Qt.AlignLeft)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or orientation != Qt.Horizontal:
+            return None
+        if section < len(HEADERS):
+            return HEADERS[section]
+        return ACTION_LABELS.get(section)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+
+class CustomerActionsDelegate(QStyledItemDelegate):
+    """Desenha o botão da coluna de ação e avisa o clique."""
+    action_triggered = Signal(int, int)  # Linha, coluna de ação
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pressed = None  # (linha, coluna) com o mouse pressionado
+
+    def paint(self, painter, option, index):
+        button = QStyleOptionButton()
+        button.rect = option.rect.adjusted(4, 4, -4, -4)
+        button.text = index.data(Qt.DisplayRole) or ""
+        button.state = QStyle.State_Enabled
+        if self._pressed == (index.row(), index.column()):
+            button.state |= QStyle.State_Sunken
+        else:
+            button.state |= QStyle.State_Raised
+        style = (option.widget.style() if option.widget
+                 else QApplication.style())
+        style.drawControl(QStyle.CE_PushButton, button, painter, option.widget)
+
+    def editorEvent(self, event, model, option, index):
+        cell = (index.row(), index.column())
+        if event.type() == QEvent.MouseButtonPress:
+            self._pressed = cell
+            return True
+        if event.type() == QEvent.MouseButtonRelease:
+            clicked = (self._pressed == cell
+                       and option.rect.contains(event.position().toPoint()))
+            self._pressed = None
+            if clicked:
+                self.action_triggered.emit(index.row(), index.column())
+            return True
+        return super().editorEvent(event, model, option, index)
@@ -2,12 +2,13 @@
 Widgets de busca para clientes e itens.
 """
 
-from PySide6.QtCore import Qt, QThread, Signal
+from PySide6.QtCore import Qt, QThread, QTimer, Signal
 from PySide6.QtGui import QFont
 from PySide6.QtWidgets import (QLabel, QLineEdit, QListWidget, QListWidgetItem,
                                QVBoxLayout, QWidget)
 
-from database.db import search_menu_items
+from database.menu_catalog import MENU_CATALOG
+from ui.customer_directory import get_customer_directory
 from utils.log_utils import get_logger
 from utils.utils import (CUSTOMER_LINEEDIT_BASE_STYLE,
                          CUSTOMER_LINEEDIT_NO_BORDER_STYLE,
@@ -17,24 +18,29 @@ from .workers import CustomerFilterWorker, ItemFilterWorker
 
 LOGGER = get_logger(__name__)
 
+# Espera após a última tecla antes de disparar a busca (ms)
+SEARCH_DEBOUNCE_MS = 120
+
 
 class CustomerSearchWidget(QWidget):
     def load_customers(self):
-        """Carrega a lista de clientes do banco e atualiza o widget."""
+        """Recarrega a lista de clientes do banco e atualiza o widget."""
+        if self.directory is not None:
+            # O diretório avisa todas as telas pelo sinal reloaded
+            self.directory.reload()
+            return
         from database.db import get_customers
-        customers = get_customers()
-        LOGGER.info(
-            f"[LOAD_CUSTOMERS] Carregando {len(customers)} clientes do banco")
-
-        # Mostra alguns clientes para debug
-        for i, customer in enumerate(customers[-3:]):
-            LOGGER.info(f"[LOAD_CUSTOMERS] Cliente {i}: {customer}")
-
-        self.set_customers(customers)
+        self.set_customers(get_customers())
     """Widget de busca integrado com QLineEdit no topo e QListWidget abaixo."""
     customer_selected = Signal(dict)
     suggestions_list_shown = Signal()
     suggestions_list_hidden = Signal()
+    # Sinais para o worker (executados na thread dele)
+    search_requested = Signal(str, int)
+    customers_changed = Signal(list)
+    customer_rows_changed = Signal(list)
+    customer_upserted = Signal(object, object)
+    customer_removed = Signal(object)
 
     def suggestions_list_key_press(self, event):
         # Se pressionar seta para cima no primeiro item, volta o foco para o QLineEdit
@@ -45,10 +51,41 @@ class CustomerSearchWidget(QWidget):
 
     def __init__(self, parent=None, customers=None):
         super().__init__(parent)
+        # Sem lista explícita, usa o diretório compartilhado de clientes e
+        # recebe só as alterações de cada cliente
+        self.directory = get_customer_directory() if customers is None \
+            else None
         self.customers = customers if customers is not None else []
         self.customer_data = {}
         self.setup_ui()
         self.setup_worker_thread()
+        # O índice é montado na thread do worker
+        if self.directory is not None:
+            self.directory.customer_upserted.connect(
+                self.on_directory_customer_upserted)
+            self.directory.customer_removed.connect(
+                self.customer_removed.emit)
+            self.directory.reloaded.connect(self.on_directory_reloaded)
+            if self.directory.loaded:
+                self.on_directory_reloaded()
+        else:
+            self.customers_changed.emit(self.customers)
+
+    @staticmethod
+    def format_customer(customer):
+        """Converte uma linha do banco (id, name, phone, ...) para
+        (nome, telefone)."""
+        name = customer[1] if customer[1] is not None else ""
+        phone = customer[2] if customer[2] is not None else ""
+        return (name, phone)
+
+    def on_directory_customer_upserted(self, row):
+        """Cliente incluído ou alterado no diretório compartilhado."""
+        self.customer_upserted.emit(row[0], self.format_customer(row))
+
+    def on_directory_reloaded(self):
+        """Diretório recarregado: reconstrói o índice do worker."""
+        self.customer_rows_changed.emit(self.directory.rows())
 
     def setup_ui(self):
         layout = QVBoxLayout()
@@ -96,11 +133,26 @@ class CustomerSearchWidget(QWidget):
     def setup_worker_thread(self):
         """Configura e inicia a thread para a filtragem."""
         self.thread = QThread()
-        self.worker = CustomerFilterWorker(self.customers)
+        # Sem o diretório carregado, o worker busca no banco até o índice
+        # chegar (set_customer_rows)
+        self.worker = CustomerFilterWorker(
+            [], search_database=(self.directory is not None
+                                 and not self.directory.loaded))
         self.worker.moveToThread(self.thread)
 
         # Conecta os sinais e slots entre as threads
         self.worker.finished.connect(self.on_filtering_finished)
+        self.search_requested.connect(self.worker.filter_customers)
+        self.customers_changed.connect(self.worker.set_customers)
+        self.customer_rows_changed.connect(self.worker.set_customer_rows)
+        self.customer_upserted.connect(self.worker.upsert_customer)
+        self.customer_removed.connect(self.worker.remove_customer)
+
+        # Debounce: só busca quando o usuário para de digitar
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.dispatch_search)
 
         # Limpeza da thread
         self.thread.finished.connect(self.worker.deleteLater)
@@ -108,13 +160,20 @@ class CustomerSearchWidget(QWidget):
 
     def on_text_changed(self, text):
         """Chamado quando o texto do campo de busca muda."""
+        # Invalida buscas pendentes ou em andamento no worker
+        self.worker.next_generation()
         if text.strip():
-            # Envia para o worker filtrar
-            self.worker.filter_customers(text)
+            self.search_timer.start()
         else:
             # Se não há texto, esconde a lista
+            self.search_timer.stop()
             self.hide_suggestions()
 
+    def dispatch_search(self):
+        """Envia a busca para o worker (fila da thread do worker)."""
+        self.search_requested.emit(self.customer_lineedit.text(),
+                                   self.worker.latest_generation)
+
     def on_filtering_finished(self, filtered_customers, original_text):
         """Slot para receber os resultados da thread e atualizar a UI."""
         # Garante que estamos atualizando a UI com a busca mais recente
@@ -260,7 +319,7 @@ class CustomerSearchWidget(QWidget):
 
     def set_customers(self, customers):
         """Atualiza a lista de clientes, inclusive no worker da thread."""
-        LOGGER.info(f"[SET_CUSTOMERS] Recebendo {len(customers)} clientes")
+        LOGGER.debug(f"[SET_CUSTOMERS] Recebendo {len(customers)} clientes")
 
         # Converte para o formato esperado (nome, telefone)
         formatted_customers = []
@@ -272,15 +331,15 @@ class CustomerSearchWidget(QWidget):
             elif len(c) == 2:  # Já no formato (name, phone)
                 formatted_customers.append(c)
 
-        LOGGER.info(
+        LOGGER.debug(
             f"[SET_CUSTOMERS] Formatados {len(formatted_customers)} clientes")
 
         # Mostra alguns clientes para debug
         for i, customer in enumerate(formatted_customers[-3:]):
-            LOGGER.info(f"[SET_CUSTOMERS] Cliente formatado {i}: {customer}")
+            LOGGER.debug(f"[SET_CUSTOMERS] Cliente formatado {i}: {customer}")
 
         self.customers = formatted_customers
-        self.worker.set_customers(formatted_customers)
+        self.customers_changed.emit(formatted_customers)
         self.clear_selection()
 
     def clear_selection(self):
@@ -343,6 +402,9 @@ class ItemSearchWidget(QWidget):
     suggestions_list_shown = Signal()
     suggestions_list_hidden = Signal()
     items_updated = Signal()
+    # Sinais para o worker (executados na thread dele)
+    search_requested = Signal(str, int)
+    items_changed = Signal(list)
 
     def suggestions_list_key_press(self, event):
         # Se pressionar seta para cima no primeiro item, volta o foco para o QLineEdit
@@ -355,6 +417,7 @@ class ItemSearchWidget(QWidget):
         super().__init__(parent)
         self.items = []
         self.item_data = {}
+        self.menu_version = None
         self.setup_ui()
         self.setup_worker_thread()
         self.load_items()
@@ -409,16 +472,28 @@ class ItemSearchWidget(QWidget):
 
         # Conecta os sinais e slots entre as threads
         self.worker.finished.connect(self.on_filtering_finished)
+        self.search_requested.connect(self.worker.filter_items)
+        self.items_changed.connect(self.worker.set_items)
+
+        # Debounce: só busca quando o usuário para de digitar
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.dispatch_search)
 
         # Limpeza da thread
         self.thread.finished.connect(self.worker.deleteLater)
         self.thread.start()
 
     def load_items(self):
-        """Carrega itens do menu do banco de dados"""
+        """Carrega itens do menu a partir do catálogo em memória"""
         try:
-            self.items = search_menu_items("")  # Carrega todos os itens
-            self.worker.set_items(self.items)
+            # Nada mudou no cardápio desde a última carga
+            if self.menu_version == MENU_CATALOG.version:
+                return
+            self.items = MENU_CATALOG.get_items()  # Carrega todos os itens
+            self.menu_version = MENU_CATALOG.version
+            self.items_changed.emit(self.items)
             self.items_updated.emit()
         except Exception as e:
             LOGGER.error(f"Erro ao carregar itens do menu: {e}")
@@ -426,13 +501,20 @@ class ItemSearchWidget(QWidget):
 
     def on_text_changed(self, text):
         """Chamado quando o texto do campo de busca muda."""
+        # Invalida buscas pendentes ou em andamento no worker
+        self.worker.next_generation()
         if text.strip():
-            # Envia para o worker filtrar
-            self.worker.filter_items(text)
+            self.search_timer.start()
         else:
             # Se não há texto, esconde a lista
+            self.search_timer.stop()
             self.hide_suggestions()
 
+    def dispatch_search(self):
+        """Envia a busca para o worker (fila da thread do worker)."""
+        self.search_requested.emit(self.item_lineedit.text(),
+                                   self.worker.latest_generation)
+
     def on_filtering_finished(self, filtered_items, original_text):
         """Slot para receber os resultados da thread e atualizar a UI."""
         # Garante que estamos atualizando a UI com a busca mais recente
@@ -534,7 +616,7 @@ class ItemSearchWidget(QWidget):
         """Limpa o campo de busca e o estado do widget."""
         from utils.log_utils import get_logger
         LOGGER = get_logger(__name__)
-        LOGGER.info("[ItemSearchWidget] clear_selection chamado")
+        LOGGER.debug("[ItemSearchWidget] clear_selection chamado")
 
         try:
             # Bloquear sinais durante limpeza para evitar cascatas
@@ -564,7 +646,7 @@ class ItemSearchWidget(QWidget):
             self.item_lineedit.blockSignals(False)
             self.suggestions_list.blockSignals(False)
 
-            LOGGER.info(
+            LOGGER.debug(
                 "[ItemSearchWidget] clear_selection concluído com segurança")
 
         except Exception as e:
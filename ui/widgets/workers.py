@@ -1,11 +1,41 @@
 """
 Workers para filtragem de dados em threads separadas.
+
+As buscas chegam por sinais (conexão enfileirada, executadas na thread do
+worker). Cada busca leva um número de geração: quando a UI pede uma busca
+nova, as anteriores ficam obsoletas e são descartadas ou interrompidas.
 """
 
-from PySide6.QtCore import QObject, Signal
+from PySide6.QtCore import QObject, Signal, Slot
+
+from database import db
+from utils.customer_index import CustomerSearchIndex
+from utils.log_utils import get_logger
+
+LOGGER = get_logger(__name__)
 
+# Quantos itens verificar entre as checagens de cancelamento
+CANCEL_CHECK_INTERVAL = 256
 
-class ItemFilterWorker(QObject):
+
+class CancellableWorker(QObject):
+    """Base dos workers de busca com controle de geração."""
+
+    def __init__(self):
+        super().__init__()
+        self.latest_generation = 0
+
+    def next_generation(self):
+        """Chamado pela thread da UI: invalida as buscas pendentes."""
+        self.latest_generation += 1
+        return self.latest_generation
+
+    def is_stale(self, generation):
+        """True se uma busca mais nova já foi pedida."""
+        return generation is not None and generation != self.latest_generation
+
+
+class ItemFilterWorker(CancellableWorker):
     """
     Worker que executa a filtragem de itens em uma thread separada.
     """
@@ -16,61 +46,101 @@ class ItemFilterWorker(QObject):
         super().__init__()
         self.items = items
 
-    def filter_items(self, text):
+    @Slot(str, int)
+    def filter_items(self, text, generation=None):
         """Filtra a lista de itens com base no texto."""
+        if self.is_stale(generation):
+            return
         if not text:
             self.finished.emit([], text)
             return
 
-        filtered_items = [
-            item for item in self.items
-            if text.lower() in item[1].lower()  # item[1] é o nome do item
-        ]
+        text_lower = text.lower()
+        filtered_items = []
+        for position, item in enumerate(self.items):
+            # Interrompe a varredura se o usuário já digitou outra coisa
+            if (position % CANCEL_CHECK_INTERVAL == 0
+                    and self.is_stale(generation)):
+                return
+            if text_lower in item[1].lower():  # item[1] é o nome do item
+                filtered_items.append(item)
         self.finished.emit(filtered_items, text)
 
+    @Slot(list)
     def set_items(self, items):
         """Atualiza a lista de itens no worker."""
         self.items = items
 
 
-class CustomerFilterWorker(QObject):
+class CustomerFilterWorker(CancellableWorker):
     """
     Worker que executa a filtragem de clientes em uma thread separada.
     """
     finished = Signal(
         list, str)  # Sinal emitido com a lista filtrada e o texto original
 
-    def __init__(self, customers):
+    def __init__(self, customers, keys=None, search_database=False):
         super().__init__()
         self.customers = customers
-        import logging
-        logging.basicConfig(level=logging.INFO)
-        logging.info(
-            f"[CustomerFilterWorker.__init__] Lista recebida: {self.customers}")
+        self.index = CustomerSearchIndex(customers, keys=keys)
+        # Enquanto o índice não chega (diretório carregando), busca no banco
+        # pela conexão desta thread
+        self.search_database = search_database
 
-    def filter_customers(self, text):
+    @Slot(str, int)
+    def filter_customers(self, text, generation=None):
         """Filtra a lista de clientes com base no texto."""
-        import logging
-        logging.info(
-            f"[CustomerFilterWorker.filter_customers] Lista atual: {self.customers}")
+        if self.is_stale(generation):
+            return
         if not text:
             self.finished.emit([], text)
             return
 
-        text_lower = text.lower()
-        filtered_customers = []
-        for c in self.customers:
-            nome = c[0] if len(c) > 0 else ""
-            telefone = c[1] if len(c) > 1 else ""
-            nome_ok = isinstance(nome, str) and text_lower in nome.lower()
-            telefone_ok = isinstance(
-                telefone, str) and text_lower in telefone.replace(' ', '').lower()
-            if nome_ok or telefone_ok:
-                filtered_customers.append(c)
-        logging.info(
-            f"[CustomerFilterWorker.filter_customers] Filtrados: {filtered_customers}")
+        if self.search_database:
+            try:
+                filtered_customers = db.search_customers_page(
+                    text, limit=self.index.limit)
+            except Exception as e:
+                LOGGER.error(f"Erro ao buscar clientes no banco: {e}")
+                filtered_customers = []
+        else:
+            filtered_customers = self.index.search(text)
+        if self.is_stale(generation):
+            return
         self.finished.emit(filtered_customers, text)
 
+    @Slot(list)
     def set_customers(self, customers):
         """Atualiza a lista de clientes no worker."""
         self.customers = customers
+        self.index.build(customers)
+
+    @Slot(list, list)
+    def set_keyed_customers(self, customers, keys):
+        """Atualiza a lista de clientes identificados por id."""
+        self.customers = customers
+        self.index.build(customers, keys)
+
+    @Slot(list)
+    def set_customer_rows(self, rows):
+        """Reconstrói o índice a partir de linhas de get_customers().
+
+        A conversão para (nome, telefone) e o índice ficam nesta thread,
+        fora da thread da interface.
+        """
+        customers = [(row[1] or "", row[2] or "") for row in rows]
+        self.set_keyed_customers(customers, [row[0] for row in rows])
+        if self.search_database:
+            # Índice pronto: a conexão da busca no banco não é mais usada
+            self.search_database = False
+            db.close_connection()
+
+    @Slot(object, object)
+    def upsert_customer(self, key, customer):
+        """Inclui ou atualiza um cliente sem reconstruir o índice."""
+        self.index.update(customer, key)
+
+    @Slot(object)
+    def remove_customer(self, key):
+        """Remove um cliente sem reconstruir o índice."""
+        self.index.remove(key)
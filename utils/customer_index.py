@@ -0,0 +1,298 @@
+"""
+Índice em memória para a busca incremental de clientes.
+
+Os nomes são normalizados (sem acentos, minúsculos) e os telefones reduzidos
+aos dígitos. Os resultados seguem três faixas de relevância: nome/telefone
+começando com o texto, alguma palavra do nome começando com o texto e, por
+último, o texto em qualquer posição. Só os K melhores são calculados:
+
+- prefixos são achados com busca binária em listas ordenadas;
+- início de palavra e texto no meio do nome são procurados num único texto
+  concatenado, já na ordem do ranking, parando assim que K resultados são
+  encontrados;
+- quando o usuário continua digitando e a consulta anterior trouxe menos de
+  K resultados, a nova consulta apenas filtra esses resultados.
+
+Inclusões e exclusões (add/remove/update) não reconstroem o índice: os
+clientes novos ficam numa lista pequena verificada a cada busca e os
+removidos são apenas marcados, até acumular REBUILD_THRESHOLD alterações.
+"""
+
+import heapq
+import unicodedata
+from array import array
+from bisect import bisect_left, bisect_right
+
+DEFAULT_LIMIT = 50
+
+# Alterações acumuladas antes de reconstruir o índice
+REBUILD_THRESHOLD = 256
+
+# Maior caractere possível: query + PREFIX_END limita a faixa de prefixos
+PREFIX_END = '\U0010ffff'
+
+# Separador entre os textos concatenados (não aparece em consultas)
+SEPARATOR = '\n'
+
+
+def fold_text(text):
+    """Remove acentos, converte para minúsculas e normaliza espaços."""
+    if not text:
+        return ''
+    decomposed = unicodedata.normalize('NFKD', str(text))
+    stripped = ''.join(ch for ch in decomposed
+                       if not unicodedata.combining(ch))
+    return ' '.join(stripped.casefold().split())
+
+
+def only_digits(text):
+    """Mantém apenas os dígitos do texto (ex.: telefone)."""
+    if not text:
+        return ''
+    return ''.join(ch for ch in str(text) if ch.isdigit())
+
+
+class _SortedKeys:
+    """Chaves ordenadas com os ids correspondentes.
+
+    Permite buscar prefixos com bisect e procurar um trecho em qualquer
+    posição percorrendo as chaves na ordem, com str.find no texto
+    concatenado.
+    """
+
+    def __init__(self, keys_by_id):
+        self.ids = sorted(range(len(keys_by_id)),
+                          key=lambda customer_id: keys_by_id[customer_id])
+        self.keys = [keys_by_id[customer_id] for customer_id in self.ids]
+        # Posição de cada id nesta ordem (desempate do ranking)
+        self.position = array('I', bytes(4 * len(self.ids)))
+        for position, customer_id in enumerate(self.ids):
+            self.position[customer_id] = position
+        # Texto concatenado e o deslocamento onde cada chave começa
+        self.blob = SEPARATOR.join(self.keys)
+        self.starts = array('I')
+        offset = 0
+        for key in self.keys:
+            self.starts.append(offset)
+            offset += len(key) + len(SEPARATOR)
+
+    def prefix(self, query, limit=None):
+        """Ids cujas chaves começam com query, na ordem."""
+        start = bisect_left(self.keys, query)
+        end = bisect_left(self.keys, query + PREFIX_END, start)
+        if limit is not None:
+            end = min(end, start + limit)
+        return self.ids[start:end]
+
+    def containing(self, query, exclude, limit=None):
+        """Ids cujas chaves contêm query, na ordem, ignorando exclude."""
+        found = []
+        pos = self.blob.find(query)
+        while pos != -1:
+            row = bisect_right(self.starts, pos) - 1
+            customer_id = self.ids[row]
+            if customer_id not in exclude:
+                found.append(customer_id)
+                if limit is not None and len(found) >= limit:
+                    break
+            if row + 1 >= len(self.starts):
+                break
+            pos = self.blob.find(query, self.starts[row + 1])
+        return found
+
+
+class CustomerSearchIndex:
+    """Índice de busca sobre tuplas de cliente (name, phone, ...)."""
+
+    def __init__(self, customers=(), limit=DEFAULT_LIMIT, keys=None):
+        self.limit = limit
+        self.build(customers, keys)
+
+    def build(self, customers, keys=None):
+        """(Re)constrói o índice a partir da lista de clientes.
+
+        keys (opcional) identifica cada cliente (ex.: id do banco) para
+        permitir update/remove depois.
+        """
+        self.customers = list(customers)
+        self.keys = list(keys) if keys is not None else [None] * len(
+            self.customers)
+        self._id_by_key = {key: customer_id
+                           for customer_id, key in enumerate(self.keys)
+                           if key is not None}
+        self.names = [fold_text(c[0] if len(c) > 0 else '')
+                      for c in self.customers]
+        self.phones = [only_digits(c[1] if len(c) > 1 else '')
+                       for c in self.customers]
+        self._names = _SortedKeys(self.names)
+        self._phones = _SortedKeys(self.phones)
+        self._extra = []
+        self._removed = set()
+
+        self._last_query = None
+        self._last_result = None
+
+    def __len__(self):
+        return len(self.customers) - len(self._removed)
+
+    def add(self, customer, key=None):
+        """Inclui um cliente sem reconstruir o índice."""
+        if key is not None and key in self._id_by_key:
+            self.remove(key)
+        customer_id = len(self.customers)
+        self.customers.append(customer)
+        self.keys.append(key)
+        self.names.append(fold_text(customer[0] if len(customer) > 0 else ''))
+        self.phones.append(
+            only_digits(customer[1] if len(customer) > 1 else ''))
+        self._extra.append(customer_id)
+        if key is not None:
+            self._id_by_key[key] = customer_id
+        self._changed()
+
+    def update(self, customer, key):
+        """Atualiza (ou inclui) o cliente identificado por key."""
+        self.add(customer, key)
+
+    def remove(self, key):
+        """Remove o cliente identificado por key."""
+        customer_id = self._id_by_key.pop(key, None)
+        if customer_id is None:
+            return
+        self._removed.add(customer_id)
+        self._changed()
+
+    def _changed(self):
+        self._last_query = None
+        self._last_result = None
+        if len(self._extra) + len(self._removed) > REBUILD_THRESHOLD:
+            live = [customer_id for customer_id in range(len(self.customers))
+                    if customer_id not in self._removed]
+            self.build([self.customers[i] for i in live],
+                       [self.keys[i] for i in live])
+
+    @staticmethod
+    def _split_query(text):
+        """Retorna (nome normalizado, dígitos) da consulta.
+
+        Os dígitos só são usados quando a consulta não tem letras, para que
+        "Rua 12" não case com telefones.
+        """
+        name_query = fold_text(text)
+        has_letters = any(ch.isalpha() for ch in name_query)
+        digit_query = '' if has_letters else only_digits(text)
+        return name_query, digit_query
+
+    def _tier(self, customer_id, name_query, digit_query):
+        name = self.names[customer_id]
+        if name.startswith(name_query) or (
+                digit_query
+                and self.phones[customer_id].startswith(digit_query)):
+            return 0
+        if (' ' + name_query) in name:
+            return 1
+        return 2
+
+    def _sort_key(self, name_query, digit_query):
+        """Chave de ordenação do ranking (mesma ordem de _SortedKeys)."""
+        sort_keys = self.phones if digit_query else self.names
+        return lambda customer_id: (
+            self._tier(customer_id, name_query, digit_query),
+            sort_keys[customer_id], customer_id)
+
+    def _matches(self, customer_id, name_query, digit_query):
+        return (name_query in self.names[customer_id]
+                or (digit_query and digit_query in self.phones[customer_id]))
+
+    def _narrow(self, name_query, digit_query):
+        """Resultado completo da consulta anterior, se a atual o restringe."""
+        last = self._last_query
+        if last is None or self._last_result is None:
+            return None
+        if not (name_query.startswith(last[0])
+                and digit_query.startswith(last[1])
+                and bool(digit_query) == bool(last[1])):
+            return None
+        return [customer_id for customer_id in self._last_result
+                if self._matches(customer_id, name_query, digit_query)]
+
+    def search(self, text, limit=None):
+        """Retorna os K clientes mais relevantes para o texto digitado.
+
+        Dentro de cada faixa a ordem é alfabética, ou pelo telefone quando a
+        consulta só tem números.
+        """
+        limit = self.limit if limit is None else limit
+        name_query, digit_query = self._split_query(text)
+        if not name_query and not digit_query:
+            return []
+        ranked = self._narrow(name_query, digit_query)
+        if ranked is not None:
+            ranked.sort(key=self._sort_key(name_query, digit_query))
+        else:
+            sorted_keys = self._phones if digit_query else self._names
+            ranked = self._rank(name_query, digit_query,
+                                sorted_keys.position.__getitem__, limit)
+            if self._extra:
+                ranked = self._merge_extra(
+                    ranked, name_query, digit_query, limit)
+
+        # Com menos de K resultados o conjunto está completo e pode ser só
+        # filtrado na próxima tecla
+        self._last_query = (name_query, digit_query)
+        self._last_result = ranked if len(ranked) < limit else None
+        return [self.customers[customer_id] for customer_id in ranked[:limit]]
+
+    def _merge_extra(self, ranked, name_query, digit_query, limit):
+        """Junta ao ranking os clientes incluídos depois do build."""
+        extra = [customer_id for customer_id in self._extra
+                 if customer_id not in self._removed
+                 and self._matches(customer_id, name_query, digit_query)]
+        if not extra:
+            return ranked
+        return sorted(ranked + extra,
+                      key=self._sort_key(name_query, digit_query))[:limit]
+
+    def _rank(self, name_query, digit_query, position, limit):
+        """Calcula os K melhores ids do índice principal, faixa por faixa."""
+        removed = self._removed
+        # Faixa 1: nome ou telefone começando com a consulta
+        if digit_query:
+            # Nomes começando com números são raros: pega todos
+            candidates = set(self._phones.prefix(
+                digit_query, limit + len(removed)))
+            candidates.update(self._names.prefix(name_query))
+            candidates -= removed
+            ranked = heapq.nsmallest(limit, candidates, key=position)
+        else:
+            ranked = [customer_id for customer_id in self._names.prefix(
+                name_query, limit + len(removed))
+                if customer_id not in removed][:limit]
+        if len(ranked) >= limit:
+            return ranked
+
+        # Faixa 2: alguma palavra do nome começando com a consulta
+        seen = removed.union(ranked)
+        if digit_query:
+            ranked.extend(heapq.nsmallest(
+                limit - len(ranked),
+                self._names.containing(' ' + name_query, seen),
+                key=position))
+        else:
+            ranked.extend(self._names.containing(
+                ' ' + name_query, seen, limit - len(ranked)))
+        if len(ranked) >= limit:
+            return ranked
+
+        # Faixa 3: consulta em qualquer posição do nome ou do telefone
+        seen = removed.union(ranked)
+        if digit_query:
+            candidates = set(self._phones.containing(
+                digit_query, seen, limit - len(ranked)))
+            candidates.update(self._names.containing(name_query, seen))
+            ranked.extend(heapq.nsmallest(
+                limit - len(ranked), candidates, key=position))
+        else:
+            ranked.extend(self._names.containing(
+                name_query, seen, limit - len(ranked)))
+        return ranked
@@ -0,0 +1,55 @@
+"""
+Armazenamento colunar de clientes.
+
+Guarda cada campo de get_customers() numa lista própria (e os ids num
+array), em vez de uma tupla por cliente. Com dezenas de milhares de
+clientes isso reduz bastante a quantidade de objetos em memória, e as
+tabelas só montam a tupla da linha quando ela é realmente exibida.
+"""
+
+from array import array
+
+# Colunas na ordem de get_customers():
+# (id, name, phone, street, number, neighborhood_id, reference, neighborhood)
+COLUMNS = ('id', 'name', 'phone', 'street', 'number', 'neighborhood_id',
+           'reference', 'neighborhood')
+
+
+class CustomerColumns:
+    """Clientes guardados por coluna, com acesso por linha."""
+
+    def __init__(self, rows=()):
+        self.ids = array('q')
+        self._columns = [[] for _ in COLUMNS[1:]]
+        self.extend(rows)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def extend(self, rows):
+        """Acrescenta linhas no formato de get_customers()."""
+        columns = self._columns
+        for row in rows:
+            self.ids.append(row[0])
+            for column, value in zip(columns, row[1:]):
+                column.append(value)
+
+    def clear(self):
+        del self.ids[:]
+        for column in self._columns:
+            column.clear()
+
+    def value(self, row, column):
+        """Valor de uma célula (column é o índice em COLUMNS)."""
+        if column == 0:
+            return self.ids[row]
+        return self._columns[column - 1][row]
+
+    def row(self, row):
+        """Monta a tupla da linha no formato de get_customers()."""
+        return (self.ids[row],) + tuple(
+            column[row] for column in self._columns)
+
+    def last_row(self):
+        """Última linha carregada ou None."""
+        return self.row(len(self.ids) - 1) if self.ids else None
@@ -0,0 +1,137 @@
+"""
+Saída ESC/POS direta para impressoras térmicas.
+
+Converte as linhas de format_order_for_print em bytes ESC/POS (negrito,
+centralização e corte) e os envia sem gerar PDF nem chamar o SumatraPDF.
+O destino pode ser:
+
+- um objeto com write() (ex.: io.BytesIO, para testes);
+- 'tcp://host:porta' (impressoras de rede, normalmente porta 9100);
+- 'file:caminho' (arquivo ou dispositivo, ex.: file:/dev/usb/lp0);
+- o nome de uma impressora do Windows (fila RAW via win32print).
+"""
+
+import platform
+import socket
+
+from utils.log_utils import get_logger
+
+if platform.system() == "Windows":
+    try:
+        import win32print
+        PYWIN32_AVAILABLE = True
+    except ImportError:
+        PYWIN32_AVAILABLE = False
+else:
+    PYWIN32_AVAILABLE = False
+
+LOGGER = get_logger(__name__)
+
+# Comandos ESC/POS
+ESC_INIT = b'\x1b@'
+ESC_BOLD_ON = b'\x1bE\x01'
+ESC_BOLD_OFF = b'\x1bE\x00'
+ESC_ALIGN_LEFT = b'\x1ba\x00'
+ESC_ALIGN_CENTER = b'\x1ba\x01'
+ESC_CODEPAGE_CP850 = b'\x1bt\x02'
+GS_CUT_PARTIAL = b'\x1dV\x42\x00'  # Avança o papel e corta
+GS_SIZE_NORMAL = b'\x1d!\x00'
+
+# Tamanhos de fonte da configuração print_size
+PRINT_SIZE_COMMANDS = {
+    "Normal": b'\x1d!\x00',
+    "Duplo Altura": b'\x1d!\x01',
+    "Duplo Largura": b'\x1d!\x10',
+    "Duplo": b'\x1d!\x11',
+    "Intermediário Altura": b'\x1d!\x02',
+    "Intermediário Largura": b'\x1d!\x20',
+    "Intermediário": b'\x1d!\x21',
+    "Triplo": b'\x1d!\x12'
+}
+
+# Colunas da fonte A numa bobina de 80mm
+ESCPOS_COLUMNS = 48
+
+ENCODING = 'cp850'
+
+# Linhas que saem sempre em negrito
+BOLD_PREFIXES = ('TOTAL:',)
+
+SOCKET_TIMEOUT_SECONDS = 5
+
+
+def _is_centered(line):
+    """Linhas montadas com str.center têm espaços dos dois lados."""
+    stripped = line.strip()
+    return bool(stripped) and line[0] == ' ' and line[-1] == ' '
+
+
+def encode_receipt(lines, bold=False, size='Normal', cut=True):
+    """Converte as linhas do recibo em bytes ESC/POS.
+
+    Linhas centralizadas com espaços viram texto centralizado pela
+    impressora e separadores são cortados na largura da bobina.
+    """
+    out = [ESC_INIT, ESC_CODEPAGE_CP850,
+           PRINT_SIZE_COMMANDS.get(size, GS_SIZE_NORMAL)]
+    if bold:
+        out.append(ESC_BOLD_ON)
+    for line in lines:
+        line = str(line)
+        centered = _is_centered(line)
+        text = line.strip() if centered else line.rstrip()
+        if text and text == text[0] * len(text):
+            # Separador ("-----"): cabe numa linha da bobina
+            text = text[:ESCPOS_COLUMNS]
+        emphasis = not bold and text.startswith(BOLD_PREFIXES)
+        if centered:
+            out.append(ESC_ALIGN_CENTER)
+        if emphasis:
+            out.append(ESC_BOLD_ON)
+        out.append(text.encode(ENCODING, errors='replace'))
+        out.append(b'\n')
+        if emphasis:
+            out.append(ESC_BOLD_OFF)
+        if centered:
+            out.append(ESC_ALIGN_LEFT)
+    if bold:
+        out.append(ESC_BOLD_OFF)
+    if cut:
+        out.append(GS_CUT_PARTIAL)
+    return b''.join(out)
+
+
+def _send_win32_raw(printer_name, data):
+    """Envia os bytes para a fila do Windows sem passar pelo driver."""
+    if not PYWIN32_AVAILABLE:
+        raise RuntimeError(
+            "pywin32 não disponível para impressão RAW em "
+            f"{printer_name}")
+    handle = win32print.OpenPrinter(printer_name)
+    try:
+        win32print.StartDocPrinter(handle, 1, ("Pedido AnotaJá", None, "RAW"))
+        try:
+            win32print.StartPagePrinter(handle)
+            win32print.WritePrinter(handle, data)
+            win32print.EndPagePrinter(handle)
+        finally:
+            win32print.EndDocPrinter(handle)
+    finally:
+        win32print.ClosePrinter(handle)
+
+
+def send_raw(data, target):
+    """Envia os bytes ao destino (ver docstring do módulo)."""
+    if hasattr(target, 'write'):
+        target.write(data)
+    elif target.startswith('tcp://'):
+        host, _, port = target[len('tcp://'):].rpartition(':')
+        with socket.create_connection(
+                (host, int(port)), timeout=SOCKET_TIMEOUT_SECONDS) as sock:
+            sock.sendall(data)
+    elif target.startswith('file:'):
+        with open(target[len('file:'):], 'ab') as output:
+            output.write(data)
+    else:
+        _send_win32_raw(target, data)
+    LOGGER.info(f"[ESCPOS] {len(data)} bytes enviados para {target}")
@@ -1,51 +1,139 @@
+"""
+Configuração central de logs do AnotaJá.
+
+Todos os loggers repassam as mensagens para uma fila; uma única thread
+(QueueListener) grava no arquivo data/anotaja.log e no console, então quem
+loga (inclusive a thread da interface) nunca espera por disco. O arquivo é
+rotacionado por tamanho e na virada do dia.
+
+Os níveis por subsistema vêm da configuração 'log_levels', no formato
+"ui=WARNING; database=INFO; utils.print_spooler=DEBUG" (ver
+apply_log_levels).
+"""
+
+import atexit
+import datetime
 import logging
+import logging.handlers
 import os
+import queue
+import threading
+
+LOG_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
+LOG_FILE = os.path.join(LOG_DIR, 'anotaja.log')
+LOG_FORMAT = '%(asctime)s [%(levelname)s] %(name)s: %(message)s'
+LOG_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Rotação: tamanho máximo de cada arquivo e quantos antigos manter
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+
+DEFAULT_LEVEL = logging.INFO
+
+# Chave em system_settings com os níveis por subsistema
+LOG_LEVELS_SETTING = 'log_levels'
+
+_listener = None
+_setup_lock = threading.Lock()
+_custom_levels = set()
+
+
+class DailyRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Rotaciona o arquivo ao atingir maxBytes ou quando o dia muda."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._day = datetime.date.today()
+
+    def shouldRollover(self, record):
+        if datetime.date.today() != self._day:
+            return True
+        return super().shouldRollover(record)
+
+    def doRollover(self):
+        super().doRollover()
+        self._day = datetime.date.today()
+
+
+def _setup_logging():
+    """Instala a fila no logger raiz e inicia a thread de escrita."""
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            return
+        os.makedirs(LOG_DIR, exist_ok=True)
+        formatter = logging.Formatter(LOG_FORMAT, datefmt=LOG_DATE_FORMAT)
+
+        file_handler = DailyRotatingFileHandler(
+            LOG_FILE, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT,
+            encoding='utf-8', delay=True)
+        file_handler.setFormatter(formatter)
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+
+        log_queue = queue.SimpleQueue()
+        root = logging.getLogger()
+        root.addHandler(logging.handlers.QueueHandler(log_queue))
+        root.setLevel(DEFAULT_LEVEL)
+
+        _listener = logging.handlers.QueueListener(
+            log_queue, file_handler, console_handler,
+            respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """Grava as mensagens pendentes e para a thread de escrita."""
+    global _listener
+    with _setup_lock:
+        listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
 
 
 def get_logger(name):
     """
-    Configura e retorna um logger com formatação padronizada.
-    
+    Retorna o logger do módulo, ligado à fila central de logs.
+
     Args:
         name (str): Nome do logger (normalmente __name__)
-    
+
     Returns:
         logging.Logger: Logger configurado
     """
-    logger = logging.getLogger(name)
-    
-    # Se o logger já foi configurado, retorna ele
-    if logger.handlers:
-        return logger
-    
-    logger.setLevel(logging.INFO)
-    
-    # Cria o diretório de logs se não existir
-    log_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
-    os.makedirs(log_dir, exist_ok=True)
-    
-    # Configura o arquivo de log
-    log_file = os.path.join(log_dir, 'anotaja.log')
-    
-    # Cria o handler para arquivo
-    file_handler = logging.FileHandler(log_file, encoding='utf-8')
-    file_handler.setLevel(logging.INFO)
-    
-    # Cria o handler para console
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
-    
-    # Define o formato das mensagens de log
-    formatter = logging.Formatter(
-        '%(asctime)s [%(levelname)s] %(name)s: %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    
-    file_handler.setFormatter(formatter)
-    console_handler.setFormatter(formatter)
-    
-    # Adiciona os handlers ao logger
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
-    
-    return logger
+    _setup_logging()
+    return logging.getLogger(name)
+
+
+def parse_log_levels(spec):
+    """Converte "ui=WARNING; database=DEBUG" em {nome: nível}.
+
+    Entradas inválidas são ignoradas. O nome 'root' altera o nível geral.
+    """
+    levels = {}
+    for entry in (spec or '').replace(',', ';').split(';'):
+        name, sep, level_name = entry.partition('=')
+        name, level_name = name.strip(), level_name.strip().upper()
+        if not sep or not name:
+            continue
+        level = logging.getLevelName(level_name)
+        if isinstance(level, int):
+            levels[name] = level
+    return levels
+
+
+def apply_log_levels(spec):
+    """Aplica os níveis por subsistema (ver parse_log_levels)."""
+    levels = parse_log_levels(spec)
+    root_level = levels.pop('root', DEFAULT_LEVEL)
+    logging.getLogger().setLevel(root_level)
+    # Subsistemas que saíram da configuração voltam a herdar o nível
+    for name in _custom_levels - set(levels):
+        logging.getLogger(name).setLevel(logging.NOTSET)
+    for name, level in levels.items():
+        logging.getLogger(name).setLevel(level)
+    _custom_levels.clear()
+    _custom_levels.update(levels)
@@ -3,9 +3,12 @@ Utilitários para gerenciamento de configurações do sistema.
 """
 
 
-from database.db import get_system_setting
+from database import db
+from database.db import get_settings_version
+from database.settings_store import SETTINGS
 from utils.log_utils import get_logger
-from utils.printer import Printer
+from utils.printer_registry import PRINTER_REGISTRY
+from utils.receipt_template import ReceiptOrder, ReceiptTemplate
 
 LOGGER = get_logger(__name__)
 
@@ -18,19 +21,10 @@ def get_default_printer():
         Printer: Instância da impressora padrão ou None se não configurada
     """
     try:
-        printer_name = get_system_setting('default_printer', '')
-        if printer_name:
-            LOGGER.info(f"Impressora configurada no sistema: {printer_name}")
-            # Verificar se a impressora ainda existe no sistema
-            available_printers = Printer.list_printers()
-            for printer in available_printers:
-                if printer.name == printer_name:
-                    LOGGER.info(
-                        f"Impressora encontrada na lista: {printer.name}")
-                    return printer
-
-            LOGGER.warning(
-                f"Impressora {printer_name} não encontrada na lista")
+        # A lista de impressoras fica em cache no registro; se a impressora
+        # configurada não estiver nela, retorna None para forçar nova seleção
+        printer = PRINTER_REGISTRY.get_default_printer()
+        if printer is None:
             # Se não encontrar e for uma impressora Elgin, tentar encontrar uma funcional
             # if 'ELGIN' in printer_name.upper() or 'i9' in printer_name.lower():
             #     LOGGER.info(
@@ -40,10 +34,8 @@ def get_default_printer():
             #         LOGGER.info(
             #             f"Impressora funcional encontrada: {working_printer.name}")
             #         return working_printer
-
-            # Se não encontrar, retornar None para forçar nova seleção
             return None
-        return None
+        return printer
     except Exception as e:
         LOGGER.error(f"Erro ao obter impressora padrão: {e}")
         return None
@@ -58,11 +50,9 @@ def get_print_settings():
     """
     try:
         return {
-            'margin': int(get_system_setting('print_margin', '5')),
-            'include_header': (
-                get_system_setting('print_header', 'true') == 'true'
-            ),
-            'bold': (get_system_setting('print_bold', 'false') == 'true')
+            'margin': SETTINGS.get_int('print_margin', 5),
+            'include_header': SETTINGS.get_bool('print_header', True),
+            'bold': SETTINGS.get_bool('print_bold', False)
         }
     except Exception as e:
         LOGGER.error(f"Erro ao obter configurações de impressão: {e}")
@@ -79,15 +69,12 @@ def set_print_settings(settings: dict):
     Args:
         settings (dict): Dicionário com as configurações
     """
-    from database.db import set_system_setting
     if 'bold' in settings:
-        set_system_setting(
-            'print_bold', 'true' if settings['bold'] else 'false')
+        SETTINGS.set('print_bold', bool(settings['bold']))
     if 'margin' in settings:
-        set_system_setting('print_margin', str(settings['margin']))
+        SETTINGS.set('print_margin', settings['margin'])
     if 'include_header' in settings:
-        set_system_setting(
-            'print_header', 'true' if settings['include_header'] else 'false')
+        SETTINGS.set('print_header', bool(settings['include_header']))
 
 
 def get_company_info():
@@ -99,10 +86,10 @@ def get_company_info():
     """
     try:
         return {
-            'name': get_system_setting('company_name', ''),
-            'document': get_system_setting('company_document', ''),
-            'address': get_system_setting('company_address', ''),
-            'phone': get_system_setting('company_phone', '')
+            'name': SETTINGS.get('company_name', ''),
+            'document': SETTINGS.get('company_document', ''),
+            'address': SETTINGS.get('company_address', ''),
+            'phone': SETTINGS.get('company_phone', '')
         }
     except Exception as e:
         LOGGER.error(f"Erro ao obter informações da empresa: {e}")
@@ -122,7 +109,7 @@ def should_confirm_delete():
         bool: True se deve confirmar, False caso contrário
     """
     try:
-        return get_system_setting('confirm_delete', 'true') == 'true'
+        return SETTINGS.get_bool('confirm_delete', True)
     except Exception as e:
         LOGGER.error(f"Erro ao verificar configuração de confirmação: {e}")
         return True
@@ -136,18 +123,35 @@ def should_play_notification_sound():
         bool: True se deve tocar som, False caso contrário
     """
     try:
-        return get_system_setting('notification_sound', 'false') == 'true'
+        return SETTINGS.get_bool('notification_sound', False)
     except Exception as e:
         LOGGER.error(f"Erro ao verificar configuração de som: {e}")
         return False
 
 
+# Recibo compilado e a versão das configurações usada para montá-lo
+_RECEIPT_TEMPLATE = None
+_RECEIPT_TEMPLATE_KEY = None
+
+
+def get_receipt_template():
+    """
+    Retorna o modelo do recibo, recompilado só quando as configurações mudam.
+
+    Returns:
+        ReceiptTemplate: Modelo com o cabeçalho da empresa já montado
+    """
+    global _RECEIPT_TEMPLATE, _RECEIPT_TEMPLATE_KEY
+    key = (str(db.DB_PATH), get_settings_version())
+    if _RECEIPT_TEMPLATE_KEY != key:
+        _RECEIPT_TEMPLATE = ReceiptTemplate(
+            get_company_info(), get_print_settings()['include_header'])
+        _RECEIPT_TEMPLATE_KEY = key
+    return _RECEIPT_TEMPLATE
+
+
 def format_order_for_print(customer_data, order_items, total_amount,
                            order_notes="", delivery_fee=0.0, payment_method=None, change_value=0.0):
-    def wrap_line(text, width=32):
-        """Quebra uma string em múltiplas linhas de até 'width' caracteres."""
-        import textwrap
-        return textwrap.wrap(text, width=width)
     """
     Formata um pedido para impressão usando as configurações do sistema.
 
@@ -158,144 +162,13 @@ def format_order_for_print(customer_data, order_items, total_amount,
         order_notes (str): Observações do pedido
 
     Returns:
-        str: Texto formatado para impressão
+        list: Linhas do recibo
     """
     try:
-        company_info = get_company_info()
-        print_settings = get_print_settings()
-
-        lines = []
-        separator_ = ["-" * 55]
-
-        # Cabeçalho da empresa (se configurado)
-        if print_settings['include_header'] and company_info['name']:
-            for line in wrap_line(company_info['name']):
-                lines.append(line.center(32))
-            lines.append('')
-            for field in ['document', 'address', 'phone']:
-                value = company_info.get(field)
-                if value:
-                    wrapped = wrap_line(str(value))
-                    for w in wrapped:
-                        lines.append(w.center(32))
-
-        # Data/hora
-        from datetime import datetime
-        for line in wrap_line(f"Data: {datetime.now().strftime('%d/%m/%Y %H:%M')}"):
-            lines.append(line)
-
-        # Informações do cliente
-        customer_name = customer_data.get('name', 'Cliente não informado')
-        customer_phone = customer_data.get('phone', 'Telefone não informado')
-        for line in wrap_line(f"Cliente: {customer_name}"):
-            lines.append(line)
-        for line in wrap_line(f"Tel: {customer_phone}"):
-            lines.append(line)
-
-        # Itens do pedido
-        lines.extend(separator_)
-
-        for item in order_items:
-            qty = item.get('qty', 1)
-            item_data = item['item_data']
-            item_name = item_data[1] if len(item_data) > 1 else 'Item'
-            item_price = item_data[2] if len(item_data) > 2 else 0.0
-
-            # Calcular total do item (base + obrigatórios + opcionais)
-            item_total = qty * item_price
-            # Soma obrigatórios
-            for mand in item.get('mandatory_additions', []):
-                mand_preco = mand.get('price', 0.0)
-                item_total += mand_preco * qty
-            # Soma opcionais
-            for add in item.get('additions', []):
-                add_qtd = add.get('qty', 1)
-                add_preco = add.get('price', 0.0)
-                item_total += add_qtd * add_preco
-
-            for line in wrap_line(f"{qty}x | {item_name}"):
-                lines.append(line)
-
-            # Detalhes (complementos obrigatórios)
-            mandatory_additions = item.get('mandatory_additions', [])
-            if mandatory_additions:
-                lines.append("      Detalhes:")
-                for mand in mandatory_additions:
-                    mand_name = mand.get('name', 'Detalhe')
-                    mand_line = f"           {mand_name}"
-                    for line in wrap_line(mand_line):
-                        lines.append(line)
-
-            # Complementos opcionais
-            if item.get('additions'):
-                lines.append("      Complementos:")
-                for addition in item['additions']:
-                    add_name = addition.get('name', 'Adicional')
-                    add_qty = addition.get('qty', 1)
-                    add_price = addition.get('price', 0.0)
-                    addition_line = (f"      + {add_qty}x | {add_name} - "
-                                     f"R$ {add_price:.2f}")
-                    for line in wrap_line(addition_line):
-                        lines.append(line)
-
-            # Preço total do item
-            for line in wrap_line(f"   Total item: R$ {item_total:.2f}"):
-                lines.append(line)
-
-            # Observações do item se existirem
-            if item.get('observations'):
-                for line in wrap_line(f"   Obs: {item['observations']}"):
-                    lines.append(line)
-            lines.extend(separator_)
-
-        # Taxa de entrega (se houver)
-        if delivery_fee and delivery_fee > 0:
-            for line in wrap_line(f'Sub-total: R$ {total_amount - delivery_fee:.2f}'):
-                lines.append(line)
-            for line in wrap_line(f"Taxa de entrega: R$ {delivery_fee:.2f}"):
-                lines.append(line)
-
-        # Total
-        for line in wrap_line(f"TOTAL: R$ {total_amount:.2f}"):
-            lines.append(line)
-
-        # Forma de pagamento
-        if payment_method:
-            if payment_method == "Dinheiro":
-                for line in wrap_line(f"Troco para: R$ {change_value:.2f}"):
-                    lines.append(line)
-            for line in wrap_line(f"Pagamento: {payment_method}"):
-                lines.append(line)
-        lines.extend(separator_)
-
-        # Observações do pedido
-        if order_notes and not isinstance(order_notes, list):
-            for line in wrap_line(f"{order_notes}"):
-                lines.append(line)
-
-        # Endereço (se não for retirada)
-        if isinstance(order_notes, list):
-            street, number, neighborhood, reference = order_notes
-            if street:
-                for line in wrap_line(f"Rua: {street}"):
-                    lines.append(line)
-            if number:
-                for line in wrap_line(f"Número: {number}"):
-                    lines.append(line)
-            if neighborhood:
-                for line in wrap_line(f"Bairro: {neighborhood}"):
-                    lines.append(line)
-            if reference:
-                for line in wrap_line(f"Ref: {reference}"):
-                    lines.append(line)
-
-        lines.extend(separator_)
-
-        lines.append("AnotaJa".center(55))
-
-        lines.append("")
-
-        return lines
+        order = ReceiptOrder.from_order_data(
+            customer_data, order_items, total_amount, order_notes,
+            delivery_fee, payment_method, change_value)
+        return get_receipt_template().render(order)
 
     except Exception as e:
         LOGGER.error(f"Erro ao formatar pedido para impressão: {e}")
@@ -0,0 +1,153 @@
+"""
+Spooler de impressão em segundo plano.
+
+Os recibos são gravados na tabela print_jobs e impressos por uma thread
+própria, de modo que finalizar um pedido não espera pela geração do PDF nem
+pela impressora. Falhas são repetidas com espera crescente (backoff) até
+MAX_ATTEMPTS; trabalhos interrompidos por uma queda do programa voltam para a
+fila na próxima inicialização.
+"""
+
+import datetime
+import threading
+
+from PySide6.QtCore import QThread, Signal
+
+from database import db
+from utils.log_utils import get_logger
+from utils.print_settings import get_default_printer
+from utils.printer import Printer
+
+LOGGER = get_logger(__name__)
+
+# Tentativas por trabalho antes de marcá-lo como falho
+MAX_ATTEMPTS = 5
+
+# Espera antes da nova tentativa: BACKOFF_BASE_SECONDS * 2^(tentativa-1)
+BACKOFF_BASE_SECONDS = 2
+BACKOFF_MAX_SECONDS = 60
+
+# Intervalo máximo entre verificações da fila (s)
+IDLE_POLL_SECONDS = 30
+
+# Nome usado quando não há impressora padrão configurada
+FALLBACK_PRINTER_NAME = "Sistema de Impressão"
+
+
+def backoff_seconds(attempts):
+    """Tempo de espera antes da próxima tentativa."""
+    return min(BACKOFF_BASE_SECONDS * 2 ** (attempts - 1),
+               BACKOFF_MAX_SECONDS)
+
+
+class PrintSpooler(QThread):
+    """Thread que consome a fila persistente de impressão."""
+    job_queued = Signal(int)  # Id do trabalho
+    job_printed = Signal(int, str)  # Id, impressora
+    job_failed = Signal(int, str, bool)  # Id, erro, tentativas esgotadas
+    queue_changed = Signal(int, int)  # Na fila, falhos
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._wake = threading.Event()
+        self._stopping = False
+
+    def submit(self, lines, printer_name=None, order_id=None):
+        """Coloca o recibo na fila e retorna imediatamente o id do trabalho."""
+        job_id = db.enqueue_print_job(lines, printer_name, order_id)
+        LOGGER.info(f"[SPOOLER] Trabalho {job_id} na fila (pedido {order_id})")
+        self.job_queued.emit(job_id)
+        self._emit_queue_changed()
+        self._wake.set()
+        return job_id
+
+    def retry(self, job_id):
+        """Recoloca um trabalho falho na fila."""
+        db.requeue_print_job(job_id)
+        self._emit_queue_changed()
+        self._wake.set()
+
+    def stop(self, timeout_ms=5000):
+        """Pede para a thread terminar e espera o trabalho atual."""
+        self._stopping = True
+        self._wake.set()
+        self.wait(timeout_ms)
+
+    def run(self):
+        try:
+            recovered = db.recover_print_jobs()
+            if recovered:
+                LOGGER.info(
+                    f"[SPOOLER] {recovered} trabalho(s) interrompido(s) "
+                    "voltaram para a fila")
+            self._emit_queue_changed()
+            while not self._stopping:
+                job = db.claim_print_job()
+                if job is None:
+                    self._wait_for_work()
+                    continue
+                self._print_job(*job)
+                self._emit_queue_changed()
+        except Exception as e:
+            LOGGER.error(f"[SPOOLER] Erro inesperado na fila de impressão: {e}")
+        finally:
+            db.close_connection()
+
+    def _wait_for_work(self):
+        """Dorme até o próximo trabalho agendado ou até um novo submit."""
+        timeout = IDLE_POLL_SECONDS
+        next_time = db.get_next_print_job_time()
+        if next_time:
+            try:
+                due = datetime.datetime.strptime(
+                    next_time, '%Y-%m-%d %H:%M:%S')
+                seconds = (due - datetime.datetime.now()).total_seconds()
+                timeout = max(0.0, min(timeout, seconds))
+            except ValueError:
+                timeout = 0.0
+        self._wake.wait(timeout)
+        self._wake.clear()
+
+    def _print_job(self, job_id, lines, printer_name, attempts):
+        try:
+            if not printer_name:
+                default_printer = get_default_printer()
+                printer_name = (default_printer.name if default_printer
+                                else FALLBACK_PRINTER_NAME)
+            Printer(printer_name).print_lines(lines)
+        except Exception as e:
+            if attempts >= MAX_ATTEMPTS:
+                LOGGER.error(
+                    f"[SPOOLER] Trabalho {job_id} falhou após {attempts} "
+                    f"tentativas: {e}")
+                db.fail_print_job(job_id, e)
+                self.job_failed.emit(job_id, str(e), True)
+            else:
+                delay = backoff_seconds(attempts)
+                LOGGER.warning(
+                    f"[SPOOLER] Trabalho {job_id} falhou (tentativa "
+                    f"{attempts}), nova tentativa em {delay}s: {e}")
+                db.retry_print_job(job_id, e, delay)
+                self.job_failed.emit(job_id, str(e), False)
+            return
+        db.finish_print_job(job_id)
+        LOGGER.info(f"[SPOOLER] Trabalho {job_id} impresso em {printer_name}")
+        self.job_printed.emit(job_id, printer_name)
+
+    def _emit_queue_changed(self):
+        counts = db.get_print_queue_counts()
+        self.queue_changed.emit(
+            counts[db.PRINT_JOB_PENDING] + counts[db.PRINT_JOB_PRINTING],
+            counts[db.PRINT_JOB_FAILED])
+
+
+_SPOOLER = None
+
+
+def get_print_spooler():
+    """Retorna o spooler do processo, iniciando a thread no primeiro uso."""
+    global _SPOOLER
+    if _SPOOLER is None:
+        _SPOOLER = PrintSpooler()
+        _SPOOLER.start()
+    return _SPOOLER
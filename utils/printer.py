@@ -1,11 +1,9 @@
 import json
-import os
 import platform
 import subprocess
-import tempfile
 from typing import List
 
-from database.db import get_system_setting
+from database.settings_store import SETTINGS
 from utils.log_utils import get_logger
 
 # Importar win32print apenas no Windows
@@ -31,41 +29,23 @@ class Printer:
             pdf_path (str): Caminho onde salvar o PDF
             linhas (list): Linhas de texto para o recibo
         """
-        # import getpass
-        # import shutil
+        with open(pdf_path, 'wb') as pdf_file:
+            pdf_file.write(self.render_order_pdf(linhas))
 
-        from reportlab.lib.units import mm
-        from reportlab.pdfgen import canvas
+    @staticmethod
+    def render_order_pdf(linhas):
+        """
+        Gera o PDF do pedido em memória (ver utils.receipt_pdf).
+        Args:
+            linhas (list): Linhas de texto para o recibo
+        Returns:
+            bytes: Conteúdo do PDF
+        """
+        from utils.receipt_pdf import render_receipt_pdf
 
         # Lê configuração de girar nota
-        rotate_receipt = get_system_setting('rotate_receipt', 'true') == 'true'
-        largura = 80 * mm  # 80mm de largura (bobina padrão)
-        altura_linha = 6 * mm
-        margem_topo = 10 * mm
-        margem_base = 5 * mm
-        # Altura ajustada dinamicamente conforme quantidade de linhas
-        altura = margem_topo + margem_base + len(linhas) * altura_linha
-        c = canvas.Canvas(pdf_path, pagesize=(largura, altura))
-        if rotate_receipt:
-            c.translate(largura, altura)
-            c.rotate(180)
-        c.setFont("Helvetica-Bold", 12)
-        y = altura - margem_topo
-        for linha in linhas:
-            c.drawString(5 * mm, y, linha)
-            y -= altura_linha
-        c.save()
-
-        # Salva uma cópia do PDF na área de trabalho do usuário para análise
-        # try:
-        #     user = getpass.getuser()
-        #     desktop = os.path.join(os.path.expanduser("~"), "Desktop")
-        #     dest_path = os.path.join(desktop, "recibo_ultimo.pdf")
-        #     shutil.copy2(pdf_path, dest_path)
-        #     LOGGER.info(f"Cópia do PDF salva em: {dest_path}")
-        # except Exception as e:
-        #     LOGGER.warning(
-        #         f"Não foi possível salvar cópia do PDF na área de trabalho: {e}")
+        rotate_receipt = SETTINGS.get_bool('rotate_receipt', True)
+        return render_receipt_pdf(linhas, rotate=rotate_receipt)
 
     def print_pdf(self, pdf_path, printer_name=None):
         """
@@ -102,7 +82,67 @@ class Printer:
             printer_name = self.name
         args = [str(sumatra_path), "-print-to", printer_name, str(pdf_path)]
         LOGGER.info(f"Imprimindo PDF: {args}")
-        subprocess.run(args, shell=False)
+        result = subprocess.run(args, shell=False)
+        if result.returncode != 0:
+            raise RuntimeError(
+                f"SumatraPDF retornou código {result.returncode} ao imprimir "
+                f"em {printer_name}")
+
+    def print_lines(self, linhas):
+        """
+        Imprime as linhas do recibo nesta impressora.
+
+        Usa a saída configurada em print_backend: 'pdf' (padrão, via
+        SumatraPDF) ou 'escpos' (bytes ESC/POS direto para a impressora).
+        Args:
+            linhas (list): Linhas de texto para o recibo
+        """
+        if SETTINGS.get('print_backend', 'pdf') == 'escpos':
+            self.print_escpos(linhas)
+        else:
+            self.print_lines_pdf(linhas)
+
+    def print_escpos(self, linhas, target=None):
+        """
+        Envia o recibo como ESC/POS, sem gerar PDF.
+        Args:
+            linhas (list): Linhas de texto para o recibo
+            target: Destino (ver utils.escpos_output); padrão é a
+                configuração escpos_target ou, se vazia, esta impressora
+        """
+        from utils.escpos_output import encode_receipt, send_raw
+        if target is None:
+            target = SETTINGS.get('escpos_target', '') or self.name
+        data = encode_receipt(
+            linhas,
+            bold=SETTINGS.get_bool('print_bold', False),
+            size=SETTINGS.get('print_size', 'Normal'))
+        send_raw(data, target)
+
+    def print_lines_pdf(self, linhas):
+        """
+        Gera o PDF das linhas do recibo e envia para esta impressora.
+        Args:
+            linhas (list): Linhas de texto para o recibo
+        """
+        self.print_pdf_bytes(self.render_order_pdf(linhas))
+
+    def print_pdf_bytes(self, data, printer_name=None):
+        """
+        Imprime um PDF que está em memória.
+
+        O SumatraPDF só lê arquivos: os bytes passam por um arquivo do spool
+        (data/spool), removido assim que a impressão termina.
+        Args:
+            data (bytes): Conteúdo do PDF
+            printer_name (str): Nome da impressora (opcional, usa self.name)
+        """
+        from utils.receipt_pdf import remove_spool_file, write_spool_file
+        pdf_path = write_spool_file(data)
+        try:
+            self.print_pdf(pdf_path, printer_name)
+        finally:
+            remove_spool_file(pdf_path)
 
     @staticmethod
     def get_print_settings():
@@ -111,16 +151,11 @@ class Printer:
         Returns:
             dict: Dicionário com as configurações de impressão
         """
-        from database.db import get_system_setting
-        from utils.log_utils import get_logger
-        LOGGER = get_logger(__name__)
         try:
             return {
-                'margin': int(get_system_setting('print_margin', '5')),
-                'include_header': (
-                    get_system_setting('print_header', 'true') == 'true'
-                ),
-                'bold': (get_system_setting('print_bold', 'false') == 'true')
+                'margin': SETTINGS.get_int('print_margin', 5),
+                'include_header': SETTINGS.get_bool('print_header', True),
+                'bold': SETTINGS.get_bool('print_bold', False)
             }
         except Exception as e:
             LOGGER.error(f"Erro ao obter configurações de impressão: {e}")
@@ -137,11 +172,8 @@ class Printer:
         Returns:
             bool: True se deve tocar som, False caso contrário
         """
-        from database.db import get_system_setting
-        from utils.log_utils import get_logger
-        LOGGER = get_logger(__name__)
         try:
-            return get_system_setting('notification_sound', 'false') == 'true'
+            return SETTINGS.get_bool('notification_sound', False)
         except Exception as e:
             LOGGER.error(f"Erro ao verificar configuração de som: {e}")
             return False
@@ -253,25 +285,10 @@ class Printer:
         Returns:
             Printer: Instância da impressora padrão ou None se não configurada
         """
+        from utils.printer_registry import PRINTER_REGISTRY
         try:
-            printer_name = get_system_setting('default_printer', '')
-            if printer_name:
-                LOGGER.info(
-                    f"Impressora configurada no sistema: {printer_name}")
-                # Verificar se a impressora ainda existe no sistema
-                available_printers = Printer.list_printers()
-                for printer in available_printers:
-                    if printer.name == printer_name:
-                        LOGGER.info(
-                            f"Impressora encontrada na lista: {printer.name}")
-                        return printer
-
-                LOGGER.warning(
-                    f"Impressora {printer_name} não encontrada na lista")
-
-                # Se não encontrar, retornar None para forçar nova seleção
-                return None
-            return None
+            # Lista de impressoras em cache (ver utils.printer_registry)
+            return PRINTER_REGISTRY.get_default_printer()
         except Exception as e:
             LOGGER.error(f"Erro ao obter impressora padrão: {e}")
             return None
@@ -323,7 +340,7 @@ class Printer:
                         nome = impressora_info[2]  # Nome da impressora
 
                         if nome:
-                            LOGGER.info(f"[LIST_PRINTERS] Processando: {nome}")
+                            LOGGER.debug(f"[LIST_PRINTERS] Processando: {nome}")
 
                             # Obter detalhes da impressora
                             try:
@@ -334,11 +351,11 @@ class Printer:
                                 port_name = info['pPortName']
                                 status = info['Status']
 
-                                LOGGER.info(
+                                LOGGER.debug(
                                     f"[LIST_PRINTERS] Driver: {driver_name}")
-                                LOGGER.info(
+                                LOGGER.debug(
                                     f"[LIST_PRINTERS] Porta: {port_name}")
-                                LOGGER.info(
+                                LOGGER.debug(
                                     f"[LIST_PRINTERS] Status: {status}")
 
                                 win32print.ClosePrinter(handle)
@@ -346,7 +363,7 @@ class Printer:
                                 # Filtrar impressoras virtuais por nome
                                 if not Printer._is_virtual_printer_name(nome):
                                     printers.append(Printer(nome))
-                                    LOGGER.info(
+                                    LOGGER.debug(
                                         f"[LIST_PRINTERS] Impressora adicionada: {nome}")
                                 else:
                                     LOGGER.warning(
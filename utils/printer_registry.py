@@ -0,0 +1,130 @@
+"""
+Registro em cache das impressoras do sistema.
+
+Listar impressoras é caro (EnumPrinters/OpenPrinter no Windows, PowerShell
+ou lpstat como alternativa), então a descoberta roda uma vez e o resultado
+fica em memória por PRINTER_CACHE_TTL_SECONDS. Depois disso a lista antiga
+continua sendo usada enquanto uma thread em segundo plano a atualiza. A
+impressora padrão é resolvida por um dicionário, sem subprocessos; quando a
+configuração default_printer muda, a lista é atualizada em segundo plano.
+"""
+
+import threading
+import time
+
+from database.settings_store import SETTINGS
+from utils.log_utils import get_logger
+from utils.printer import Printer
+
+LOGGER = get_logger(__name__)
+
+# Tempo que a lista de impressoras é considerada atual (s)
+PRINTER_CACHE_TTL_SECONDS = 300
+
+# Intervalo mínimo entre redescobertas por impressora não encontrada (s)
+MISSING_PRINTER_RETRY_SECONDS = 10
+
+
+class PrinterRegistry:
+    """Lista de impressoras descoberta uma vez e atualizada por TTL."""
+
+    def __init__(self, ttl=PRINTER_CACHE_TTL_SECONDS,
+                 discover=Printer.list_printers):
+        self.ttl = ttl
+        self._discover = discover
+        self._lock = threading.Lock()
+        self._printers = ()
+        self._by_name = {}
+        self._loaded_at = None
+        self._refreshing = None  # Event da atualização em andamento
+
+    def _is_stale(self):
+        return (self._loaded_at is None
+                or time.monotonic() - self._loaded_at > self.ttl)
+
+    def _run_discovery(self, done):
+        try:
+            printers = tuple(self._discover())
+        except Exception as e:
+            LOGGER.error(f"[PRINTER_REGISTRY] Erro ao listar impressoras: {e}")
+            printers = None
+        with self._lock:
+            if printers is not None:
+                self._printers = printers
+                self._by_name = {printer.name: printer
+                                 for printer in printers}
+            # Mesmo com erro, espera o TTL antes de tentar de novo
+            self._loaded_at = time.monotonic()
+            self._refreshing = None
+        done.set()
+
+    def _start_refresh(self, background):
+        """Inicia uma descoberta (ou aproveita a que já está rodando)."""
+        with self._lock:
+            done = self._refreshing
+            started = done is None
+            if started:
+                done = self._refreshing = threading.Event()
+        if started:
+            if background:
+                threading.Thread(target=self._run_discovery, args=(done,),
+                                 name='PrinterRegistryRefresh',
+                                 daemon=True).start()
+            else:
+                self._run_discovery(done)
+        return done
+
+    def refresh_async(self):
+        """Atualiza a lista em segundo plano."""
+        self._start_refresh(background=True)
+
+    def refresh(self):
+        """Atualiza a lista agora e espera o resultado."""
+        self._start_refresh(background=False).wait()
+
+    def _ensure_loaded(self):
+        if self._loaded_at is None:
+            # Primeira consulta: espera a descoberta inicial
+            self._start_refresh(background=False).wait()
+        elif self._is_stale():
+            # Lista vencida: usa a atual e atualiza em segundo plano
+            self.refresh_async()
+
+    def printers(self):
+        """Retorna as impressoras conhecidas."""
+        self._ensure_loaded()
+        return list(self._printers)
+
+    def get(self, name):
+        """Retorna a impressora pelo nome ou None."""
+        self._ensure_loaded()
+        return self._by_name.get(name)
+
+    def get_default_printer(self):
+        """Retorna a impressora padrão configurada ou None."""
+        # Configurações em cache: mudanças no diálogo valem na hora
+        name = SETTINGS.get('default_printer', '')
+        if not name:
+            return None
+        printer = self.get(name)
+        if printer is None:
+            LOGGER.warning(
+                f"[PRINTER_REGISTRY] Impressora {name} não "
+                "encontrada na lista")
+            # Pode ter sido conectada depois da última descoberta
+            if (self._loaded_at is not None and time.monotonic()
+                    - self._loaded_at > MISSING_PRINTER_RETRY_SECONDS):
+                self.refresh_async()
+        return printer
+
+    def on_default_printer_changed(self, key, value):
+        """Impressora padrão alterada: atualiza a lista em segundo plano,
+        pois a nova pode não estar na última descoberta."""
+        LOGGER.debug(f"[PRINTER_REGISTRY] Impressora padrão: {value!r}")
+        if self._loaded_at is not None:
+            self.refresh_async()
+
+
+PRINTER_REGISTRY = PrinterRegistry()
+SETTINGS.subscribe(PRINTER_REGISTRY.on_default_printer_changed,
+                   keys=('default_printer',))
@@ -0,0 +1,149 @@
+"""
+PDF do recibo em memória e pasta de spool para o SumatraPDF.
+
+O PDF é desenhado num BytesIO (nada vai para o disco até a hora de
+imprimir). O reportlab e as métricas da fonte são carregados uma única vez,
+de preferência em segundo plano na abertura do programa
+(preload_pdf_renderer), para que o primeiro recibo do dia não espere pela
+importação.
+
+O SumatraPDF só imprime arquivos, então os bytes passam por um arquivo em
+data/spool, apagado logo depois da impressão. Sobras (ex.: programa
+fechado no meio da impressão) são removidas pelo cleanup_spool, que também
+mantém a pasta abaixo de SPOOL_MAX_BYTES.
+"""
+
+import io
+import os
+import threading
+import time
+import uuid
+
+from database import db
+from utils.log_utils import get_logger
+
+LOGGER = get_logger(__name__)
+
+# Bobina padrão de 80mm (medidas em mm, convertidas ao desenhar)
+RECEIPT_WIDTH_MM = 80
+LINE_HEIGHT_MM = 6
+MARGIN_TOP_MM = 10
+MARGIN_BOTTOM_MM = 5
+MARGIN_LEFT_MM = 5
+RECEIPT_FONT = 'Helvetica-Bold'
+RECEIPT_FONT_SIZE = 12
+
+SPOOL_DIR = db.BASE_DIR / 'data' / 'spool'
+# Tamanho máximo da pasta de spool e idade máxima de um arquivo esquecido
+SPOOL_MAX_BYTES = 20 * 1024 * 1024
+SPOOL_MAX_AGE_SECONDS = 24 * 60 * 60
+
+_reportlab = None
+_reportlab_lock = threading.Lock()
+
+
+def _load_reportlab():
+    """Importa o reportlab (uma vez) e retorna (canvas, mm)."""
+    global _reportlab
+    if _reportlab is None:
+        with _reportlab_lock:
+            if _reportlab is None:
+                from reportlab.lib.units import mm
+                from reportlab.pdfbase import pdfmetrics
+                from reportlab.pdfgen import canvas
+
+                # Carrega as métricas da fonte antes do primeiro recibo
+                pdfmetrics.getFont(RECEIPT_FONT)
+                _reportlab = (canvas, mm)
+    return _reportlab
+
+
+def render_receipt_pdf(linhas, rotate=True):
+    """
+    Gera o PDF do recibo no formato bobina térmica, em memória.
+    Args:
+        linhas (list): Linhas de texto para o recibo
+        rotate (bool): Gira a nota em 180° (impressoras que puxam invertido)
+    Returns:
+        bytes: Conteúdo do PDF
+    """
+    canvas, mm = _load_reportlab()
+    largura = RECEIPT_WIDTH_MM * mm
+    altura_linha = LINE_HEIGHT_MM * mm
+    margem_topo = MARGIN_TOP_MM * mm
+    margem_base = MARGIN_BOTTOM_MM * mm
+    # Altura ajustada dinamicamente conforme quantidade de linhas
+    altura = margem_topo + margem_base + len(linhas) * altura_linha
+
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=(largura, altura))
+    if rotate:
+        c.translate(largura, altura)
+        c.rotate(180)
+    c.setFont(RECEIPT_FONT, RECEIPT_FONT_SIZE)
+    y = altura - margem_topo
+    for linha in linhas:
+        c.drawString(MARGIN_LEFT_MM * mm, y, linha)
+        y -= altura_linha
+    c.save()
+    return buffer.getvalue()
+
+
+def preload_pdf_renderer():
+    """Carrega o reportlab e limpa o spool em segundo plano."""
+    def preload():
+        try:
+            started = time.perf_counter()
+            render_receipt_pdf([''])
+            LOGGER.debug(
+                f"Gerador de PDF carregado em "
+                f"{time.perf_counter() - started:.2f}s")
+        except Exception as e:
+            LOGGER.warning(f"Não foi possível pré-carregar o reportlab: {e}")
+        cleanup_spool()
+
+    threading.Thread(target=preload, name='PdfPreload', daemon=True).start()
+
+
+def write_spool_file(data, suffix='.pdf'):
+    """Grava os bytes num arquivo novo do spool e retorna o caminho."""
+    SPOOL_DIR.mkdir(parents=True, exist_ok=True)
+    cleanup_spool(reserve=len(data))
+    name = f"{time.strftime('%Y%m%d%H%M%S')}_{uuid.uuid4().hex}{suffix}"
+    path = SPOOL_DIR / name
+    path.write_bytes(data)
+    return path
+
+
+def remove_spool_file(path):
+    """Apaga um arquivo do spool (falhas só vão para o log)."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        LOGGER.warning(f"Não foi possível remover {path}: {e}")
+
+
+def cleanup_spool(reserve=0, max_bytes=SPOOL_MAX_BYTES,
+                  max_age=SPOOL_MAX_AGE_SECONDS):
+    """
+    Remove arquivos antigos do spool.
+
+    Apaga os que passaram de max_age e, se a pasta ainda somar mais que
+    max_bytes (contando reserve bytes que serão gravados), os mais antigos
+    até caber.
+    """
+    try:
+        entries = [(entry.stat().st_mtime, entry.stat().st_size, entry.path)
+                   for entry in os.scandir(SPOOL_DIR) if entry.is_file()]
+    except FileNotFoundError:
+        return
+    entries.sort()
+    total = sum(size for _, size, _ in entries) + reserve
+    oldest_allowed = time.time() - max_age
+    for mtime, size, path in entries:
+        if mtime >= oldest_allowed and total <= max_bytes:
+            break
+        remove_spool_file(path)
+        total -= size
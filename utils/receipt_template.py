@@ -0,0 +1,194 @@
+"""
+Modelo compilado do recibo de pedido.
+
+O cabeçalho (dados da empresa) muda só quando as configurações mudam, então
+é montado uma vez por versão das configurações (ver
+print_settings.get_receipt_template). A cada pedido apenas o corpo é
+renderizado a partir de um ReceiptOrder, e as linhas que já cabem na largura
+da bobina pulam o textwrap.
+"""
+
+import functools
+import textwrap
+from datetime import datetime
+
+# Largura usada para quebrar as linhas do recibo
+RECEIPT_WIDTH = 32
+
+SEPARATOR = "-" * 55
+FOOTER = "AnotaJa".center(55)
+
+
+@functools.lru_cache(maxsize=4096)
+def _wrap_long(text, width):
+    # Nomes de itens e complementos se repetem muito entre pedidos
+    return tuple(textwrap.wrap(text, width=width))
+
+
+def wrap_line(text, width=RECEIPT_WIDTH):
+    """Quebra o texto em linhas de até width caracteres.
+
+    Mesmo resultado de textwrap.wrap, mas sem custo para o caso comum de
+    linhas curtas sem espaços no fim nem caracteres de controle.
+    """
+    if (len(text) <= width and text.isprintable()
+            and text.strip(' ') and not text.endswith(' ')):
+        return [text]
+    return list(_wrap_long(text, width))
+
+
+class ReceiptItem:
+    """Item do pedido já no formato do recibo."""
+
+    def __init__(self, qty, name, price, mandatory_additions=(),
+                 additions=(), observations=''):
+        self.qty = qty
+        self.name = name
+        self.price = price
+        # [(nome, preço)]
+        self.mandatory_additions = mandatory_additions
+        # [(qtd, nome, preço)]
+        self.additions = additions
+        self.observations = observations
+
+    @classmethod
+    def from_order_item(cls, item):
+        """Converte um item das telas de pedido (dict com item_data)."""
+        item_data = item['item_data']
+        return cls(
+            item.get('qty', 1),
+            item_data[1] if len(item_data) > 1 else 'Item',
+            item_data[2] if len(item_data) > 2 else 0.0,
+            [(mand.get('name', 'Detalhe'), mand.get('price', 0.0))
+             for mand in item.get('mandatory_additions', [])],
+            [(add.get('qty', 1), add.get('name', 'Adicional'),
+              add.get('price', 0.0))
+             for add in item.get('additions') or []],
+            item.get('observations'),
+        )
+
+    def total(self):
+        """Total do item: base, obrigatórios e opcionais."""
+        total = self.qty * self.price
+        for _, price in self.mandatory_additions:
+            total += price * self.qty
+        for qty, _, price in self.additions:
+            total += qty * price
+        return total
+
+
+class ReceiptOrder:
+    """Dados do pedido usados pelo recibo, sem dependência da interface.
+
+    notes pode ser um texto (ex.: "Retirada") ou a lista
+    [rua, número, bairro, referência] de uma entrega.
+    """
+
+    def __init__(self, customer_name, customer_phone, items, total_amount,
+                 notes="", delivery_fee=0.0, payment_method=None,
+                 change_value=0.0, created_at=None):
+        self.customer_name = customer_name
+        self.customer_phone = customer_phone
+        self.items = items
+        self.total_amount = total_amount
+        self.notes = notes
+        self.delivery_fee = delivery_fee
+        self.payment_method = payment_method
+        self.change_value = change_value
+        self.created_at = created_at
+
+    @classmethod
+    def from_order_data(cls, customer_data, order_items, total_amount,
+                        order_notes="", delivery_fee=0.0, payment_method=None,
+                        change_value=0.0):
+        """Monta o pedido a partir dos argumentos de format_order_for_print."""
+        return cls(
+            customer_data.get('name', 'Cliente não informado'),
+            customer_data.get('phone', 'Telefone não informado'),
+            [ReceiptItem.from_order_item(item) for item in order_items],
+            total_amount, order_notes, delivery_fee, payment_method,
+            change_value)
+
+
+class ReceiptTemplate:
+    """Recibo com o cabeçalho da empresa já montado."""
+
+    def __init__(self, company_info, include_header=True,
+                 width=RECEIPT_WIDTH):
+        self.width = width
+        header = []
+        if include_header and company_info.get('name'):
+            for line in wrap_line(company_info['name'], width):
+                header.append(line.center(width))
+            header.append('')
+            for field in ('document', 'address', 'phone'):
+                value = company_info.get(field)
+                if value:
+                    for line in wrap_line(str(value), width):
+                        header.append(line.center(width))
+        self.header = tuple(header)
+
+    def render(self, order):
+        """Retorna as linhas do recibo do pedido."""
+        width = self.width
+        lines = list(self.header)
+        add = lines.extend
+
+        created_at = order.created_at or datetime.now()
+        add(wrap_line(f"Data: {created_at.strftime('%d/%m/%Y %H:%M')}",
+                      width))
+        add(wrap_line(f"Cliente: {order.customer_name}", width))
+        add(wrap_line(f"Tel: {order.customer_phone}", width))
+        lines.append(SEPARATOR)
+
+        for item in order.items:
+            add(wrap_line(f"{item.qty}x | {item.name}", width))
+            if item.mandatory_additions:
+                lines.append("      Detalhes:")
+                for name, _ in item.mandatory_additions:
+                    add(wrap_line(f"           {name}", width))
+            if item.additions:
+                lines.append("      Complementos:")
+                for qty, name, price in item.additions:
+                    add(wrap_line(
+                        f"      + {qty}x | {name} - R$ {price:.2f}", width))
+            add(wrap_line(f"   Total item: R$ {item.total():.2f}", width))
+            if item.observations:
+                add(wrap_line(f"   Obs: {item.observations}", width))
+            lines.append(SEPARATOR)
+
+        if order.delivery_fee and order.delivery_fee > 0:
+            add(wrap_line(
+                f"Sub-total: R$ {order.total_amount - order.delivery_fee:.2f}",
+                width))
+            add(wrap_line(
+                f"Taxa de entrega: R$ {order.delivery_fee:.2f}", width))
+
+        add(wrap_line(f"TOTAL: R$ {order.total_amount:.2f}", width))
+
+        if order.payment_method:
+            if order.payment_method == "Dinheiro":
+                add(wrap_line(
+                    f"Troco para: R$ {order.change_value:.2f}", width))
+            add(wrap_line(f"Pagamento: {order.payment_method}", width))
+        lines.append(SEPARATOR)
+
+        notes = order.notes
+        if isinstance(notes, list):
+            # Endereço da entrega
+            street, number, neighborhood, reference = notes
+            if street:
+                add(wrap_line(f"Rua: {street}", width))
+            if number:
+                add(wrap_line(f"Número: {number}", width))
+            if neighborhood:
+                add(wrap_line(f"Bairro: {neighborhood}", width))
+            if reference:
+                add(wrap_line(f"Ref: {reference}", width))
+        elif notes:
+            add(wrap_line(f"{notes}", width))
+
+        lines.append(SEPARATOR)
+        lines.append(FOOTER)
+        lines.append("")
+        return lines